@@ -1,8 +1,14 @@
 from . import ui
+from . import projector_database
+from . import registry
+from . import scheduler
 from . import projector
+from . import batch
 from . import operators
 from . import duplicate
 from . import mirror
+from . import analysis
+from . import placement
 import bpy.utils.previews
 
 custom_icons = None
@@ -11,6 +17,8 @@ bl_info = {
     "name": "Projector by Lotchi",
     "author": "Baptiste Jazé",
     "description": "Easy Projector creation and modification.",
+    # Version minimale : le groupe de projection partagé n'a que la forme 2.81+ du nœud Mapping,
+    # l'édition groupée utilise Object.children_recursive (3.1+)
     "blender": (4, 5, 0),
     "version": (2025, 2, 1),
     "location": "3D Viewport > Add > Light > Projector",
@@ -33,10 +41,16 @@ def register():
     # Charger le logo
     custom_icons.load("logo", os.path.join(icons_dir, "logo.png"), 'IMAGE')
     
+    projector_database.register()
+    registry.register()
+    scheduler.register()
     projector.register()
+    batch.register()
     operators.register()
     duplicate.register()
     mirror.register()
+    analysis.register()
+    placement.register()
     ui.register()
 
 
@@ -48,7 +62,13 @@ def unregister():
         bpy.utils.previews.remove(custom_icons)
         
     ui.unregister()
+    placement.unregister()
+    analysis.unregister()
     mirror.unregister()
     duplicate.unregister()
     operators.unregister()
+    batch.unregister()
     projector.unregister()
+    scheduler.unregister()
+    registry.unregister()
+    projector_database.unregister()
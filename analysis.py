@@ -0,0 +1,554 @@
+import logging
+import bpy
+import numpy as np
+from bpy.app.handlers import persistent
+from bpy.types import Operator
+from mathutils.bvhtree import BVHTree
+
+from .core.footprint import find_overlaps, footprint_quads, keystone_metrics, nominal_screen_planes
+from .helper import get_projectors, get_rig_parent, get_screen_distance
+from .core.photometry import illuminance_at_points, image_window, parse_resolution, projector_frames
+from .projector import get_resolution_text
+from .registry import get_rig, get_rig_component
+
+logging.basicConfig(
+    format='[Projectors Addon]: %(name)s - %(levelname)s - %(message)s')
+log = logging.getLogger(name=__file__)
+
+# Attributs écrits sur le mesh de l'écran
+LUX_ATTRIBUTE = 'projector_lux'
+HEATMAP_ATTRIBUTE = 'projector_lux_color'
+
+# Résultats de la dernière détection de recouvrements (panneau et export CSV), par
+# identifiant de rig (stable au renommage) ; vidés au chargement d'un fichier
+OVERLAP_RESULTS = []
+
+# Résultats de la dernière analyse de couverture, par identifiant de rig
+COVERAGE_RESULTS = {}
+
+# Rampe de fausses couleurs : noir (0 lx) -> bleu -> cyan -> vert -> jaune -> rouge
+HEATMAP_RAMP = np.array([
+    (0.0, 0.0, 0.0),
+    (0.0, 0.0, 1.0),
+    (0.0, 1.0, 1.0),
+    (0.0, 1.0, 0.0),
+    (1.0, 1.0, 0.0),
+    (1.0, 0.0, 0.0),
+])
+
+
+def heatmap_colors(lux, max_lux):
+    """ Convertit un tableau de lux en couleurs RGBA (fausses couleurs). """
+    t = np.clip(lux / max_lux, 0, 1) if max_lux > 0 else np.zeros_like(lux)
+    positions = np.linspace(0, 1, len(HEATMAP_RAMP))
+    colors = np.ones((len(lux), 4), dtype=np.float32)
+    for channel in range(3):
+        colors[:, channel] = np.interp(t, positions, HEATMAP_RAMP[:, channel])
+    # Les points non éclairés restent noirs
+    colors[lux <= 0, :3] = 0
+    return colors
+
+
+def get_projection_arrays(projectors):
+    """ Récupère en bloc les matrices monde et réglages optiques des projecteurs. """
+    matrices = np.array([projector.matrix_world for projector in projectors], dtype=float).reshape(-1, 4, 4)
+    throw_ratios = np.array([p.proj_settings.throw_ratio for p in projectors], dtype=float)
+    aspect_ratios = np.array([w / h for w, h in (parse_resolution(get_resolution_text(p.proj_settings))
+                                                 for p in projectors)], dtype=float)
+    lumens = np.array([p.proj_settings.lumens for p in projectors], dtype=float)
+    h_shifts = np.array([p.proj_settings.h_shift for p in projectors], dtype=float)
+    v_shifts = np.array([p.proj_settings.v_shift for p in projectors], dtype=float)
+    return matrices, throw_ratios, aspect_ratios, lumens, h_shifts, v_shifts
+
+
+def compute_keystone_metrics(projectors, context=None):
+    """
+    Géométrie oblique réelle (pan/tilt) de tous les projecteurs donnés, en un seul appel.
+    Le plan d'écran de chaque rig est le plan nominal à SCREEN_DISTANCE (voir
+    footprint.nominal_screen_planes). Retourne (screen_distances, KeystoneMetrics) ;
+    la distance vaut NaN et les grandeurs sont invalides pour les rigs sans SCREEN_DISTANCE.
+    """
+    matrices, throw_ratios, _, lumens, h_shifts, v_shifts = get_projection_arrays(projectors)
+    parents = [get_rig_parent(projector, context) for projector in projectors]
+    parent_matrices = np.array([parent.matrix_world for parent in parents], dtype=float).reshape(-1, 4, 4)
+    distances = np.array([get_screen_distance(projector, parent) for projector, parent in zip(projectors, parents)],
+                         dtype=float)
+    origins, _, _, forward = projector_frames(matrices)
+    plane_origins, plane_normals = nominal_screen_planes(parent_matrices, origins, forward, distances)
+    resolutions = [get_resolution_text(projector.proj_settings) for projector in projectors]
+    return distances, keystone_metrics(matrices, throw_ratios, resolutions, lumens, h_shifts, v_shifts,
+                                       plane_origins, plane_normals)
+
+
+def is_projecting(projector):
+    """ A projector only contributes if its spot light is enabled (see Light ON/OFF). """
+    for child in projector.children:
+        if child.type == 'LIGHT':
+            return not child.hide_viewport
+    return False
+
+
+def get_vertex_samples(mesh, matrix_world):
+    """ Retourne les positions et normales monde des sommets d'un mesh. """
+    count = len(mesh.vertices)
+    co = np.empty(count * 3, dtype=np.float32)
+    mesh.vertices.foreach_get('co', co)
+    normals = np.empty(count * 3, dtype=np.float32)
+    if bpy.app.version >= (3, 5):
+        mesh.vertex_normals.foreach_get('vector', normals)
+    else:
+        mesh.vertices.foreach_get('normal', normals)
+
+    matrix = np.array(matrix_world, dtype=float)
+    points = co.reshape(-1, 3) @ matrix[:3, :3].T + matrix[:3, 3]
+    # Les normales se transforment avec l'inverse transposée
+    normals = normals.reshape(-1, 3) @ np.linalg.inv(matrix[:3, :3])
+    normals /= np.maximum(np.linalg.norm(normals, axis=1, keepdims=True), 1e-12)
+    return points, normals
+
+
+def get_screen_axes(screen_obj):
+    """
+    Boîte englobante locale de l'écran et ses axes : l'axe le plus fin est la normale,
+    les deux autres portent l'image. Retourne (low, high, normal_axis, axis_u, axis_v).
+    """
+    corners = np.array([tuple(corner) for corner in screen_obj.bound_box])
+    low, high = corners.min(axis=0), corners.max(axis=0)
+    normal_axis = int(np.argmin(high - low))
+    axis_u, axis_v = [axis for axis in range(3) if axis != normal_axis]
+    return low, high, normal_axis, axis_u, axis_v
+
+
+def get_screen_plane(screen_obj):
+    """ Return the world-space (origin, normal) of the plane of a screen object. """
+    low, high, normal_axis, _, _ = get_screen_axes(screen_obj)
+    matrix = np.array(screen_obj.matrix_world, dtype=float)
+    origin = matrix[:3, :3] @ ((low + high) / 2) + matrix[:3, 3]
+    normal = np.linalg.inv(matrix[:3, :3])[normal_axis]
+    return origin, normal / np.linalg.norm(normal)
+
+
+def get_heatmap_grid_object(screen_obj, resolution):
+    """
+    Crée (ou recrée) un mesh grille enfant de l'écran, dans le plan de sa boîte englobante.
+    Utile pour les écrans peu subdivisés (un plan à 4 sommets par exemple).
+    """
+    low, high, normal_axis, axis_u, axis_v = get_screen_axes(screen_obj)
+
+    steps_u = max(2, resolution)
+    steps_v = max(2, int(round(resolution * (high[axis_v] - low[axis_v]) / max(high[axis_u] - low[axis_u], 1e-6))))
+    u = np.linspace(low[axis_u], high[axis_u], steps_u)
+    v = np.linspace(low[axis_v], high[axis_v], steps_v)
+    uu, vv = np.meshgrid(u, v)
+    verts = np.zeros((uu.size, 3))
+    verts[:, axis_u] = uu.ravel()
+    verts[:, axis_v] = vv.ravel()
+    verts[:, normal_axis] = (low[normal_axis] + high[normal_axis]) / 2
+
+    index = np.arange(uu.size).reshape(steps_v, steps_u)
+    faces = np.stack((index[:-1, :-1], index[:-1, 1:], index[1:, 1:], index[1:, :-1]), axis=-1).reshape(-1, 4)
+
+    name = f'{screen_obj.name}.heatmap'
+    grid_obj = bpy.data.objects.get(name)
+    mesh = bpy.data.meshes.new(name)
+    mesh.from_pydata(verts.tolist(), [], faces.tolist())
+    if grid_obj:
+        old_mesh = grid_obj.data
+        grid_obj.data = mesh
+        if old_mesh.users == 0:
+            bpy.data.meshes.remove(old_mesh)
+    else:
+        grid_obj = bpy.data.objects.new(name, mesh)
+        for collection in screen_obj.users_collection:
+            collection.objects.link(grid_obj)
+    grid_obj.parent = screen_obj
+    grid_obj.matrix_parent_inverse.identity()
+    grid_obj.matrix_basis.identity()
+    return grid_obj
+
+
+def write_heatmap(mesh, lux, colors):
+    """ Écrit les lux bruts et leurs fausses couleurs comme attributs de sommets. """
+    lux_attr = mesh.attributes.get(LUX_ATTRIBUTE)
+    if not lux_attr:
+        lux_attr = mesh.attributes.new(LUX_ATTRIBUTE, 'FLOAT', 'POINT')
+    lux_attr.data.foreach_set('value', lux.astype(np.float32))
+
+    color_attr = mesh.color_attributes.get(HEATMAP_ATTRIBUTE)
+    if not color_attr:
+        color_attr = mesh.color_attributes.new(HEATMAP_ATTRIBUTE, 'FLOAT_COLOR', 'POINT')
+    color_attr.data.foreach_set('color', colors.ravel())
+    mesh.color_attributes.active_color = color_attr
+    mesh.update()
+
+
+def get_result_key(projector):
+    """ Key of a projector in the analysis results: its rig id, which survives renames. """
+    rig = get_rig(projector)
+    return None if rig is None else rig.rig_id
+
+
+def get_projector_overlaps(projector):
+    """
+    Recouvrements d'un projecteur issus de la dernière détection.
+    Retourne une liste de (nom_autre_projecteur, largeur_m, pourcentage_de_son_image).
+    """
+    key = get_result_key(projector)
+    overlaps = []
+    if key is None:
+        return overlaps
+    for result in OVERLAP_RESULTS:
+        if result['rig_a'] == key:
+            overlaps.append((result['projector_b'], result['width'], result['percent_a']))
+        elif result['rig_b'] == key:
+            overlaps.append((result['projector_a'], result['width'], result['percent_b']))
+    return overlaps
+
+
+def get_hierarchy(obj):
+    """ Return an object and all its descendants. """
+    objects = [obj]
+    for child in obj.children:
+        objects.extend(get_hierarchy(child))
+    return objects
+
+
+class SceneBVH:
+    """
+    BVH unique des triangles de tous les meshes visibles de la scène (modificateurs appliqués).
+    Chaque triangle garde l'indice de son objet pour identifier les surfaces touchées.
+    """
+
+    def __init__(self, context, exclude=()):
+        depsgraph = context.evaluated_depsgraph_get()
+        self.objects = []
+        verts_chunks, tris_chunks, owner_chunks = [], [], []
+        vert_offset = 0
+
+        for obj in context.scene.objects:
+            if obj.type != 'MESH' or obj in exclude or not obj.visible_get():
+                continue
+            obj_eval = obj.evaluated_get(depsgraph)
+            mesh = obj_eval.to_mesh()
+            try:
+                mesh.calc_loop_triangles()
+                if not len(mesh.loop_triangles):
+                    continue
+                co = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+                mesh.vertices.foreach_get('co', co)
+                tris = np.empty(len(mesh.loop_triangles) * 3, dtype=np.int32)
+                mesh.loop_triangles.foreach_get('vertices', tris)
+            finally:
+                obj_eval.to_mesh_clear()
+
+            matrix = np.array(obj.matrix_world, dtype=float)
+            verts_chunks.append(co.reshape(-1, 3) @ matrix[:3, :3].T + matrix[:3, 3])
+            tris_chunks.append(tris.reshape(-1, 3) + vert_offset)
+            owner_chunks.append(np.full(len(tris) // 3, len(self.objects), dtype=np.int32))
+            vert_offset += len(co) // 3
+            self.objects.append(obj)
+
+        self.verts = np.concatenate(verts_chunks) if verts_chunks else np.empty((0, 3))
+        self.tris = np.concatenate(tris_chunks) if tris_chunks else np.empty((0, 3), dtype=np.int32)
+        self.owners = np.concatenate(owner_chunks) if owner_chunks else np.empty(0, dtype=np.int32)
+        self.tree = BVHTree.FromPolygons(self.verts.tolist(), self.tris.tolist())
+        self._subtrees = {}
+
+    def subtree(self, obj):
+        """ BVH restreint aux triangles d'un seul objet (construit à la demande). """
+        if obj not in self._subtrees:
+            tree = None
+            if obj in self.objects:
+                tris = self.tris[self.owners == self.objects.index(obj)]
+                used, remapped = np.unique(tris, return_inverse=True)
+                tree = BVHTree.FromPolygons(self.verts[used].tolist(), remapped.reshape(-1, 3).tolist())
+            self._subtrees[obj] = tree
+        return self._subtrees[obj]
+
+    def ray_cast(self, origin, direction, ignore=(), max_steps=8):
+        """
+        Premier objet touché par un rayon, en traversant les objets à ignorer.
+        Retourne (objet, distance) ou (None, None).
+        """
+        origin = list(origin)
+        travelled = 0.0
+        for _ in range(max_steps):
+            location, _, index, distance = self.tree.ray_cast(origin, direction)
+            if location is None:
+                return None, None
+            obj = self.objects[self.owners[index]]
+            travelled += distance
+            if obj not in ignore:
+                return obj, travelled
+            # Repartir juste derrière la surface ignorée
+            origin = [c + d * 1e-4 for c, d in zip(location, direction)]
+            travelled += 1e-4
+        return None, None
+
+
+def get_beam_directions(forward, right, up, throw_ratio, aspect_ratio, h_shift, v_shift, samples_h, samples_v):
+    """
+    Directions (N, samples_h * samples_v, 3) d'une grille de rayons à travers le frustum de
+    chaque projecteur, un rayon au centre de chaque cellule de l'image.
+    """
+    center_h, center_v, half_w, half_h = image_window(throw_ratio, aspect_ratio, h_shift, v_shift)
+    grid_h = (np.arange(samples_h) + 0.5) / samples_h * 2 - 1
+    grid_v = (np.arange(samples_v) + 0.5) / samples_v * 2 - 1
+    gh, gv = [g.ravel() for g in np.meshgrid(grid_h, grid_v)]
+    offset_h = center_h[:, None] + gh[None, :] * half_w[:, None]
+    offset_v = center_v[:, None] + gv[None, :] * half_h[:, None]
+    directions = (forward[:, None, :]
+                  + offset_h[..., None] * right[:, None, :]
+                  + offset_v[..., None] * up[:, None, :])
+    return directions / np.linalg.norm(directions, axis=-1, keepdims=True)
+
+
+def get_projector_coverage(projector):
+    """ Return the last coverage result of a projector or None. """
+    return COVERAGE_RESULTS.get(get_result_key(projector))
+
+
+class PROJECTOR_OT_illuminance_heatmap(Operator):
+    """Compute the illuminance (lux) received by the screens of the selected projectors"""
+    bl_idname = 'projector.illuminance_heatmap'
+    bl_label = 'Illuminance Heatmap'
+    bl_description = 'Write a per-point lux heatmap on the screens of the selected projectors, using all projectors of the scene'
+    bl_options = {'REGISTER', 'UNDO'}
+
+    sample_mode: bpy.props.EnumProperty(
+        name="Samples",
+        description="Where the illuminance is evaluated",
+        items=[
+            ('VERTICES', 'Vertices', 'Evaluate on the vertices of the screen mesh'),
+            ('GRID', 'Grid', 'Evaluate on a grid object added as a child of the screen'),
+        ],
+        default='VERTICES')
+    grid_resolution: bpy.props.IntProperty(
+        name="Grid Resolution",
+        description="Number of samples along the screen width",
+        default=128,
+        min=2, soft_max=1024)
+    max_lux: bpy.props.FloatProperty(
+        name="Max Lux",
+        description="Illuminance displayed in red (0 = use the maximum found)",
+        default=0.0,
+        min=0.0)
+
+    @classmethod
+    def poll(cls, context):
+        return bool(get_projectors(context, only_selected=True))
+
+    def execute(self, context):
+        # Écrans des projecteurs sélectionnés (sans doublons)
+        screens = []
+        for projector in get_projectors(context, only_selected=True):
+            screen_obj = get_rig_component(projector, 'screen', context)
+            if screen_obj and screen_obj.type == 'MESH' and screen_obj not in screens:
+                screens.append(screen_obj)
+
+        if not screens:
+            self.report({'WARNING'}, "No screen mesh found for the selected projectors")
+            return {'CANCELLED'}
+
+        # Tous les projecteurs allumés de la scène contribuent
+        projectors = [p for p in get_projectors(context) if is_projecting(p)]
+        if not projectors:
+            self.report({'WARNING'}, "No active projector in the scene")
+            return {'CANCELLED'}
+        matrices, throw_ratios, aspect_ratios, lumens, h_shifts, v_shifts = get_projection_arrays(projectors)
+
+        for screen_obj in screens:
+            target = screen_obj
+            if self.sample_mode == 'GRID':
+                target = get_heatmap_grid_object(screen_obj, self.grid_resolution)
+                context.view_layer.update()
+            points, normals = get_vertex_samples(target.data, target.matrix_world)
+
+            lux, hits = illuminance_at_points(points, normals, matrices, throw_ratios, aspect_ratios,
+                                              lumens, h_shifts, v_shifts)
+            max_lux = self.max_lux if self.max_lux > 0 else float(lux.max(initial=0))
+            write_heatmap(target.data, lux, heatmap_colors(lux, max_lux))
+
+            lit = lux[hits > 0]
+            if len(lit):
+                self.report({'INFO'}, f"{screen_obj.name}: {lit.min():.0f} / {lit.mean():.0f} / {lit.max():.0f} lx "
+                                      f"(min/mean/max), {len(lit) / len(lux):.0%} covered")
+            else:
+                self.report({'WARNING'}, f"{screen_obj.name}: not reached by any projector")
+            log.info(f"Heatmap written on {target.name} ({len(points)} samples, {len(projectors)} projectors)")
+
+        # Afficher les couleurs d'attribut en mode Solid
+        space = context.space_data
+        if space and space.type == 'VIEW_3D' and space.shading.type == 'SOLID':
+            space.shading.color_type = 'VERTEX'
+
+        return {'FINISHED'}
+
+
+class PROJECTOR_OT_detect_overlaps(Operator):
+    """Detect the overlapping (blend) zones between projector images on their screens"""
+    bl_idname = 'projector.detect_overlaps'
+    bl_label = 'Detect Overlaps'
+    bl_description = 'Compute the footprint of every projector on its screen and the pairwise overlap zones'
+    bl_options = {'REGISTER'}
+
+    only_selected: bpy.props.BoolProperty(
+        name="Only Selected",
+        description="Only consider the selected projectors",
+        default=False)
+
+    def execute(self, context):
+        projectors = get_projectors(context, only_selected=self.only_selected)
+        matrices, throw_ratios, aspect_ratios, _, h_shifts, v_shifts = get_projection_arrays(projectors)
+        origins, _, _, forward = projector_frames(matrices)
+
+        # Plan de l'écran de chaque rig, ou plan perpendiculaire à SCREEN_DISTANCE à défaut
+        plane_origins = np.full((len(projectors), 3), np.nan)
+        plane_normals = np.tile((0.0, 0.0, 1.0), (len(projectors), 1))
+        for i, projector in enumerate(projectors):
+            screen_obj = get_rig_component(projector, 'screen', context)
+            if screen_obj:
+                plane_origins[i], plane_normals[i] = get_screen_plane(screen_obj)
+                continue
+            screen_distance = get_screen_distance(projector, get_rig_parent(projector, context))
+            if screen_distance:
+                plane_origins[i] = origins[i] + forward[i] * screen_distance
+                plane_normals[i] = forward[i]
+
+        located = ~np.isnan(plane_origins[:, 0])
+        quads, valid = footprint_quads(matrices, throw_ratios, aspect_ratios, h_shifts, v_shifts,
+                                       np.nan_to_num(plane_origins), plane_normals)
+        valid &= located
+        overlaps = find_overlaps(quads, valid, np.nan_to_num(plane_origins), plane_normals)
+
+        OVERLAP_RESULTS.clear()
+        for overlap in overlaps:
+            OVERLAP_RESULTS.append({
+                'rig_a': get_result_key(projectors[overlap.index_a]),
+                'rig_b': get_result_key(projectors[overlap.index_b]),
+                'projector_a': projectors[overlap.index_a].name,
+                'projector_b': projectors[overlap.index_b].name,
+                'area': overlap.area,
+                'width': overlap.width,
+                'percent_a': overlap.percent_a,
+                'percent_b': overlap.percent_b,
+                'polygon': overlap.polygon.tolist(),
+            })
+
+        missing = len(projectors) - int(valid.sum())
+        if missing:
+            self.report({'WARNING'}, f"{missing} projector(s) without a footprint on a screen")
+        self.report({'INFO'}, f"Found {len(overlaps)} overlap(s) between {int(valid.sum())} projector(s)")
+
+        # Pas d'écran en arrière-plan (blender -b)
+        for area in context.screen.areas if context.screen else ():
+            if area.type == 'VIEW_3D':
+                area.tag_redraw()
+        return {'FINISHED'}
+
+
+class PROJECTOR_OT_beam_coverage(Operator):
+    """Cast rays through the beam of the selected projectors to find the surfaces they hit and what blocks them"""
+    bl_idname = 'projector.beam_coverage'
+    bl_label = 'Beam Coverage'
+    bl_description = 'Find the surfaces hit by each selected projector, the shadowed part of its screen and the occluding objects'
+    bl_options = {'REGISTER'}
+
+    samples_h: bpy.props.IntProperty(
+        name="Horizontal Rays",
+        description="Number of rays across the image width",
+        default=16,
+        min=1, soft_max=128)
+    samples_v: bpy.props.IntProperty(
+        name="Vertical Rays",
+        description="Number of rays across the image height",
+        default=10,
+        min=1, soft_max=128)
+
+    @classmethod
+    def poll(cls, context):
+        return bool(get_projectors(context, only_selected=True))
+
+    def execute(self, context):
+        projectors = get_projectors(context, only_selected=True)
+
+        # Un seul BVH pour toute l'évaluation (les grilles de heatmap sont ignorées)
+        heatmaps = {obj for obj in context.scene.objects if obj.name.endswith('.heatmap')}
+        bvh = SceneBVH(context, exclude=heatmaps)
+
+        matrices, throw_ratios, aspect_ratios, _, h_shifts, v_shifts = get_projection_arrays(projectors)
+        origins, right, up, forward = projector_frames(matrices)
+        directions = get_beam_directions(forward, right, up, throw_ratios, aspect_ratios,
+                                         h_shifts, v_shifts, self.samples_h, self.samples_v)
+        ray_count = directions.shape[1]
+
+        for i, projector in enumerate(projectors):
+            parent_obj = get_rig_parent(projector, context)
+            screen_obj = get_rig_component(projector, 'screen', context)
+            # Les objets du rig (carrosserie, accroches...) ne bloquent pas leur propre faisceau
+            ignore = set(get_hierarchy(parent_obj)) - {screen_obj}
+            screen_tree = bvh.subtree(screen_obj) if screen_obj else None
+            origin = origins[i].tolist()
+
+            surfaces = {}
+            occluders = {}
+            reaching = 0
+            shadowed = 0
+            for direction in directions[i].tolist():
+                obj, _ = bvh.ray_cast(origin, direction, ignore)
+                if obj:
+                    surfaces[obj.name] = surfaces.get(obj.name, 0) + 1
+                if not screen_tree:
+                    continue
+                # Le rayon atteindrait-il l'écran sans obstacle ?
+                if screen_tree.ray_cast(origin, direction)[0] is None:
+                    continue
+                reaching += 1
+                if obj and obj != screen_obj:
+                    shadowed += 1
+                    occluders[obj.name] = occluders.get(obj.name, 0) + 1
+
+            COVERAGE_RESULTS[get_result_key(projector)] = {
+                'screen': screen_obj.name if screen_obj else None,
+                'surfaces': sorted(((name, count / ray_count) for name, count in surfaces.items()),
+                                   key=lambda item: -item[1]),
+                'shadowed': shadowed / reaching if reaching else None,
+                'occluders': sorted(occluders, key=lambda name: -occluders[name]),
+            }
+
+        blocked = [p.name for p in projectors if COVERAGE_RESULTS[get_result_key(p)]['occluders']]
+        if blocked:
+            self.report({'WARNING'}, f"{len(blocked)} projector(s) partially blocked: {', '.join(blocked[:5])}")
+        else:
+            self.report({'INFO'}, f"No occlusion found for {len(projectors)} projector(s)")
+        log.info(f"Beam coverage: {len(projectors)} projectors, {ray_count} rays each, "
+                 f"{len(bvh.tris)} triangles in BVH")
+
+        for area in context.screen.areas:
+            if area.type == 'VIEW_3D':
+                area.tag_redraw()
+        return {'FINISHED'}
+
+
+@persistent
+def clear_analysis_results(*args):
+    """ Forget the results of the previous file: its rig ids mean other rigs here. """
+    OVERLAP_RESULTS.clear()
+    COVERAGE_RESULTS.clear()
+
+
+def register():
+    bpy.utils.register_class(PROJECTOR_OT_illuminance_heatmap)
+    bpy.utils.register_class(PROJECTOR_OT_detect_overlaps)
+    bpy.utils.register_class(PROJECTOR_OT_beam_coverage)
+    if clear_analysis_results not in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.append(clear_analysis_results)
+
+
+def unregister():
+    if clear_analysis_results in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.remove(clear_analysis_results)
+    clear_analysis_results()
+    bpy.utils.unregister_class(PROJECTOR_OT_beam_coverage)
+    bpy.utils.unregister_class(PROJECTOR_OT_detect_overlaps)
+    bpy.utils.unregister_class(PROJECTOR_OT_illuminance_heatmap)
@@ -0,0 +1,198 @@
+"""
+Édition groupée des projecteurs sélectionnés.
+
+Les valeurs à appliquer sont réglées une fois dans le panneau (Scene.proj_batch),
+chacune avec une case qui dit si elle doit être appliquée, puis écrites sur tous
+les rigs sélectionnés par un seul opérateur. Les mises à jour dérivées (caméra,
+mapping, écran...) sont planifiées par les propriétés et calculées ensuite en un
+seul passage vectorisé pour tous les rigs (voir scheduler.batched_updates).
+"""
+import logging
+
+import bpy
+from bpy.types import Operator
+
+from .helper import get_projectors
+from .projector import PROJECTOR_RESOLUTIONS, assign_catalog_entry, get_resolution_text, set_resolution_text
+from .projector_database import get_brands, get_lenses, get_models, update_projector_brand
+from .scheduler import batched_updates
+
+logging.basicConfig(
+    format='[Projectors Addon]: %(name)s - %(levelname)s - %(message)s')
+log = logging.getLogger(name=__file__)
+
+
+def update_batch_model(batch, context):
+    batch.projector_lens = 'NONE'
+
+
+class ProjectorBatchSettings(bpy.types.PropertyGroup):
+    use_lens: bpy.props.BoolProperty(name="Lens", description="Apply the brand, model and lens")
+    projector_brand: bpy.props.EnumProperty(
+        name="Brand",
+        description="Projector brand",
+        items=get_brands,
+        update=update_projector_brand)
+    projector_model: bpy.props.EnumProperty(
+        name="Model",
+        description="Projector model",
+        items=get_models,
+        update=update_batch_model)
+    projector_lens: bpy.props.EnumProperty(
+        name="Lens",
+        description="Projector lens/optic",
+        items=get_lenses)
+
+    use_throw_ratio: bpy.props.BoolProperty(name="Throw Ratio", description="Apply the throw ratio")
+    throw_ratio: bpy.props.FloatProperty(
+        name="Throw Ratio",
+        default=0.8,
+        min=0.01, soft_min=0.4, soft_max=3,
+        precision=2,
+        subtype='FACTOR')
+
+    use_h_shift: bpy.props.BoolProperty(name="Horizontal Shift", description="Apply the horizontal shift")
+    h_shift: bpy.props.FloatProperty(
+        name="Horizontal Shift",
+        description="Horizontal Lens Shift, clamped to the limits of each lens",
+        soft_min=-100, soft_max=100,
+        subtype='PERCENTAGE')
+
+    use_v_shift: bpy.props.BoolProperty(name="Vertical Shift", description="Apply the vertical shift")
+    v_shift: bpy.props.FloatProperty(
+        name="Vertical Shift",
+        description="Vertical Lens Shift, clamped to the limits of each lens",
+        soft_min=-100, soft_max=100,
+        subtype='PERCENTAGE')
+
+    use_resolution: bpy.props.BoolProperty(name="Resolution", description="Apply the resolution")
+    resolution: bpy.props.EnumProperty(
+        items=PROJECTOR_RESOLUTIONS,
+        default='1920x1200',
+        description="Resolution of the projectors")
+    custom_resolution: bpy.props.IntVectorProperty(
+        name="Custom Resolution",
+        description="Width and height in pixels, used when the resolution is Custom",
+        size=2,
+        default=(2560, 1600),
+        min=1, soft_max=16384)
+
+    use_power: bpy.props.BoolProperty(name="Power", description="Apply the light power")
+    power: bpy.props.FloatProperty(
+        name="Light Power",
+        description="Light intensity percentage (0-100%)",
+        default=100.0,
+        soft_min=0, soft_max=100,
+        precision=0,
+        subtype='PERCENTAGE')
+
+    def has_values(self):
+        return (self.use_lens or self.use_throw_ratio or self.use_h_shift or self.use_v_shift or
+                self.use_resolution or self.use_power)
+
+
+def apply_batch_settings(batch, projectors, context):
+    """
+    Écrit les valeurs cochées de `batch` sur les projecteurs, puis calcule en une fois
+    les mises à jour planifiées. Retourne le nombre de shifts bornés par l'optique.
+    """
+    lens = None
+    if batch.use_lens and batch.projector_lens not in ('', 'NONE'):
+        lens = (batch.projector_brand, batch.projector_model, batch.projector_lens)
+
+    clamped = 0
+    with batched_updates(context):
+        for projector in projectors:
+            proj_settings = projector.proj_settings
+            # L'optique d'abord : elle fixe les limites de shift
+            if lens:
+                assign_catalog_entry(proj_settings, context, *lens)
+            if batch.use_throw_ratio:
+                proj_settings.throw_ratio = batch.throw_ratio
+            if batch.use_resolution:
+                set_resolution_text(proj_settings, get_resolution_text(batch))
+            if batch.use_power:
+                proj_settings.power = batch.power
+            if batch.use_h_shift:
+                proj_settings.h_shift = batch.h_shift
+                clamped += abs(proj_settings.h_shift - batch.h_shift) > 1e-6
+            if batch.use_v_shift:
+                proj_settings.v_shift = batch.v_shift
+                clamped += abs(proj_settings.v_shift - batch.v_shift) > 1e-6
+    return clamped
+
+
+class PROJECTOR_OT_batch_apply(Operator):
+    """Apply the checked values to every selected projector"""
+    bl_idname = 'projector.batch_apply'
+    bl_label = 'Apply to Selected Projectors'
+    bl_options = {'REGISTER', 'UNDO'}
+
+    @classmethod
+    def poll(cls, context):
+        return bool(get_projectors(context, only_selected=True)) and context.scene.proj_batch.has_values()
+
+    def execute(self, context):
+        batch = context.scene.proj_batch
+        if batch.use_lens and batch.projector_lens in ('', 'NONE'):
+            self.report({'ERROR'}, "Select a lens to apply, or uncheck Lens")
+            return {'CANCELLED'}
+        projectors = get_projectors(context, only_selected=True)
+        clamped = apply_batch_settings(batch, projectors, context)
+        if clamped:
+            self.report({'WARNING'}, f"Updated {len(projectors)} projector(s), "
+                                     f"{clamped} shift(s) clamped to the lens limits")
+        else:
+            self.report({'INFO'}, f"Updated {len(projectors)} projector(s)")
+        return {'FINISHED'}
+
+
+class PROJECTOR_OT_batch_pick(Operator):
+    """Load the batch values from the active projector"""
+    bl_idname = 'projector.batch_pick'
+    bl_label = 'Pick from Active Projector'
+    bl_options = {'REGISTER', 'INTERNAL'}
+
+    @classmethod
+    def poll(cls, context):
+        return bool(get_projectors(context, only_selected=True))
+
+    def execute(self, context):
+        batch = context.scene.proj_batch
+        projectors = get_projectors(context, only_selected=True)
+        # Le projecteur désigné par l'objet actif (lui-même ou un ancêtre), sinon le premier
+        # (children_recursive : Blender 3.1+, voir bl_info)
+        active = context.active_object
+        projector = projectors[0]
+        if active:
+            projector = next((p for p in projectors if p == active or p in active.children_recursive), projector)
+        proj_settings = projector.proj_settings
+
+        batch.throw_ratio = proj_settings.throw_ratio
+        batch.h_shift = proj_settings.h_shift
+        batch.v_shift = proj_settings.v_shift
+        set_resolution_text(batch, get_resolution_text(proj_settings))
+        batch.power = proj_settings.power
+        try:
+            # Dans cet ordre : chaque liste dépend de la précédente
+            batch.projector_brand = proj_settings.projector_brand
+            batch.projector_model = proj_settings.projector_model
+            batch.projector_lens = proj_settings.projector_lens
+        except TypeError as e:
+            log.debug(f"Lens of {projector.name} not in the catalog: {e}")
+        self.report({'INFO'}, f"Loaded values of {projector.name}")
+        return {'FINISHED'}
+
+
+def register():
+    bpy.utils.register_class(ProjectorBatchSettings)
+    bpy.utils.register_class(PROJECTOR_OT_batch_apply)
+    bpy.utils.register_class(PROJECTOR_OT_batch_pick)
+    bpy.types.Scene.proj_batch = bpy.props.PointerProperty(type=ProjectorBatchSettings)
+
+
+def unregister():
+    del bpy.types.Scene.proj_batch
+    bpy.utils.unregister_class(PROJECTOR_OT_batch_pick)
+    bpy.utils.unregister_class(PROJECTOR_OT_batch_apply)
+    bpy.utils.unregister_class(ProjectorBatchSettings)
@@ -2,6 +2,7 @@ import fire
 import re
 import zipfile
 import os
+import sys
 from pathlib import Path
 import subprocess
 from loguru import logger as log
@@ -50,10 +51,41 @@ class CMD(object):
         with zipfile.ZipFile(zip_file, 'w') as zf:
             for f in Path('.').glob('*.py'):
                 zf.write(f)
+            # Cœur de calcul sans bpy
+            for f in Path('core').glob('*.py'):
+                zf.write(f)
+            # Catalogue des projecteurs
+            for f in Path('data').glob('*.json'):
+                zf.write(f)
             zf.write('README.md')
             zf.write('LICENSE')
         return f'A realease zipfile was created: {zip_file}'
 
+    def unit(self):
+        """ Run the headless unit tests of the bpy-free core (no Blender needed). """
+        result = subprocess.run([sys.executable, '-m', 'unittest', 'discover', '-s', 'unit_tests'],
+                                cwd=Path(__file__).parent)
+        return 'Unit tests passed' if result.returncode == 0 else 'Unit tests failed'
+
+    def bench(self):
+        """ Run the benchmarks of the bpy-free core (no Blender needed). """
+        subprocess.run([sys.executable, str(Path('unit_tests', 'bench_core.py'))], cwd=Path(__file__).parent)
+        return 'Finished Benchmarks'
+
+    def import_specs(self, sheet, catalog, shift_scale=None, skip_invalid=False):
+        """ Validate a manufacturer spec sheet (CSV/XLSX) and merge its valid rows into a catalog file. """
+        sys.path.insert(0, str(Path(__file__).parent))
+        from core.catalog import update_catalog_file
+        from core.spec_import import SpecSheetImport
+
+        result = SpecSheetImport.from_file(str(sheet), shift_scale)
+        for issue in result.issues:
+            (log.error if issue.severity == 'ERROR' else log.warning)(f'row {issue.row}: {issue.message}')
+        if result.errors and not skip_invalid:
+            return f'{len(result.errors)} invalid row(s), nothing imported (use --skip_invalid to import the others)'
+        update_catalog_file(str(catalog), result.brands, result.shift_scales)
+        return f'Imported {result.entry_count} of {result.row_count} rows into {catalog}'
+
     def test(self, versions_dir=None):
         """ This function allows running the test suite agains different version of Blender.
         !!MacOS only!!
@@ -0,0 +1,9 @@
+"""
+Cœur de calcul de l'add-on, sans dépendance à Blender.
+
+Photométrie vectorisée, géométrie des empreintes, catalogue des optiques et
+tables throw / distance. Rien ici n'importe bpy : le paquet s'importe avec un
+simple `python` (voir unit_tests/) et les modules de l'add-on s'appuient dessus.
+Les imports internes sont relatifs pour que le paquet fonctionne aussi bien dans
+l'add-on qu'importé seul sous le nom `core`.
+"""
@@ -0,0 +1,278 @@
+"""
+Catalogue des projecteurs et de leurs optiques, et ses accès en lecture.
+
+Le catalogue est un fichier de données (data/projectors.json) chargé au premier
+accès, complété par des fichiers utilisateur qui ajoutent ou remplacent des
+marques, modèles ou optiques. Format d'un fichier :
+
+    {"format": 1, "brands": {"Marque": {"Modèle": {"Optique": {"ansi_lumens": ...,
+     "h_shift_min": ..., "h_shift_max": ..., "v_shift_min": ..., "v_shift_max": ...}}}}},
+     "shift_scales": {"Marque": 0.5}}
+
+Les shifts sont stockés tels que publiés par le constructeur ; "shift_scales"
+(facultatif) donne par marque le coefficient qui les ramène à la convention de
+l'add-on (1 par défaut).
+
+Ce module n'importe pas bpy : les callbacks d'énumération et de mise à jour de
+l'add-on sont dans projector_database.py.
+"""
+import json
+import logging
+import os
+
+from .lens_index import LensIndex
+from .search import CatalogSearch
+from .throw_table import ThrowTable, distance_grid
+
+log = logging.getLogger(name=__file__)
+
+# Catalogue livré avec l'add-on
+CATALOG_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'projectors.json')
+# Fichiers utilisateur supplémentaires (séparés par os.pathsep), lus après le catalogue livré
+USER_CATALOG_ENV = 'PROJECTORS_USER_CATALOG'
+CATALOG_FORMAT = 1
+LENS_FIELDS = ('ansi_lumens', 'h_shift_min', 'h_shift_max', 'v_shift_min', 'v_shift_max')
+# Coefficient des shifts d'une marque absente de "shift_scales"
+DEFAULT_SHIFT_SCALE = 1.0
+
+# Fichiers utilisateur déclarés par l'add-on (voir set_user_catalog_paths)
+_USER_CATALOG_PATHS = []
+
+# Catalogue normalisé et index de recherche, construits au premier appel
+_LENS_INDEX = None
+_CATALOG_SEARCH = None
+# Incrémenté à chaque (re)chargement : les caches dérivés du catalogue s'y réfèrent
+_CATALOG_VERSION = 0
+
+
+def read_catalog_file(filepath):
+    """ Read one catalog file and return its {brand: {model: {lens: data}}} dict. """
+    return read_catalog_document(filepath)[0]
+
+
+def is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def read_catalog_document(filepath):
+    """
+    Read one catalog file and return its brands dict and its {brand: shift scale} dict.
+    Raise ValueError if the file is not a catalog. Lenses may give only some of their
+    fields (override of a lens of a previous catalog, see check_lens_fields).
+    """
+    with open(filepath, encoding='utf-8') as catalog_file:
+        data = json.load(catalog_file)
+    if not isinstance(data, dict):
+        raise ValueError(f"{filepath}: expected a JSON object")
+    catalog_format = data.get('format', CATALOG_FORMAT)
+    if not isinstance(catalog_format, int) or isinstance(catalog_format, bool):
+        raise ValueError(f"{filepath}: invalid catalog format {catalog_format!r}")
+    if catalog_format > CATALOG_FORMAT:
+        raise ValueError(f"Unsupported catalog format {catalog_format} in {filepath}")
+    brands = data.get('brands', {})
+    if not isinstance(brands, dict):
+        raise ValueError(f"{filepath}: \"brands\" must be an object")
+    for brand, models in brands.items():
+        if not isinstance(models, dict):
+            raise ValueError(f"{filepath}: models of {brand} must be an object")
+        for model, lenses in models.items():
+            if not isinstance(lenses, dict):
+                raise ValueError(f"{filepath}: lenses of {brand} / {model} must be an object")
+            for lens, lens_data in lenses.items():
+                if not isinstance(lens_data, dict):
+                    raise ValueError(f"{filepath}: {brand} / {model} / {lens} must be an object")
+                invalid = [field for field in LENS_FIELDS if field in lens_data and not is_number(lens_data[field])]
+                if invalid:
+                    raise ValueError(f"{filepath}: {brand} / {model} / {lens} has non-numeric {', '.join(invalid)}")
+    shift_scales = data.get('shift_scales', {})
+    if not isinstance(shift_scales, dict):
+        raise ValueError(f"{filepath}: \"shift_scales\" must be an object")
+    for brand, scale in shift_scales.items():
+        if not is_number(scale) or scale <= 0:
+            raise ValueError(f"{filepath}: invalid shift scale {scale!r} for {brand}")
+    return brands, shift_scales
+
+
+def check_lens_fields(brands, merged, filepath):
+    """ Raise ValueError if a lens of `brands` still misses fields in the `merged` catalog. """
+    for brand, models in brands.items():
+        for model, lenses in models.items():
+            for lens in lenses:
+                missing = [field for field in LENS_FIELDS if field not in merged[brand][model][lens]]
+                if missing:
+                    raise ValueError(f"{filepath}: {brand} / {model} / {lens} is missing {', '.join(missing)}")
+
+
+def write_catalog_file(filepath, brands, shift_scales=None):
+    """ Write a catalog file loadable as a user catalog (one lens per line). """
+    lines = ['{', f'    "format": {CATALOG_FORMAT},', '    "brands": {']
+    for i, (brand, models) in enumerate(brands.items()):
+        lines.append(f'        {json.dumps(brand, ensure_ascii=False)}: {{')
+        for j, (model, lenses) in enumerate(models.items()):
+            lines.append(f'            {json.dumps(model, ensure_ascii=False)}: {{')
+            for k, (lens, lens_data) in enumerate(lenses.items()):
+                comma = ',' if k < len(lenses) - 1 else ''
+                lines.append(f'                {json.dumps(lens, ensure_ascii=False)}: '
+                             f'{json.dumps(lens_data, ensure_ascii=False)}{comma}')
+            lines.append('            }' + (',' if j < len(models) - 1 else ''))
+        lines.append('        }' + (',' if i < len(brands) - 1 else ''))
+    lines.append('    }' + (',' if shift_scales else ''))
+    if shift_scales:
+        lines.append(f'    "shift_scales": {json.dumps(shift_scales, ensure_ascii=False)}')
+    lines.append('}')
+    with open(filepath, 'w', encoding='utf-8') as catalog_file:
+        catalog_file.write('\n'.join(lines) + '\n')
+
+
+def merge_catalogs(*catalogs):
+    """
+    Fusionne des catalogues dans l'ordre : une optique d'un catalogue suivant
+    remplace champ par champ celle du précédent, les nouvelles marques, modèles
+    et optiques s'ajoutent à la fin.
+    """
+    merged = {}
+    for catalog in catalogs:
+        for brand, models in catalog.items():
+            brand_models = merged.setdefault(brand, {})
+            for model, lenses in models.items():
+                model_lenses = brand_models.setdefault(model, {})
+                for lens, lens_data in lenses.items():
+                    model_lenses[lens] = {**model_lenses.get(lens, {}), **lens_data}
+    return merged
+
+
+def update_catalog_file(filepath, brands, shift_scales=None):
+    """
+    Fusionne des marques et des coefficients de shift dans un fichier catalogue
+    (créé s'il n'existe pas) et l'écrit. Retourne le catalogue fusionné.
+    """
+    merged_brands, merged_scales = {}, {}
+    if os.path.isfile(filepath):
+        merged_brands, merged_scales = read_catalog_document(filepath)
+    merged_brands = merge_catalogs(merged_brands, brands)
+    merged_scales = {**merged_scales, **(shift_scales or {})}
+    write_catalog_file(filepath, merged_brands, merged_scales)
+    return merged_brands
+
+
+def get_user_catalog_paths():
+    """ User catalog files: those declared by the add-on, then those of PROJECTORS_USER_CATALOG. """
+    paths = list(_USER_CATALOG_PATHS)
+    paths.extend(path for path in os.environ.get(USER_CATALOG_ENV, '').split(os.pathsep) if path)
+    return paths
+
+
+def set_user_catalog_paths(paths):
+    """ Declare the user catalog files and reload the catalog on next access. """
+    _USER_CATALOG_PATHS[:] = paths
+    reload_catalog()
+
+
+def load_catalog():
+    """ Load the bundled catalog and merge the user catalogs that exist. Invalid user files are skipped. """
+    return load_catalog_documents()[0]
+
+
+def load_catalog_documents():
+    """ Like load_catalog, also returning the merged {brand: shift scale} (user files win). """
+    merged, shift_scales = read_catalog_document(CATALOG_FILE)
+    check_lens_fields(merged, merged, CATALOG_FILE)
+    shift_scales = dict(shift_scales)
+    for path in get_user_catalog_paths():
+        if not os.path.isfile(path):
+            continue
+        try:
+            brands, scales = read_catalog_document(path)
+            # Une optique peut ne remplacer que certains champs ; une nouvelle optique doit tous les donner
+            candidate = merge_catalogs(merged, brands)
+            check_lens_fields(brands, candidate, path)
+        except (OSError, ValueError) as e:
+            log.error(f"Skipping user catalog {path}: {e}")
+            continue
+        merged = candidate
+        shift_scales.update(scales)
+    return merged, shift_scales
+
+
+def get_catalog_version():
+    """ Number of times the catalog was (re)loaded, to invalidate derived caches. """
+    get_lens_index()
+    return _CATALOG_VERSION
+
+
+def reload_catalog():
+    """ Forget the loaded catalog and everything derived from it. """
+    global _LENS_INDEX, _CATALOG_SEARCH, _CATALOG_VERSION
+    _LENS_INDEX = None
+    _CATALOG_SEARCH = None
+    _THROW_TABLES.clear()
+    _CATALOG_VERSION += 1
+
+
+def get_lens_index():
+    """ Return the normalized LensIndex of the whole catalog, loaded on first use (shifts already scaled). """
+    global _LENS_INDEX
+    if _LENS_INDEX is None:
+        brands, shift_scales = load_catalog_documents()
+        _LENS_INDEX = LensIndex(brands, shift_scales, DEFAULT_SHIFT_SCALE)
+    return _LENS_INDEX
+
+
+def get_catalog_search():
+    """ Return the trigram search index of the whole catalog (built once). """
+    global _CATALOG_SEARCH
+    if _CATALOG_SEARCH is None:
+        _CATALOG_SEARCH = CatalogSearch(get_lens_index())
+    return _CATALOG_SEARCH
+
+
+# Tables throw / distance déjà calculées, par (grille de distances, résolution)
+_THROW_TABLES = {}
+
+
+def get_throw_table(distance_min=1.0, distance_max=30.0, step=0.5, resolution='1920x1200'):
+    """ Return the ThrowTable of the whole catalog for a distance grid (built once per grid). """
+    key = (distance_min, distance_max, step, resolution)
+    table = _THROW_TABLES.get(key)
+    if table is None:
+        if len(_THROW_TABLES) > 16:
+            _THROW_TABLES.clear()
+        table = _THROW_TABLES[key] = ThrowTable(get_lens_index(), distance_grid(distance_min, distance_max, step),
+                                                resolution)
+    return table
+
+
+def get_brand_names():
+    """ Brands of the catalog, in catalog order. """
+    return list(get_lens_index().brand_names)
+
+
+def get_model_names(brand):
+    """ Models of a brand (empty if the brand is unknown). """
+    return get_lens_index().models(brand)
+
+
+def get_lens_names(brand, model):
+    """ Lenses of a model (empty if the brand or the model is unknown). """
+    return get_lens_index().lenses(brand, model)
+
+
+def get_lens_data(brand, model, lens):
+    """ Catalog values of a lens on a model (constructor shifts, not scaled) as a dict, or None. """
+    index = get_lens_index()
+    row = index.find(brand, model, lens)
+    if row is None:
+        return None
+    return {
+        'ansi_lumens': float(index.ansi_lumens[row]),
+        'h_shift_min': float(index.raw_h_shift_min[row]),
+        'h_shift_max': float(index.raw_h_shift_max[row]),
+        'v_shift_min': float(index.raw_v_shift_min[row]),
+        'v_shift_max': float(index.raw_v_shift_max[row]),
+    }
+
+
+def get_shift_scale(brand):
+    """ Coefficient applied to the constructor shifts of a brand. """
+    index = get_lens_index()
+    return index.shift_scales.get(brand, index.default_shift_scale)
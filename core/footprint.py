@@ -0,0 +1,306 @@
+"""
+Empreintes des projecteurs sur leur écran, géométrie oblique (keystone)
+et zones de recouvrement (blend).
+
+Ce module n'importe pas bpy : il travaille sur des tableaux NumPy de matrices
+monde et de plans d'écran.
+"""
+from collections import namedtuple
+
+import numpy as np
+
+from .photometry import image_window, parse_resolution, parse_resolutions, projector_frames
+
+
+# Coins de l'image (bas-gauche, bas-droite, haut-droite, haut-gauche) et milieux des bords
+# (bas, droite, haut, gauche), en coordonnées normalisées
+CORNERS = np.array([(-1, -1), (1, -1), (1, 1), (-1, 1)], dtype=float)
+EDGE_MIDDLES = np.array([(0, -1), (1, 0), (0, 1), (-1, 0)], dtype=float)
+
+
+Overlap = namedtuple('Overlap', [
+    'index_a',    # Indice du premier projecteur
+    'index_b',    # Indice du second projecteur
+    'polygon',    # Polygone de recouvrement, coordonnées monde (K, 3)
+    'area',       # Surface du recouvrement (m²)
+    'width',      # Largeur de la zone de blend (m)
+    'percent_a',  # Part de l'image A recouverte (%)
+    'percent_b',  # Part de l'image B recouverte (%)
+])
+
+
+KeystoneMetrics = namedtuple('KeystoneMetrics', [
+    'quads',          # Image déformée sur le plan d'écran, coordonnées monde (N, 4, 3)
+    'valid',          # Les quatre coins touchent le plan devant le projecteur
+    'area',           # Surface réelle de l'image (m²)
+    'lux_mean',       # Éclairement moyen (lx)
+    'lux_near',       # Éclairement au milieu du bord le plus proche (lx)
+    'lux_far',        # Éclairement au milieu du bord le plus éloigné (lx)
+    'pixel_min_mm',   # Plus petit pixel (côté du carré de même surface, mm)
+    'pixel_mean_mm',  # Pixel moyen (mm)
+    'pixel_max_mm',   # Plus grand pixel (mm)
+])
+
+
+def image_rays(matrices, throw_ratio, aspect_ratio, h_shift, v_shift, samples):
+    """
+    Rayons monde de points de l'image de N projecteurs.
+
+    `samples` (K, 2) donne les points en coordonnées normalisées de l'image
+    (-1 = bord gauche/bas, 1 = bord droit/haut). Retourne (origins, directions) :
+    origines (N, 3) et directions (N, K, 3) non normalisées, de composante 1
+    selon l'axe de visée (un point à t le long du rayon est à t mètres devant).
+    """
+    origins, right, up, forward = projector_frames(matrices)
+    count = len(origins)
+    center_h, center_v, half_w, half_h = (np.broadcast_to(value, (count,)) for value in
+                                          image_window(throw_ratio, aspect_ratio, h_shift, v_shift))
+    samples = np.asarray(samples, dtype=float).reshape(-1, 2)
+    offset_h = center_h[:, None] + samples[None, :, 0] * half_w[:, None]
+    offset_v = center_v[:, None] + samples[None, :, 1] * half_h[:, None]
+    directions = (forward[:, None, :]
+                  + offset_h[..., None] * right[:, None, :]
+                  + offset_v[..., None] * up[:, None, :])
+    return origins, directions
+
+
+def ray_plane_distances(origins, directions, plane_origins, plane_normals):
+    """ Paramètre t (N, K) de l'intersection des rayons avec le plan de chaque projecteur (NaN si parallèle). """
+    count = len(origins)
+    plane_origins = np.broadcast_to(np.asarray(plane_origins, dtype=float), (count, 3))
+    plane_normals = np.broadcast_to(np.asarray(plane_normals, dtype=float), (count, 3))
+    denom = np.einsum('nkj,nj->nk', directions, plane_normals)
+    numer = np.einsum('nj,nj->n', plane_origins - origins, plane_normals)[:, None]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t = numer / denom
+    return np.where(np.isfinite(t), t, np.nan)
+
+
+def footprint_quads(matrices, throw_ratio, aspect_ratio, h_shift, v_shift, plane_origins, plane_normals):
+    """
+    Intersecte les 4 rayons des coins de chaque image avec le plan de son écran.
+
+    Les plans sont donnés par projecteur (N, 3). Retourne (quads, valid) :
+    quads (N, 4, 3) en coordonnées monde, dans l'ordre bas-gauche, bas-droite,
+    haut-droite, haut-gauche ; valid est faux si un coin ne touche pas le plan
+    devant le projecteur.
+    """
+    origins, directions = image_rays(matrices, throw_ratio, aspect_ratio, h_shift, v_shift, CORNERS)
+    t = ray_plane_distances(origins, directions, plane_origins, plane_normals)
+    valid = np.all(t > 0, axis=1)
+    quads = origins[:, None, :] + np.nan_to_num(t)[..., None] * directions
+    return quads, valid
+
+
+def nominal_screen_planes(parent_matrices, origins, forward, screen_distances):
+    """
+    Plan d'écran nominal de N rigs : perpendiculaire à l'axe du parent le plus proche
+    de la visée du projecteur, à SCREEN_DISTANCE devant lui. C'est le plan que le
+    projecteur frappe de face sans pan ni tilt ; avec pan/tilt l'image s'y déforme.
+    Retourne (plane_origins, plane_normals).
+    """
+    parent_matrices = np.asarray(parent_matrices, dtype=float).reshape(-1, 4, 4)
+    axes = parent_matrices[:, :3, :3]
+    axes = axes / np.linalg.norm(axes, axis=1, keepdims=True)
+    dots = np.einsum('nij,ni->nj', axes, forward)
+    closest = np.argmax(np.abs(dots), axis=1)
+    normals = np.take_along_axis(axes, closest[:, None, None], axis=2)[:, :, 0]
+    normals *= np.sign(np.take_along_axis(dots, closest[:, None], axis=1))
+    plane_origins = origins + normals * np.asarray(screen_distances, dtype=float)[:, None]
+    return plane_origins, normals
+
+
+def keystone_metrics(matrices, throw_ratio, resolution, lumens, h_shift, v_shift, plane_origins, plane_normals):
+    """
+    Grandeurs réelles de l'image oblique (pan/tilt) de N projecteurs sur leur plan d'écran.
+
+    L'image est le quadrilatère déformé (keystone) obtenu en intersectant les rayons
+    de l'image avec le plan. La taille locale d'un pixel croît avec la distance de
+    projection : ses extrêmes sont aux coins. L'éclairement d'un point vaut
+    E = lumens * cos(n) / (surface_à_1m * t² * |d|), soit lumens * |d.n| / (surface_à_1m * t²)
+    avec d le rayon de composante 1 selon la visée ; il est évalué au milieu des bords
+    le plus proche et le plus éloigné. Les projecteurs qui ne touchent pas leur plan
+    donnent NaN.
+    """
+    if isinstance(resolution, str):
+        res_w, res_h = parse_resolution(resolution)
+    else:
+        res_w, res_h = parse_resolutions(resolution)
+    count = len(np.asarray(matrices).reshape(-1, 4, 4))
+    res_w, res_h, throw_ratio, lumens = (np.broadcast_to(np.asarray(value, dtype=float), (count,))
+                                         for value in (res_w, res_h, throw_ratio, lumens))
+    aspect_ratio = res_w / res_h
+    plane_normals = np.broadcast_to(np.asarray(plane_normals, dtype=float), (count, 3))
+    plane_normals = plane_normals / np.linalg.norm(plane_normals, axis=1, keepdims=True)
+
+    samples = np.concatenate((CORNERS, EDGE_MIDDLES))
+    origins, directions = image_rays(matrices, throw_ratio, aspect_ratio, h_shift, v_shift, samples)
+    t = ray_plane_distances(origins, directions, plane_origins, plane_normals)
+    valid = np.all(t > 0, axis=1)
+    t = np.where(valid[:, None], t, np.nan)
+    points = origins[:, None, :] + t[..., None] * directions
+    quads = points[:, :4]
+
+    # Surface d'un quadrilatère plan : demi-produit vectoriel des diagonales
+    area = 0.5 * np.linalg.norm(np.cross(quads[:, 2] - quads[:, 0], quads[:, 3] - quads[:, 1]), axis=1)
+
+    _, right, up, _ = projector_frames(matrices)
+    _, _, half_w, half_h = image_window(throw_ratio, aspect_ratio)
+    unit_area = 4 * half_w * half_h
+    d_dot_n = np.einsum('nkj,nj->nk', directions, plane_normals)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # Éclairement au milieu des bords, le plus proche et le plus éloigné du projecteur
+        edge_t = t[:, 4:]
+        edge_lux = lumens[:, None] * np.abs(d_dot_n[:, 4:]) / (unit_area[:, None] * edge_t ** 2)
+        edge_range = edge_t * np.linalg.norm(directions[:, 4:], axis=-1)
+        near = np.nanargmin(np.where(np.isnan(edge_range), np.inf, edge_range), axis=1)[:, None]
+        far = np.nanargmax(np.where(np.isnan(edge_range), -np.inf, edge_range), axis=1)[:, None]
+        lux_near = np.take_along_axis(edge_lux, near, axis=1)[:, 0]
+        lux_far = np.take_along_axis(edge_lux, far, axis=1)[:, 0]
+        lux_mean = np.where(area > 0, lumens / area, np.nan)
+
+        # Taille locale d'un pixel aux coins : jacobien de la projection sur le plan,
+        # dP/da = t * (droite - d * (droite.n) / (d.n)), idem pour le haut
+        corner_t = t[:, :4, None]
+        corner_dn = d_dot_n[:, :4, None]
+        right_n = np.einsum('nj,nj->n', right, plane_normals)[:, None, None]
+        up_n = np.einsum('nj,nj->n', up, plane_normals)[:, None, None]
+        d_a = corner_t * (right[:, None, :] - directions[:, :4] * right_n / corner_dn)
+        d_b = corner_t * (up[:, None, :] - directions[:, :4] * up_n / corner_dn)
+        pixel_area = (np.linalg.norm(np.cross(d_a, d_b), axis=-1)
+                      * (2 * half_w / res_w)[:, None] * (2 * half_h / res_h)[:, None])
+        pixel_size_mm = np.sqrt(pixel_area) * 1000
+        pixel_mean_mm = np.sqrt(area / (res_w * res_h)) * 1000
+
+    return KeystoneMetrics(quads, valid, area, lux_mean, lux_near, lux_far,
+                           pixel_size_mm.min(axis=1), pixel_mean_mm, pixel_size_mm.max(axis=1))
+
+
+def plane_basis(normal):
+    """ Return two unit vectors spanning the plane orthogonal to `normal`. """
+    normal = np.asarray(normal, dtype=float)
+    normal = normal / np.linalg.norm(normal)
+    helper = np.array((0.0, 0.0, 1.0)) if abs(normal[2]) < 0.9 else np.array((1.0, 0.0, 0.0))
+    u = np.cross(helper, normal)
+    u /= np.linalg.norm(u)
+    return u, np.cross(normal, u)
+
+
+def plane_groups(plane_origins, plane_normals, angle_tolerance=1e-3, distance_tolerance=1e-2):
+    """
+    Regroupe les projecteurs dont les écrans sont coplanaires.
+    Retourne un identifiant de groupe par projecteur.
+    """
+    normals = np.asarray(plane_normals, dtype=float)
+    normals = normals / np.linalg.norm(normals, axis=1, keepdims=True)
+    # Orientation canonique : la première composante non nulle est positive
+    first = np.argmax(np.abs(normals) > 1e-6, axis=1)
+    flip = np.take_along_axis(normals, first[:, None], axis=1)[:, 0] < 0
+    normals[flip] *= -1
+    offsets = np.einsum('nj,nj->n', np.asarray(plane_origins, dtype=float), normals)
+
+    keys = np.column_stack((np.round(normals / angle_tolerance), np.round(offsets / distance_tolerance)))
+    _, groups = np.unique(keys, axis=0, return_inverse=True)
+    return groups.ravel()
+
+
+def polygon_area(polygon):
+    """ Aire signée d'un polygone 2D (positive si sens anti-horaire). """
+    x, y = polygon[:, 0], polygon[:, 1]
+    return 0.5 * float(np.dot(x, np.roll(y, -1)) - np.dot(y, np.roll(x, -1)))
+
+
+def clip_convex(subject, clip):
+    """
+    Découpe d'un polygone convexe par un autre (Sutherland-Hodgman).
+    Les deux polygones sont des tableaux (K, 2) en sens anti-horaire.
+    """
+    output = [tuple(point) for point in subject]
+    for k in range(len(clip)):
+        if not output:
+            break
+        ax, ay = clip[k]
+        bx, by = clip[(k + 1) % len(clip)]
+        edge_x, edge_y = bx - ax, by - ay
+        points, output = output, []
+        for n, (px, py) in enumerate(points):
+            qx, qy = points[(n + 1) % len(points)]
+            p_side = edge_x * (py - ay) - edge_y * (px - ax)
+            q_side = edge_x * (qy - ay) - edge_y * (qx - ax)
+            if p_side >= 0:
+                output.append((px, py))
+            if (p_side >= 0) != (q_side >= 0):
+                t = p_side / (p_side - q_side)
+                output.append((px + t * (qx - px), py + t * (qy - py)))
+    return np.array(output, dtype=float).reshape(-1, 2)
+
+
+def sweep_pairs(boxes):
+    """
+    Paires de boîtes 2D (N, 4) = (min_u, min_v, max_u, max_v) qui se chevauchent.
+    Balayage trié selon u : seules les boîtes actives sont comparées en v.
+    """
+    order = np.argsort(boxes[:, 0], kind='stable')
+    active = []
+    pairs = []
+    for i in order:
+        min_u, min_v, _, max_v = boxes[i]
+        active = [j for j in active if boxes[j, 2] >= min_u]
+        for j in active:
+            if boxes[j, 1] <= max_v and boxes[j, 3] >= min_v:
+                pairs.append((min(i, j), max(i, j)))
+        active.append(i)
+    return pairs
+
+
+def find_overlaps(quads, valid, plane_origins, plane_normals):
+    """
+    Recouvrements deux à deux des empreintes situées sur un même plan.
+    Retourne une liste d'Overlap triée par indices.
+    """
+    quads = np.asarray(quads, dtype=float)
+    plane_origins = np.broadcast_to(np.asarray(plane_origins, dtype=float), (len(quads), 3))
+    plane_normals = np.broadcast_to(np.asarray(plane_normals, dtype=float), (len(quads), 3))
+    groups = plane_groups(plane_origins, plane_normals)
+    overlaps = []
+
+    for group in np.unique(groups[valid]):
+        members = np.flatnonzero((groups == group) & valid)
+        if len(members) < 2:
+            continue
+        origin = plane_origins[members[0]]
+        u_axis, v_axis = plane_basis(plane_normals[members[0]])
+
+        # Empreintes dans le repère 2D du plan, en sens anti-horaire
+        rel = quads[members] - origin
+        flat = np.stack((rel @ u_axis, rel @ v_axis), axis=-1)
+        for k in range(len(flat)):
+            if polygon_area(flat[k]) < 0:
+                flat[k] = flat[k][::-1]
+        areas = np.array([polygon_area(polygon) for polygon in flat])
+        boxes = np.column_stack((flat.min(axis=1), flat.max(axis=1)))
+
+        for a, b in sweep_pairs(boxes):
+            polygon = clip_convex(flat[a], flat[b])
+            if len(polygon) < 3:
+                continue
+            area = polygon_area(polygon)
+            if area <= 1e-9:
+                continue
+
+            # Largeur du blend : étendue du recouvrement selon l'axe entre les deux images
+            axis = flat[b].mean(axis=0) - flat[a].mean(axis=0)
+            norm = np.linalg.norm(axis)
+            if norm > 1e-9:
+                extent = polygon @ (axis / norm)
+                width = float(extent.max() - extent.min())
+            else:
+                width = float(np.min(polygon.max(axis=0) - polygon.min(axis=0)))
+
+            world = origin + polygon[:, :1] * u_axis + polygon[:, 1:] * v_axis
+            overlaps.append(Overlap(int(members[a]), int(members[b]), world, area, width,
+                                    100 * area / areas[a], 100 * area / areas[b]))
+
+    overlaps.sort(key=lambda overlap: (overlap.index_a, overlap.index_b))
+    return overlaps
@@ -0,0 +1,238 @@
+"""
+Lecture des fichiers d'implantation : un projecteur par ligne (CSV / XLSX) ou par
+objet (JSON), avec sa position, son orientation, son optique et ses réglages.
+
+Colonnes reconnues (en-têtes normalisés comme dans spec_import) : name, x, y, z,
+rot_x, rot_y, rot_z (degrés), brand, model, lens, throw_ratio, h_shift, v_shift
+(%), resolution ('1920x1200'), power (%), orientation, screen_distance (m).
+Seules x, y et z sont obligatoires. En JSON, location et rotation peuvent aussi
+être des listes de trois nombres :
+
+    {"projectors": [{"name": "P1", "location": [0, -12, 8], "rotation": [80, 0, 0],
+                     "brand": "Barco", "model": "UDX-4K32", "lens": "...", "throw_ratio": 1.2}]}
+
+Toutes les entrées sont contrôlées en une passe et chaque problème est rapporté
+avec son numéro de ligne (en-tête = ligne 1 ; position dans la liste en JSON).
+Ce module n'importe pas bpy.
+"""
+import json
+import math
+import re
+from collections import namedtuple
+
+from .spec_import import ImportIssue, clean_text, normalize_header, parse_number, read_sheet_rows
+
+
+# En-têtes acceptés pour chaque champ, une fois normalisés par normalize_header
+LAYOUT_ALIASES = {
+    'name': ('name', 'projector', 'projector_name', 'id', 'nom'),
+    'x': ('x', 'loc_x', 'location_x', 'pos_x'),
+    'y': ('y', 'loc_y', 'location_y', 'pos_y'),
+    'z': ('z', 'loc_z', 'location_z', 'pos_z'),
+    'rot_x': ('rot_x', 'rotation_x', 'rx'),
+    'rot_y': ('rot_y', 'rotation_y', 'ry'),
+    'rot_z': ('rot_z', 'rotation_z', 'rz'),
+    'brand': ('brand', 'manufacturer', 'marque'),
+    'model': ('model', 'projector_model', 'modele'),
+    'lens': ('lens', 'optic', 'optique'),
+    'throw_ratio': ('throw_ratio', 'throw', 'tr'),
+    'h_shift': ('h_shift', 'horizontal_shift', 'shift_h'),
+    'v_shift': ('v_shift', 'vertical_shift', 'shift_v'),
+    'resolution': ('resolution', 'res'),
+    'power': ('power', 'light_power'),
+    'orientation': ('orientation',),
+    'screen_distance': ('screen_distance', 'distance'),
+}
+REQUIRED_FIELDS = ('x', 'y', 'z')
+NUMERIC_FIELDS = ('x', 'y', 'z', 'rot_x', 'rot_y', 'rot_z', 'throw_ratio', 'h_shift', 'v_shift', 'power',
+                  'screen_distance')
+ORIENTATIONS = ('LANDSCAPE', 'LANDSCAPE DUAL', 'PORTRAIT')
+RESOLUTION_PATTERN = re.compile(r'^(\d+)\s*[x×*]\s*(\d+)$', re.IGNORECASE)
+
+LayoutEntry = namedtuple('LayoutEntry', [
+    'row',              # Ligne du fichier (1 = en-tête ; position à partir de 1 en JSON)
+    'name',             # Nom du projecteur ('' : nom par défaut)
+    'location',         # (x, y, z) en mètres
+    'rotation',         # (x, y, z) en radians
+    'brand',            # Optique du catalogue ('' si non précisée)
+    'model',
+    'lens',
+    'throw_ratio',      # Réglages : None quand la valeur n'est pas donnée
+    'h_shift',
+    'v_shift',
+    'resolution',
+    'power',
+    'orientation',
+    'screen_distance',
+])
+
+
+def read_layout_records(filepath):
+    """
+    Return [(row, {field: raw value})] for a CSV, XLSX or JSON layout, and the
+    header issues (missing columns).
+    """
+    if filepath.lower().endswith('.json'):
+        with open(filepath, encoding='utf-8') as jsonfile:
+            document = json.load(jsonfile)
+        return json_layout_records(document)
+    return sheet_layout_records(read_sheet_rows(filepath))
+
+
+def map_layout_fields(names):
+    """ {field: key} for the recognized (key, header) pairs of a header row or a JSON object. """
+    fields = {}
+    for key, header in names:
+        name = normalize_header(header)
+        for field, aliases in LAYOUT_ALIASES.items():
+            if name in aliases and field not in fields:
+                fields[field] = key
+                break
+    return fields
+
+
+def sheet_layout_records(rows):
+    if not rows:
+        return [], []
+    columns = map_layout_fields(enumerate(rows[0]))
+    missing = [field for field in REQUIRED_FIELDS if field not in columns]
+    if missing:
+        return [], [ImportIssue(1, '', 'ERROR', f"Missing column(s): {', '.join(missing)}")]
+
+    records = []
+    for row_number, values in enumerate(rows[1:], start=2):
+        if not any(clean_text(value) for value in values):
+            continue
+        records.append((row_number, {field: values[column] if column < len(values) else ''
+                                     for field, column in columns.items()}))
+    return records, []
+
+
+def json_layout_records(document):
+    items = document.get('projectors') if isinstance(document, dict) else document
+    if not isinstance(items, list):
+        return [], [ImportIssue(1, '', 'ERROR', "Expected a list of projectors (or {\"projectors\": [...]})")]
+
+    records = []
+    for position, item in enumerate(items, start=1):
+        if not isinstance(item, dict):
+            records.append((position, None))
+            continue
+        record = {}
+        # Listes de trois valeurs : location -> x, y, z ; rotation -> rot_x, rot_y, rot_z
+        for key, fields in (('location', ('x', 'y', 'z')), ('rotation', ('rot_x', 'rot_y', 'rot_z'))):
+            values = item.get(key)
+            if isinstance(values, (list, tuple)) and len(values) == 3:
+                record.update(zip(fields, values))
+        for field, key in map_layout_fields((key, key) for key in item).items():
+            record.setdefault(field, item[key])
+        records.append((position, record))
+    return records, []
+
+
+class ProjectorLayout:
+    """
+    Résultat du contrôle d'un fichier d'implantation : entrées valides (`entries`)
+    et problèmes (`issues`, triés par ligne). Avec `lens_index` (core.lens_index),
+    les optiques absentes du catalogue sont signalées ; avec `resolutions`, les
+    résolutions hors de la liste le sont aussi.
+    """
+
+    def __init__(self, records, issues=(), lens_index=None, resolutions=None):
+        self.entries = []
+        self.issues = list(issues)
+        self.lens_index = lens_index
+        self.resolutions = resolutions
+        names = set()
+        for row, record in records:
+            entry = self._validate(row, record)
+            if entry is None:
+                continue
+            if entry.name and entry.name in names:
+                self._warning(row, 'name', f"Duplicate name '{entry.name}', Blender will rename it")
+            names.add(entry.name)
+            self.entries.append(entry)
+        self.issues.sort(key=lambda issue: issue.row)
+
+    @classmethod
+    def from_file(cls, filepath, lens_index=None, resolutions=None):
+        records, issues = read_layout_records(filepath)
+        return cls(records, issues, lens_index, resolutions)
+
+    @property
+    def errors(self):
+        return [issue for issue in self.issues if issue.severity == 'ERROR']
+
+    @property
+    def warnings(self):
+        return [issue for issue in self.issues if issue.severity == 'WARNING']
+
+    def _error(self, row, column, message):
+        self.issues.append(ImportIssue(row, column, 'ERROR', message))
+
+    def _warning(self, row, column, message):
+        self.issues.append(ImportIssue(row, column, 'WARNING', message))
+
+    def _validate(self, row, record):
+        """ Return the LayoutEntry of a record, or None (and an error) if it is invalid. """
+        if record is None:
+            self._error(row, '', "Expected an object")
+            return None
+
+        values = {}
+        valid = True
+        for field in NUMERIC_FIELDS:
+            raw = record.get(field)
+            if raw is None or (isinstance(raw, str) and not clean_text(raw)):
+                if field in REQUIRED_FIELDS:
+                    self._error(row, field, f"Missing {field}")
+                    valid = False
+                values[field] = None
+                continue
+            value = float(raw) if isinstance(raw, (int, float)) and not isinstance(raw, bool) else parse_number(raw)
+            if value is None or not math.isfinite(value):
+                self._error(row, field, f"'{raw}' is not a number")
+                valid = False
+            values[field] = value
+
+        for field in ('throw_ratio', 'screen_distance'):
+            if values[field] is not None and values[field] <= 0:
+                self._error(row, field, f"{field} must be positive, got {values[field]:g}")
+                valid = False
+        if values['power'] is not None and values['power'] < 0:
+            self._error(row, 'power', f"power must not be negative, got {values['power']:g}")
+            valid = False
+
+        resolution = clean_text(record.get('resolution')) or None
+        if resolution:
+            match = RESOLUTION_PATTERN.match(resolution)
+            if match is None:
+                self._error(row, 'resolution', f"'{resolution}' is not a WxH resolution")
+                valid = False
+            else:
+                resolution = f'{match.group(1)}x{match.group(2)}'
+                if self.resolutions is not None and resolution not in self.resolutions:
+                    self._warning(row, 'resolution', f"Resolution {resolution} is not available, not applied")
+                    resolution = None
+
+        orientation = clean_text(record.get('orientation')).upper().replace('_', ' ') or None
+        if orientation and orientation not in ORIENTATIONS:
+            self._error(row, 'orientation', f"'{orientation}' is not one of {', '.join(ORIENTATIONS)}")
+            valid = False
+
+        brand, model, lens = (clean_text(record.get(field)) for field in ('brand', 'model', 'lens'))
+        if not lens:
+            brand = model = ''
+        elif not (brand and model):
+            self._error(row, 'lens', "A lens needs its brand and model")
+            valid = False
+        elif lens and self.lens_index is not None and self.lens_index.find(brand, model, lens) is None:
+            self._warning(row, 'lens', f"'{brand} {model} | {lens}' is not in the catalog, lens not applied")
+            brand = model = lens = ''
+
+        if not valid:
+            return None
+        rotation = tuple(math.radians(values[field] or 0.0) for field in ('rot_x', 'rot_y', 'rot_z'))
+        return LayoutEntry(row, clean_text(record.get('name')), (values['x'], values['y'], values['z']), rotation,
+                           brand, model, lens, values['throw_ratio'], values['h_shift'],
+                           values['v_shift'], resolution, values['power'], orientation, values['screen_distance'])
@@ -0,0 +1,210 @@
+"""
+Index numérique des optiques du catalogue.
+
+Chaque nom d'optique ('0.65-0.75:1 G LENS (R9802300)') est analysé une seule fois au
+chargement : plage de throw ratio, zoom ou focale fixe, UST, renvoi à 90°, référence.
+Une optique montée sur plusieurs boîtiers n'est stockée qu'une fois.
+Les requêtes (par modèle, par intervalle de throw ratio) se font ensuite sur des
+tableaux NumPy, sans analyse de chaînes dans les callbacks de dessin ou de mise à jour.
+Ce module n'importe pas bpy.
+"""
+import re
+from collections import namedtuple
+
+import numpy as np
+
+
+# Plage de throw ratio en tête du nom d'optique : '0.65-0.75:1 ...' ou '0.36:1 ...'
+THROW_RANGE_PATTERN = re.compile(r'^\s*(\d+(?:\.\d+)?)(?:\s*-\s*(\d+(?:\.\d+)?))?\s*:\s*1')
+# Référence constructeur entre parenthèses : '(R9802300)'
+PART_NUMBER_PATTERN = re.compile(r'\(([^)]+)\)')
+UST_PATTERN = re.compile(r'\bUST\b', re.IGNORECASE)
+MIRROR_90_PATTERN = re.compile(r'\b90\s*°')
+
+LensInfo = namedtuple('LensInfo', [
+    'throw_min',     # Throw ratio minimal (nan si absent du nom)
+    'throw_max',     # Throw ratio maximal
+    'is_zoom',       # Optique zoom (plage) ou focale fixe
+    'is_ust',        # Ultra courte focale
+    'is_mirror_90',  # Optique à renvoi à 90°
+    'part_number',   # Référence constructeur ('' si absente)
+    'short_name',    # Nom court affiché dans l'UI ('0.65-0.75:1')
+])
+
+
+def parse_lens_name(name):
+    """ Analyse un nom d'optique du catalogue et retourne un LensInfo. """
+    match = THROW_RANGE_PATTERN.match(name)
+    if match:
+        throw_min = float(match.group(1))
+        throw_max = float(match.group(2)) if match.group(2) else throw_min
+    else:
+        throw_min = throw_max = float('nan')
+    part_number = PART_NUMBER_PATTERN.search(name)
+    return LensInfo(
+        throw_min,
+        throw_max,
+        throw_max > throw_min,
+        bool(UST_PATTERN.search(name)),
+        bool(MIRROR_90_PATTERN.search(name)),
+        part_number.group(1).strip() if part_number else '',
+        name.split(' ')[0] if ' ' in name else name,
+    )
+
+
+class LensIndex:
+    """
+    Catalogue normalisé en trois tables à identifiants entiers, sans dict par optique :
+    - modèles (model_names, model_brand -> brand_names) ;
+    - optiques (lens_names et grandeurs analysées, une fois par nom d'optique) ;
+    - compatibilités : une ligne par couple (modèle, optique) avec les lumens et les
+      shifts constructeur (model_id, lens_id, ansi_lumens, raw_*).
+    Les lignes de l'index sont les compatibilités, groupées par modèle dans l'ordre du
+    catalogue (model_rows donne les bornes). Les colonnes par ligne (brand, lens,
+    throw_min, h_shift_min...) sont rassemblées depuis les tables ; les shifts y sont
+    multipliés par le coefficient de leur marque (`shift_scales`, sinon
+    `default_shift_scale`).
+    """
+
+    def __init__(self, catalog, shift_scales=None, default_shift_scale=1.0):
+        self.shift_scales = dict(shift_scales or {})
+        self.default_shift_scale = default_shift_scale
+        self.brand_names = []
+        model_names = []
+        model_brand = []
+        model_rows = [0]
+        lens_names = []
+        lens_infos = []
+        self._lens_ids = {}
+        self._model_ids = {}
+        model_ids = []
+        lens_ids = []
+        values = []
+
+        for brand, models in catalog.items():
+            brand_id = len(self.brand_names)
+            self.brand_names.append(brand)
+            for model, lenses in models.items():
+                self._model_ids[(brand, model)] = len(model_names)
+                for lens, lens_data in lenses.items():
+                    lens_id = self._lens_ids.get(lens)
+                    if lens_id is None:
+                        lens_id = self._lens_ids[lens] = len(lens_names)
+                        lens_names.append(lens)
+                        lens_infos.append(parse_lens_name(lens))
+                    model_ids.append(len(model_names))
+                    lens_ids.append(lens_id)
+                    values.append((lens_data['ansi_lumens'],
+                                   lens_data['h_shift_min'], lens_data['h_shift_max'],
+                                   lens_data['v_shift_min'], lens_data['v_shift_max']))
+                model_names.append(model)
+                model_brand.append(brand_id)
+                model_rows.append(len(model_ids))
+
+        # Table des modèles
+        self.model_names = np.array(model_names, dtype=object)
+        self.model_brand = np.array(model_brand, dtype=np.int32)
+        self.model_rows = np.array(model_rows, dtype=np.int64)
+
+        # Table des optiques
+        self.lens_names = np.array(lens_names, dtype=object)
+        self._lens_info = lens_infos
+        lens_throw_min = np.array([info.throw_min for info in lens_infos], dtype=float)
+        lens_throw_max = np.array([info.throw_max for info in lens_infos], dtype=float)
+        lens_flags = np.array([(info.is_zoom, info.is_ust, info.is_mirror_90) for info in lens_infos],
+                              dtype=bool).reshape(-1, 3)
+        lens_part_number = np.array([info.part_number for info in lens_infos], dtype=object)
+        lens_short_name = np.array([info.short_name for info in lens_infos], dtype=object)
+
+        # Table des compatibilités
+        self.model_id = np.array(model_ids, dtype=np.int32)
+        self.lens_id = np.array(lens_ids, dtype=np.int32)
+        values = np.array(values, dtype=float).reshape(-1, 5)
+        self.ansi_lumens = values[:, 0]
+        self.raw_h_shift_min, self.raw_h_shift_max = values[:, 1], values[:, 2]
+        self.raw_v_shift_min, self.raw_v_shift_max = values[:, 3], values[:, 4]
+
+        # Colonnes par ligne, rassemblées depuis les tables
+        self.brand = np.array(self.brand_names, dtype=object)[self.model_brand[self.model_id]] \
+            if len(self.model_id) else np.empty(0, dtype=object)
+        self.model = self.model_names[self.model_id]
+        self.lens = self.lens_names[self.lens_id]
+        self.throw_min = lens_throw_min[self.lens_id]
+        self.throw_max = lens_throw_max[self.lens_id]
+        self.is_zoom = lens_flags[self.lens_id, 0]
+        self.is_ust = lens_flags[self.lens_id, 1]
+        self.is_mirror_90 = lens_flags[self.lens_id, 2]
+        self.part_number = lens_part_number[self.lens_id]
+        self.short_name = lens_short_name[self.lens_id]
+        brand_scale = np.array([self.shift_scales.get(brand, default_shift_scale) for brand in self.brand_names],
+                               dtype=float)
+        self.shift_scale = brand_scale[self.model_brand[self.model_id]] if len(self.model_id) else np.empty(0)
+        self.h_shift_min = self.raw_h_shift_min * self.shift_scale
+        self.h_shift_max = self.raw_h_shift_max * self.shift_scale
+        self.v_shift_min = self.raw_v_shift_min * self.shift_scale
+        self.v_shift_max = self.raw_v_shift_max * self.shift_scale
+
+        # Tri par throw minimal pour les requêtes d'intervalle
+        self._by_throw_min = np.argsort(self.throw_min, kind='stable')
+        self._sorted_throw_min = self.throw_min[self._by_throw_min]
+
+    def __len__(self):
+        return len(self.lens_id)
+
+    def model_slice(self, brand, model):
+        """ Slice of the rows of a model, or None if it is not in the catalog. """
+        model_id = self._model_ids.get((brand, model))
+        if model_id is None:
+            return None
+        return slice(int(self.model_rows[model_id]), int(self.model_rows[model_id + 1]))
+
+    def find(self, brand, model, lens):
+        """ Return the row of a (brand, model, lens) combination or None. """
+        rows = self.model_slice(brand, model)
+        lens_id = self._lens_ids.get(lens)
+        if rows is None or lens_id is None:
+            return None
+        found = np.flatnonzero(self.lens_id[rows] == lens_id)
+        return int(rows.start + found[0]) if len(found) else None
+
+    def models(self, brand):
+        """ Model names of a brand, in catalog order. """
+        if brand not in self.brand_names:
+            return []
+        return list(self.model_names[self.model_brand == self.brand_names.index(brand)])
+
+    def lenses(self, brand, model):
+        """ Lens names of a model, in catalog order. """
+        rows = self.model_slice(brand, model)
+        return [] if rows is None else list(self.lens[rows])
+
+    def info(self, lens):
+        """ Return the parsed LensInfo of a lens name (parsed on the fly if unknown). """
+        lens_id = self._lens_ids.get(lens)
+        return parse_lens_name(lens) if lens_id is None else self._lens_info[lens_id]
+
+    def select(self, brand=None, model=None):
+        """ Rows of a brand and/or a model, in catalog order. """
+        if brand is not None and model is not None:
+            rows = self.model_slice(brand, model)
+            return np.arange(rows.start, rows.stop) if rows is not None else np.empty(0, dtype=np.int64)
+        mask = np.ones(len(self), dtype=bool)
+        if brand is not None:
+            mask &= self.brand == brand
+        if model is not None:
+            mask &= self.model == model
+        return np.flatnonzero(mask)
+
+    def in_throw_range(self, throw_min, throw_max=None, rows=None):
+        """
+        Rows whose zoom range intersects [throw_min, throw_max] (a single throw ratio
+        if throw_max is omitted), optionally restricted to `rows`. Returned sorted.
+        """
+        throw_max = throw_min if throw_max is None else throw_max
+        # Candidats : throw minimal de l'optique <= borne haute de la requête
+        end = np.searchsorted(self._sorted_throw_min, throw_max, side='right')
+        candidates = self._by_throw_min[:end]
+        candidates = np.sort(candidates[self.throw_max[candidates] >= throw_min])
+        if rows is not None:
+            candidates = np.intersect1d(candidates, rows, assume_unique=True)
+        return candidates
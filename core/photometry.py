@@ -0,0 +1,341 @@
+"""
+Moteur photométrique vectorisé.
+
+Calcule en un seul appel NumPy toutes les grandeurs dérivées (taille d'image,
+lux, taille de pixel, décalage dû au shift) pour N projecteurs.
+Ce module n'importe pas bpy : il peut être utilisé depuis l'UI, l'export CSV
+ou les opérateurs, et testé sans Blender.
+"""
+from collections import namedtuple
+
+import numpy as np
+
+
+# Cache des résolutions déjà analysées ('1920x1200' -> (1920.0, 1200.0))
+_RESOLUTION_CACHE = {}
+
+ProjectorMetrics = namedtuple('ProjectorMetrics', [
+    'screen_width',     # Largeur de l'image (m)
+    'screen_height',    # Hauteur de l'image (m)
+    'aspect_ratio',     # Largeur / hauteur de la résolution
+    'area',             # Surface de l'image (m²)
+    'lux',              # Éclairement moyen (lx)
+    'pixel_width_mm',   # Largeur d'un pixel (mm)
+    'pixel_height_mm',  # Hauteur d'un pixel (mm)
+    'offset_h',         # Décalage horizontal de l'image dû au shift (m)
+    'offset_v',         # Décalage vertical de l'image dû au shift (m)
+])
+
+
+LensEvaluation = namedtuple('LensEvaluation', [
+    'throw_ratio',      # Throw ratio retenu : le throw actuel ramené dans la plage de zoom
+    'in_zoom_range',    # Le throw actuel est atteignable avec cette optique
+    'width_min',        # Largeur d'image au zoom le plus long (m)
+    'width_max',        # Largeur d'image au zoom le plus court (m)
+    'screen_width',     # Largeur d'image au throw retenu (m)
+    'screen_height',    # Hauteur d'image au throw retenu (m)
+    'lux',              # Éclairement moyen au throw retenu (lx)
+    'pixel_width_mm',   # Taille de pixel au throw retenu (mm)
+    'h_shift_ok',       # Le shift horizontal actuel est dans les limites de l'optique
+    'v_shift_ok',       # Le shift vertical actuel est dans les limites de l'optique
+])
+
+
+RigOptics = namedtuple('RigOptics', [
+    'angle',            # Champ horizontal de la caméra (rad)
+    'shift_x',          # Shift de la caméra (fraction de la largeur)
+    'shift_y',          # Shift de la caméra (fraction de la largeur, comme Blender)
+    'scale_x',          # Échelle du mapping de la texture projetée
+    'scale_y',
+    'translation_x',    # Translation du mapping de la texture projetée
+    'translation_y',
+])
+
+
+Placement = namedtuple('Placement', [
+    'screen_distance',  # Distance projecteur - écran le long de l'axe (m)
+    'throw_ratio',      # Throw ratio dans la plage de zoom de l'optique
+    'h_shift',          # Shift horizontal (%), borné aux limites de l'optique
+    'v_shift',          # Shift vertical (%), borné aux limites de l'optique
+    'image_width',      # Largeur de l'image obtenue (m)
+    'image_height',     # Hauteur de l'image obtenue (m)
+    'zoom_ok',          # L'image remplit l'écran sans déplacer le projecteur
+    'shift_ok',         # Le shift nécessaire est dans les limites de l'optique
+])
+
+
+def parse_resolution(resolution):
+    """ Return (width, height) in pixels of a 'WxH' resolution string. The result is cached. """
+    size = _RESOLUTION_CACHE.get(resolution)
+    if size is None:
+        res_w, res_h = resolution.split('x')
+        size = (float(res_w), float(res_h))
+        _RESOLUTION_CACHE[resolution] = size
+    return size
+
+
+def parse_resolutions(resolutions):
+    """
+    Convertit une séquence de résolutions en deux tableaux (largeurs, hauteurs).
+    Accepte des chaînes 'WxH' ou des couples (w, h).
+    """
+    sizes = [parse_resolution(res) if isinstance(res, str) else res for res in resolutions]
+    if not sizes:
+        return np.empty(0), np.empty(0)
+    sizes = np.asarray(sizes, dtype=float).reshape(-1, 2)
+    return sizes[:, 0], sizes[:, 1]
+
+
+def calculate_screen_size(throw_ratio, screen_distance, resolution):
+    """
+    Calcule la taille de l'écran selon throw ratio et distance
+    """
+    # Largeur image = distance / throw_ratio
+    screen_width = screen_distance / throw_ratio
+    
+    # Hauteur selon aspect ratio de la résolution
+    res_w, res_h = parse_resolution(resolution)
+    aspect_ratio = res_w / res_h
+    screen_height = screen_width / aspect_ratio
+    
+    return screen_width, screen_height
+
+
+def calculate_lux(power_lumens_ansi, screen_width, screen_height):
+    """
+    Calcule les lux sur l'écran
+    Lux = Lumens ANSI / Surface_écran_m²
+    """
+    surface_m2 = (screen_width * screen_height)
+    if surface_m2 > 0:
+        return power_lumens_ansi / surface_m2
+    return 0
+
+
+def calculate_pixel_size(screen_width, screen_height, resolution):
+    """
+    Calcule la taille physique d'un pixel sur l'écran
+    """
+    res_w, res_h = parse_resolution(resolution)
+    pixel_width_m = screen_width / res_w
+    pixel_height_m = screen_height / res_h
+    
+    # Convertir en millimètres
+    pixel_width_mm = pixel_width_m * 1000
+    pixel_height_mm = pixel_height_m * 1000
+    
+    return pixel_width_mm, pixel_height_mm
+
+
+def compute_metrics(throw_ratio, screen_distance, resolution, lumens, h_shift=0.0, v_shift=0.0):
+    """
+    Calcule toutes les grandeurs photométriques pour N projecteurs en une fois.
+
+    Tous les arguments sont des scalaires ou des tableaux de longueur N
+    (diffusion NumPy). `resolution` est une séquence de chaînes 'WxH' ou un
+    tableau (N, 2) de pixels. Les shifts sont en pourcentage, comme dans
+    proj_settings. Les valeurs impossibles (throw ratio ou distance nuls)
+    donnent NaN, le lux d'une surface nulle vaut 0.
+    """
+    if isinstance(resolution, str):
+        res_w, res_h = parse_resolution(resolution)
+    else:
+        res_w, res_h = parse_resolutions(resolution)
+
+    throw_ratio = np.asarray(throw_ratio, dtype=float)
+    screen_distance = np.asarray(screen_distance, dtype=float)
+    lumens = np.asarray(lumens, dtype=float)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # Largeur image = distance / throw_ratio
+        screen_width = np.where(throw_ratio > 0, screen_distance / throw_ratio, np.nan)
+        # Hauteur selon aspect ratio de la résolution
+        aspect_ratio = np.asarray(res_w, dtype=float) / np.asarray(res_h, dtype=float)
+        screen_height = screen_width / aspect_ratio
+
+        # Lux = Lumens ANSI / Surface_écran_m²
+        area = screen_width * screen_height
+        lux = np.where(area > 0, lumens / area, 0.0)
+
+        # Taille physique d'un pixel, en millimètres
+        pixel_width_mm = screen_width / res_w * 1000
+        pixel_height_mm = screen_height / res_h * 1000
+
+    offset_h = np.asarray(h_shift, dtype=float) / 100 * screen_width
+    offset_v = np.asarray(v_shift, dtype=float) / 100 * screen_height
+
+    return ProjectorMetrics(screen_width, screen_height, aspect_ratio, area, lux,
+                            pixel_width_mm, pixel_height_mm, offset_h, offset_v)
+
+
+def evaluate_lenses(throw_min, throw_max, lumens, h_shift_min, h_shift_max, v_shift_min, v_shift_max,
+                    screen_distance, resolution, throw_ratio, h_shift=0.0, v_shift=0.0):
+    """
+    Évalue en un seul appel une série d'optiques pour un rig placé.
+
+    Les caractéristiques des optiques sont des tableaux de longueur L (une valeur
+    par optique) ; distance, résolution, throw et shifts sont ceux du rig. Le throw
+    actuel est ramené dans la plage de zoom de chaque optique avant le calcul.
+    """
+    throw_min = np.asarray(throw_min, dtype=float)
+    throw_max = np.asarray(throw_max, dtype=float)
+    chosen = np.clip(throw_ratio, throw_min, throw_max)
+    metrics = compute_metrics(chosen, screen_distance, resolution, lumens)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        width_min = screen_distance / throw_max
+        width_max = screen_distance / throw_min
+
+    return LensEvaluation(
+        chosen,
+        (throw_ratio >= throw_min) & (throw_ratio <= throw_max),
+        width_min,
+        width_max,
+        metrics.screen_width,
+        metrics.screen_height,
+        metrics.lux,
+        metrics.pixel_width_mm,
+        (h_shift >= np.asarray(h_shift_min)) & (h_shift <= np.asarray(h_shift_max)),
+        (v_shift >= np.asarray(v_shift_min)) & (v_shift <= np.asarray(v_shift_max)),
+    )
+
+
+def solve_placement(target_width, target_height, screen_distance, offset_h, offset_v, aspect_ratio,
+                    throw_min, throw_max, h_shift_min, h_shift_max, v_shift_min, v_shift_max):
+    """
+    Placement inverse, en forme close et vectorisé sur N rigs.
+
+    L'écran cible (largeur, hauteur, centre décalé de offset_h/offset_v par rapport à
+    l'axe optique, en mètres) est vu à `screen_distance` le long de l'axe. L'image
+    doit couvrir l'écran : largeur = max(largeur écran, hauteur écran * aspect).
+    Le throw ratio nécessaire est ramené dans la plage de zoom ; s'il est borné, la
+    distance est recalculée pour conserver la taille d'image. Les shifts (%) qui
+    centrent l'image sur l'écran sont bornés aux limites de l'optique.
+    """
+    aspect_ratio = np.asarray(aspect_ratio, dtype=float)
+    screen_distance = np.asarray(screen_distance, dtype=float)
+    image_width = np.maximum(np.asarray(target_width, dtype=float),
+                             np.asarray(target_height, dtype=float) * aspect_ratio)
+    image_height = image_width / aspect_ratio
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        needed = screen_distance / image_width
+        throw_ratio = np.clip(needed, throw_min, throw_max)
+        # Si le zoom ne suffit pas, c'est le projecteur qui doit avancer ou reculer
+        distance = throw_ratio * image_width
+
+        h_needed = np.asarray(offset_h, dtype=float) / image_width * 100
+        v_needed = np.asarray(offset_v, dtype=float) / image_height * 100
+    h_shift = np.clip(h_needed, h_shift_min, h_shift_max)
+    v_shift = np.clip(v_needed, v_shift_min, v_shift_max)
+
+    return Placement(
+        distance,
+        throw_ratio,
+        h_shift,
+        v_shift,
+        image_width,
+        image_height,
+        np.isclose(throw_ratio, needed),
+        np.isclose(h_shift, h_needed) & np.isclose(v_shift, v_needed),
+    )
+
+
+def compute_rig_optics(throw_ratio, h_shift, v_shift, resolution):
+    """
+    Réglages de caméra et de mapping de N rigs en un seul appel vectorisé.
+    Les shifts sont en pourcentage, `resolution` est une séquence de chaînes 'WxH'
+    ou de couples (w, h) (résolution d'une texture personnalisée).
+    """
+    if isinstance(resolution, str):
+        res_w, res_h = parse_resolution(resolution)
+    else:
+        res_w, res_h = parse_resolutions(resolution)
+
+    throw_ratio = np.asarray(throw_ratio, dtype=float)
+    h_shift = np.asarray(h_shift, dtype=float) / 100
+    v_shift = np.asarray(v_shift, dtype=float) / 100
+    inverted_aspect_ratio = np.asarray(res_h, dtype=float) / np.asarray(res_w, dtype=float)
+
+    # Image d'une largeur 1 / throw_ratio à 1 m
+    angle = np.arctan(0.5 / throw_ratio) * 2
+    scale_x = 1 / throw_ratio
+    scale_y = scale_x * inverted_aspect_ratio
+    return RigOptics(angle, h_shift, v_shift * inverted_aspect_ratio, scale_x, scale_y,
+                     h_shift * scale_x, v_shift * scale_y)
+
+
+def projector_frames(matrices):
+    """
+    Extrait l'origine et les axes monde (droite, haut, visée) de N matrices 4x4 de caméras.
+    Une caméra Blender vise selon -Z local ; l'échelle de l'objet est ignorée.
+    """
+    matrices = np.asarray(matrices, dtype=float).reshape(-1, 4, 4)
+    origins = matrices[:, :3, 3]
+    axes = matrices[:, :3, :3]
+    axes = axes / np.linalg.norm(axes, axis=1, keepdims=True)
+    return origins, axes[:, :, 0], axes[:, :, 1], -axes[:, :, 2]
+
+
+def image_window(throw_ratio, aspect_ratio, h_shift=0.0, v_shift=0.0):
+    """
+    Fenêtre de l'image projetée sur un plan situé à 1 m du projecteur.
+    Retourne (centre_h, centre_v, demi_largeur, demi_hauteur) ; les shifts sont en
+    pourcentage de la largeur et de la hauteur de l'image, comme la caméra du rig.
+    """
+    width = 1 / np.asarray(throw_ratio, dtype=float)
+    height = width / np.asarray(aspect_ratio, dtype=float)
+    center_h = np.asarray(h_shift, dtype=float) / 100 * width
+    center_v = np.asarray(v_shift, dtype=float) / 100 * height
+    return center_h, center_v, width / 2, height / 2
+
+
+def illuminance_at_points(points, normals, matrices, throw_ratio, aspect_ratio, lumens,
+                          h_shift=0.0, v_shift=0.0):
+    """
+    Éclairement (lx) reçu par M points d'une surface depuis N projecteurs.
+
+    Chaque projecteur répartit ses lumens uniformément sur son image : sur un plan
+    perpendiculaire à l'axe à la distance z, E = lumens / (surface_à_1m * z²).
+    Pour une surface quelconque on applique le cosinus d'incidence :
+    E = lumens * r * cos(n) / (surface_à_1m * z³), r étant la distance au point.
+    Les points hors du frustum (throw ratio, aspect, shift) ne reçoivent rien.
+    Les surfaces sont considérées double face.
+
+    Retourne (lux, hits) : éclairement cumulé et nombre de projecteurs touchant chaque point.
+    """
+    points = np.asarray(points, dtype=float).reshape(-1, 3)
+    normals = np.asarray(normals, dtype=float).reshape(-1, 3)
+    origins, right, up, forward = projector_frames(matrices)
+    count = len(origins)
+
+    throw_ratio, aspect_ratio, lumens, h_shift, v_shift = (
+        np.broadcast_to(np.asarray(value, dtype=float), (count,))
+        for value in (throw_ratio, aspect_ratio, lumens, h_shift, v_shift))
+    center_h, center_v, half_w, half_h = image_window(throw_ratio, aspect_ratio, h_shift, v_shift)
+    unit_area = 4 * half_w * half_h
+
+    lux = np.zeros(len(points))
+    hits = np.zeros(len(points), dtype=np.int32)
+
+    for i in range(count):
+        # Coordonnées dans le repère du projecteur (droite, haut, visée)
+        frame = np.stack((right[i], up[i], forward[i]), axis=1)
+        local = points @ frame - origins[i] @ frame
+        x, y, z = local[:, 0], local[:, 1], local[:, 2]
+        # Test du frustum sans division : |x/z - centre| <= demi-largeur, avec z > 0
+        inside = ((z > 1e-6)
+                  & (np.abs(x - center_h[i] * z) <= half_w[i] * z)
+                  & (np.abs(y - center_v[i] * z) <= half_h[i] * z))
+        index = np.flatnonzero(inside)
+        if not len(index):
+            continue
+
+        rel = points[index] - origins[i]
+        z_in = z[index]
+        r = np.sqrt(np.einsum('ij,ij->i', rel, rel))
+        cos_n = np.abs(np.einsum('ij,ij->i', rel, normals[index])) / r
+        lux[index] += lumens[i] * r * cos_n / (unit_area[i] * z_in ** 3)
+        hits[index] += 1
+
+    return lux, hits
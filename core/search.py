@@ -0,0 +1,105 @@
+"""
+Recherche approchée dans le catalogue (marque, modèle, optique, référence).
+
+Chaque ligne du LensIndex est découpée en mots ('Barco', 'G62', 'W9', '0.65',
+'0.75', 'UST', 'R9802300'...) puis en trigrammes, rassemblés dans un index
+inversé trigramme -> lignes construit une seule fois. Une requête comme
+« 0.8 UST 4K » ou « R9802300 » est notée terme par terme :
+- un terme numérique correspond aux optiques dont la plage de zoom le contient ;
+- un terme texte est noté par la part de ses trigrammes présents dans la ligne.
+Ce module n'importe pas bpy.
+"""
+import re
+from collections import namedtuple
+
+import numpy as np
+
+
+WORD_PATTERN = re.compile(r'\d+\.\d+|[^\W_]+')
+NUMBER_PATTERN = re.compile(r'^\d+(?:\.\d+)?$')
+# Part minimale des trigrammes d'un terme présents dans une ligne pour qu'il compte
+MIN_TERM_SCORE = 0.5
+
+SearchMatch = namedtuple('SearchMatch', [
+    'row',    # Ligne du LensIndex
+    'score',  # Score décroissant avec la pertinence (1 par terme parfaitement trouvé)
+    'label',  # Libellé affiché 'Marque Modèle | Optique'
+])
+
+
+def split_words(text):
+    """ Lower-case words and numbers of a text ('0.65-0.75:1 G LENS' -> ['0.65', '0.75', '1', 'g', 'lens']). """
+    return WORD_PATTERN.findall(text.lower())
+
+
+def trigrams(word):
+    """ Trigrams of a word padded with spaces, so short words and word starts still match. """
+    padded = f' {word} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def entry_label(brand, model, lens):
+    """ Display label of a catalog entry, also accepted back by CatalogSearch.find_label. """
+    return f'{brand} {model} | {lens}'
+
+
+class CatalogSearch:
+    """ Index de trigrammes sur toutes les lignes d'un LensIndex. """
+
+    def __init__(self, index):
+        self.index = index
+        self.labels = [entry_label(brand, model, lens)
+                       for brand, model, lens in zip(index.brand, index.model, index.lens)]
+        self._rows_by_label = {label: row for row, label in enumerate(self.labels)}
+
+        postings = {}
+        for row, (brand, model, lens, part_number) in enumerate(zip(index.brand, index.model, index.lens,
+                                                                    index.part_number)):
+            row_trigrams = set()
+            for word in split_words(f'{brand} {model} {lens} {part_number}'):
+                row_trigrams |= trigrams(word)
+            for trigram in row_trigrams:
+                postings.setdefault(trigram, []).append(row)
+        self._postings = {trigram: np.array(rows, dtype=np.int32) for trigram, rows in postings.items()}
+
+    def find_label(self, label):
+        """ Row of an exact display label or None. """
+        return self._rows_by_label.get(label)
+
+    def term_scores(self, term):
+        """ Score in [0, 1] of one query term for every row. """
+        count = len(self.index)
+        if NUMBER_PATTERN.match(term):
+            value = float(term)
+            in_zoom = (self.index.throw_min <= value) & (self.index.throw_max >= value)
+            if in_zoom.any():
+                return in_zoom.astype(float)
+        term_trigrams = trigrams(term)
+        hits = np.zeros(count)
+        for trigram in term_trigrams:
+            rows = self._postings.get(trigram)
+            if rows is not None:
+                hits[rows] += 1
+        return hits / len(term_trigrams)
+
+    def search(self, query, limit=20):
+        """
+        Lignes correspondant à la requête, de la plus pertinente à la moins pertinente.
+        Chaque terme doit être trouvé (score >= MIN_TERM_SCORE) ; si aucune ligne ne les
+        trouve tous, les correspondances partielles sont renvoyées. À score égal, l'ordre
+        du catalogue est conservé. Retourne une liste de SearchMatch.
+        """
+        terms = split_words(query)
+        if not terms or not len(self.index):
+            return []
+        total = np.zeros(len(self.index))
+        found = np.ones(len(self.index), dtype=bool)
+        for term in terms:
+            scores = self.term_scores(term)
+            found &= scores >= MIN_TERM_SCORE
+            total += scores
+        rows = np.flatnonzero(found)
+        if not len(rows):
+            rows = np.flatnonzero(total >= MIN_TERM_SCORE)
+        rows = rows[np.argsort(-total[rows], kind='stable')][:limit]
+        return [SearchMatch(int(row), float(total[row]), self.labels[row]) for row in rows]
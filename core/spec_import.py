@@ -0,0 +1,350 @@
+"""
+Import des fiches techniques constructeur (CSV ou XLSX) vers un fichier catalogue.
+
+Une fiche est un tableau d'une ligne par couple (modèle, optique), avec au moins les
+colonnes marque, modèle, optique, lumens ANSI et les plages de shift, soit en deux
+colonnes (h_shift_min / h_shift_max), soit en une seule ('±40', '-120 / +120').
+Les en-têtes sont reconnus sans tenir compte de la casse, des accents ni des unités
+('ANSI Lumens', 'H Shift Min (%)', 'Modèle'...).
+
+Toutes les lignes sont contrôlées en une passe : cellules vides ou non numériques,
+valeurs hors plage, min > max, doublons. Chaque problème est rapporté avec le numéro
+de ligne du tableur (en-tête = ligne 1). Les lignes valides forment un catalogue au
+format de core/catalog.py, les shifts restant ceux du constructeur : le coefficient
+de chaque marque est écrit à part dans "shift_scales".
+Ce module n'importe pas bpy.
+"""
+import csv
+import re
+import unicodedata
+import zipfile
+import xml.etree.ElementTree as ET
+from collections import namedtuple
+
+import numpy as np
+
+from .catalog import LENS_FIELDS
+from .lens_index import THROW_RANGE_PATTERN
+
+
+# En-têtes acceptés pour chaque champ, une fois normalisés par normalize_header
+COLUMN_ALIASES = {
+    'brand': ('brand', 'manufacturer', 'make', 'marque'),
+    'model': ('model', 'projector', 'projector_model', 'modele'),
+    'lens': ('lens', 'lens_name', 'lens_description', 'optic', 'optique'),
+    'part_number': ('part_number', 'part_no', 'pn', 'order_code', 'reference', 'lens_part_number'),
+    'ansi_lumens': ('ansi_lumens', 'lumens', 'ansi_lm', 'brightness', 'lumens_ansi'),
+    'h_shift_min': ('h_shift_min', 'horizontal_shift_min', 'shift_h_min'),
+    'h_shift_max': ('h_shift_max', 'horizontal_shift_max', 'shift_h_max'),
+    'v_shift_min': ('v_shift_min', 'vertical_shift_min', 'shift_v_min'),
+    'v_shift_max': ('v_shift_max', 'vertical_shift_max', 'shift_v_max'),
+    'h_shift': ('h_shift', 'horizontal_shift', 'shift_h', 'lens_shift_h'),
+    'v_shift': ('v_shift', 'vertical_shift', 'shift_v', 'lens_shift_v'),
+}
+REQUIRED_COLUMNS = ('brand', 'model', 'lens', 'ansi_lumens')
+
+# Plages plausibles : au-delà, la valeur est rejetée comme erreur de saisie
+LUMENS_RANGE = (100.0, 100000.0)
+SHIFT_LIMIT = 300.0  # % de la hauteur / largeur d'image
+
+# Plage de shift en une cellule : '±40', '-120 / +120', '-30 to 30', '0~186'
+SHIFT_RANGE_PATTERN = re.compile(
+    r'^([+-]?\d+(?:\.\d+)?)\s*(?:/|to|~|\.\.|-)\s*([+-]?\d+(?:\.\d+)?)$', re.IGNORECASE)
+THOUSANDS_PATTERN = re.compile(r'^[+-]?\d{1,3}(?:[,\s]\d{3})+(?:\.\d+)?$')
+# Plage de throw ratio saisie librement en tête d'un nom : '0,65 – 0,75 : 1'
+LOOSE_THROW_PATTERN = re.compile(r'^(\d+(?:[.,]\d+)?)(?:\s*-\s*(\d+(?:[.,]\d+)?))?\s*:\s*1\b')
+
+XLSX_NAMESPACE = {'x': 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'}
+
+ImportIssue = namedtuple('ImportIssue', [
+    'row',       # Ligne du tableur (1 = en-tête)
+    'column',    # Champ concerné ('' pour la ligne entière)
+    'severity',  # 'ERROR' (ligne rejetée) ou 'WARNING' (ligne importée)
+    'message',
+])
+
+
+def normalize_header(text):
+    """ 'Modèle', 'ANSI Lumens', 'H Shift Min (%)' -> 'modele', 'ansi_lumens', 'h_shift_min'. """
+    text = unicodedata.normalize('NFKD', str(text)).encode('ascii', 'ignore').decode()
+    return re.sub(r'[^a-z0-9]+', '_', text.lower()).strip('_')
+
+
+def clean_text(text):
+    """ Cell text with unified dashes and single spaces. """
+    text = unicodedata.normalize('NFKC', str(text or ''))
+    text = text.replace('–', '-').replace('—', '-').replace('−', '-')
+    return ' '.join(text.split())
+
+
+def parse_number(text):
+    """ Parse '9 000', '9,000', '0,65', '+40 %' or '12000 lm'. Return None if not a number. """
+    text = clean_text(text).lower().replace('lm', '').replace('%', '').strip()
+    if not text:
+        return None
+    if THOUSANDS_PATTERN.match(text):
+        text = text.replace(',', '').replace(' ', '')
+    else:
+        text = text.replace(' ', '').replace(',', '.')
+    try:
+        return float(text)
+    except ValueError:
+        return None
+
+
+def parse_shift_range(text):
+    """ Parse a shift range in one cell ('±40', '-120 / +120', '0~186'). Return (min, max) or None. """
+    text = clean_text(text).replace('%', '').replace(' ', '').replace(',', '.')
+    if text.startswith('±') or text.startswith('+/-'):
+        value = parse_number(text.lstrip('±+/-'))
+        return None if value is None else (-value, value)
+    match = SHIFT_RANGE_PATTERN.match(text)
+    if match:
+        return float(match.group(1)), float(match.group(2))
+    value = parse_number(text)
+    return None if value is None else (-abs(value), abs(value))
+
+
+def normalize_lens_name(name, part_number=''):
+    """
+    Nom d'optique au format du catalogue : '0,65 – 0,75 : 1 G Lens' + 'R9802300'
+    -> '0.65-0.75:1 G Lens (R9802300)'. La référence n'est ajoutée que si elle
+    n'apparaît pas déjà dans le nom.
+    """
+    name = clean_text(name)
+    match = LOOSE_THROW_PATTERN.match(name)
+    if match:
+        throw_range = match.group(1).replace(',', '.')
+        if match.group(2):
+            throw_range += '-' + match.group(2).replace(',', '.')
+        name = f'{throw_range}:1{name[match.end():]}'
+    part_number = clean_text(part_number)
+    if part_number and part_number not in name:
+        name = f'{name} ({part_number})'
+    return name
+
+
+def read_csv_rows(filepath):
+    """ Rows of a CSV file (',', ';' or tab separated, UTF-8 or Windows-1252). """
+    for encoding in ('utf-8-sig', 'cp1252'):
+        try:
+            with open(filepath, encoding=encoding, newline='') as csvfile:
+                text = csvfile.read()
+            break
+        except UnicodeDecodeError:
+            continue
+    try:
+        dialect = csv.Sniffer().sniff(text[:4096], delimiters=',;\t')
+    except csv.Error:
+        dialect = csv.excel
+    return list(csv.reader(text.splitlines(), dialect))
+
+
+def column_index(cell_ref):
+    """ 'C12' -> 2. """
+    index = 0
+    for char in cell_ref:
+        if not char.isalpha():
+            break
+        index = index * 26 + ord(char.upper()) - ord('A') + 1
+    return index - 1
+
+
+def read_xlsx_rows(filepath):
+    """ Rows of the first worksheet of an XLSX file, as text (read with the standard library only). """
+    with zipfile.ZipFile(filepath) as xlsx:
+        names = set(xlsx.namelist())
+        shared_strings = []
+        if 'xl/sharedStrings.xml' in names:
+            root = ET.fromstring(xlsx.read('xl/sharedStrings.xml'))
+            for item in root.iterfind('x:si', XLSX_NAMESPACE):
+                shared_strings.append(''.join(t.text or '' for t in item.iter(f'{{{XLSX_NAMESPACE["x"]}}}t')))
+        sheets = sorted(name for name in names if re.match(r'xl/worksheets/sheet\d+\.xml$', name))
+        if not sheets:
+            raise ValueError(f"{filepath}: no worksheet found")
+        sheet = 'xl/worksheets/sheet1.xml' if 'xl/worksheets/sheet1.xml' in names else sheets[0]
+        root = ET.fromstring(xlsx.read(sheet))
+
+    rows = []
+    for row in root.iterfind('x:sheetData/x:row', XLSX_NAMESPACE):
+        cells = {}
+        for position, cell in enumerate(row.iterfind('x:c', XLSX_NAMESPACE)):
+            cell_type = cell.get('t')
+            if cell_type == 'inlineStr':
+                value = ''.join(t.text or '' for t in cell.iter(f'{{{XLSX_NAMESPACE["x"]}}}t'))
+            else:
+                value_node = cell.find('x:v', XLSX_NAMESPACE)
+                value = value_node.text if value_node is not None and value_node.text else ''
+                if cell_type == 's' and value:
+                    value = shared_strings[int(value)]
+            reference = cell.get('r')
+            cells[column_index(reference) if reference else position] = value
+        # Les lignes vides sont absentes du fichier : garder la numérotation du tableur
+        row_number = int(row.get('r', len(rows) + 1))
+        while len(rows) < row_number - 1:
+            rows.append([])
+        rows.append([cells.get(i, '') for i in range(max(cells) + 1)] if cells else [])
+    return rows
+
+
+def read_sheet_rows(filepath):
+    """ Rows of a CSV or XLSX spec sheet, header first. """
+    if filepath.lower().endswith('.xlsx'):
+        return read_xlsx_rows(filepath)
+    return read_csv_rows(filepath)
+
+
+def map_columns(header):
+    """ {field: column} for the recognized columns of a header row. """
+    columns = {}
+    normalized = [normalize_header(cell) for cell in header]
+    for field, aliases in COLUMN_ALIASES.items():
+        for column, name in enumerate(normalized):
+            if name in aliases:
+                columns[field] = column
+                break
+    return columns
+
+
+class SpecSheetImport:
+    """
+    Résultat du contrôle d'une fiche technique : catalogue des lignes valides
+    (`brands`), coefficients de shift par marque (`shift_scales`) et liste des
+    problèmes (`issues`, triés par ligne).
+    `shift_scale` s'applique à toutes les marques de la fiche, `brand_shift_scales`
+    ({marque: coefficient}) le remplace marque par marque ; sans l'un ni l'autre,
+    les marques gardent le coefficient du catalogue.
+    """
+
+    def __init__(self, rows, shift_scale=None, brand_shift_scales=None):
+        self.brands = {}
+        self.shift_scales = {}
+        self.issues = []
+        self.row_count = 0
+        self.entry_count = 0
+        if rows:
+            self._validate(rows[0], rows[1:])
+        brand_shift_scales = brand_shift_scales or {}
+        for brand in self.brands:
+            scale = brand_shift_scales.get(brand, shift_scale)
+            if scale is not None:
+                self.shift_scales[brand] = scale
+        self.issues.sort(key=lambda issue: issue.row)
+
+    @classmethod
+    def from_file(cls, filepath, shift_scale=None, brand_shift_scales=None):
+        return cls(read_sheet_rows(filepath), shift_scale, brand_shift_scales)
+
+    @property
+    def errors(self):
+        return [issue for issue in self.issues if issue.severity == 'ERROR']
+
+    @property
+    def warnings(self):
+        return [issue for issue in self.issues if issue.severity == 'WARNING']
+
+    def _error(self, row, column, message):
+        self.issues.append(ImportIssue(row, column, 'ERROR', message))
+
+    def _warning(self, row, column, message):
+        self.issues.append(ImportIssue(row, column, 'WARNING', message))
+
+    def _validate(self, header, rows):
+        columns = map_columns(header)
+        missing = [field for field in REQUIRED_COLUMNS if field not in columns]
+        for axis in ('h', 'v'):
+            if f'{axis}_shift' not in columns and not (f'{axis}_shift_min' in columns and
+                                                       f'{axis}_shift_max' in columns):
+                missing.append(f'{axis}_shift_min/{axis}_shift_max')
+        if missing:
+            self._error(1, '', f"Missing column(s): {', '.join(missing)}")
+            return
+
+        def cell(values, field):
+            column = columns.get(field)
+            return values[column] if column is not None and column < len(values) else ''
+
+        # Première passe : lecture des cellules, une ligne de valeurs par ligne du tableur
+        row_numbers = []
+        keys = []
+        values = []
+        for row_number, row in enumerate(rows, start=2):
+            if not any(clean_text(value) for value in row):
+                continue
+            self.row_count += 1
+            brand = clean_text(cell(row, 'brand'))
+            model = clean_text(cell(row, 'model'))
+            lens = normalize_lens_name(cell(row, 'lens'), cell(row, 'part_number'))
+            empty = [field for field, text in (('brand', brand), ('model', model), ('lens', lens)) if not text]
+            if empty:
+                self._error(row_number, empty[0], f"Empty {', '.join(empty)}")
+                continue
+
+            numbers = [parse_number(cell(row, 'ansi_lumens'))]
+            for axis in ('h', 'v'):
+                if f'{axis}_shift_min' in columns and f'{axis}_shift_max' in columns:
+                    numbers.append(parse_number(cell(row, f'{axis}_shift_min')))
+                    numbers.append(parse_number(cell(row, f'{axis}_shift_max')))
+                else:
+                    shift_range = parse_shift_range(cell(row, f'{axis}_shift'))
+                    numbers.extend(shift_range if shift_range else (None, None))
+            invalid = [field for field, number in zip(LENS_FIELDS, numbers) if number is None]
+            if invalid:
+                self._error(row_number, invalid[0], f"Not a number: {', '.join(invalid)}")
+                continue
+            if not THROW_RANGE_PATTERN.match(lens):
+                self._warning(row_number, 'lens', f"No throw ratio in lens name '{lens}'")
+
+            row_numbers.append(row_number)
+            keys.append((brand, model, lens))
+            values.append(numbers)
+
+        # Contrôle des plages sur toutes les lignes à la fois
+        values = np.array(values, dtype=float).reshape(-1, 5)
+        lumens = values[:, 0]
+        shifts = values[:, 1:]
+        rejected = np.zeros(len(values), dtype=bool)
+        checks = [
+            ((lumens < LUMENS_RANGE[0]) | (lumens > LUMENS_RANGE[1]), 'ansi_lumens',
+             f"ANSI lumens out of range [{LUMENS_RANGE[0]:g}, {LUMENS_RANGE[1]:g}]"),
+            (shifts[:, 0] > shifts[:, 1], 'h_shift_min', "H shift min greater than max"),
+            (shifts[:, 2] > shifts[:, 3], 'v_shift_min', "V shift min greater than max"),
+            ((np.abs(shifts[:, :2]) > SHIFT_LIMIT).any(axis=1), 'h_shift_max',
+             f"H shift out of range [-{SHIFT_LIMIT:g}, {SHIFT_LIMIT:g}]%"),
+            ((np.abs(shifts[:, 2:]) > SHIFT_LIMIT).any(axis=1), 'v_shift_max',
+             f"V shift out of range [-{SHIFT_LIMIT:g}, {SHIFT_LIMIT:g}]%"),
+        ]
+        for failed, column, message in checks:
+            for i in np.flatnonzero(failed):
+                self._error(row_numbers[i], column, f"{message}: {' / '.join(keys[i])}")
+            rejected |= failed
+
+        # Doublons après normalisation des noms
+        first_rows = {}
+        for i, key in enumerate(keys):
+            if rejected[i]:
+                continue
+            first = first_rows.get(key)
+            if first is None:
+                first_rows[key] = i
+                continue
+            rejected[i] = True
+            if np.array_equal(values[i], values[first]):
+                self._warning(row_numbers[i], '', f"Duplicate of row {row_numbers[first]}: {' / '.join(key)}")
+            else:
+                self._error(row_numbers[i], '', f"Conflicts with row {row_numbers[first]}: {' / '.join(key)}")
+
+        for i in np.flatnonzero(~rejected):
+            brand, model, lens = keys[i]
+            lens_data = {field: (int(value) if value.is_integer() else float(value))
+                         for field, value in zip(LENS_FIELDS, values[i])}
+            self.brands.setdefault(brand, {}).setdefault(model, {})[lens] = lens_data
+            self.entry_count += 1
+
+    def write_issues_csv(self, filepath):
+        """ Write the issues as CSV (row, column, severity, message). Return the number of issues. """
+        with open(filepath, 'w', newline='', encoding='utf-8') as csvfile:
+            writer = csv.writer(csvfile)
+            writer.writerow(ImportIssue._fields)
+            writer.writerows(self.issues)
+        return len(self.issues)
@@ -0,0 +1,133 @@
+"""
+Table throw / distance de tout le catalogue d'optiques.
+
+Pour chaque combinaison (marque, modèle, optique) et chaque distance d'une grille,
+la table donne les plages de largeur et de hauteur d'image, de lux et de taille de
+pixel atteignables avec le zoom. Elle est calculée en un seul appel vectorisé
+(compute_metrics sur une grille optiques x distances), exportée en CSV ou JSON et
+sert aux recherches inverses : « quelle optique donne 6 m de base à 9 m ? ».
+Ce module n'importe pas bpy.
+"""
+import csv
+import json
+
+import numpy as np
+
+from .photometry import compute_metrics
+
+
+# Colonnes des exports CSV / JSON
+TABLE_FIELDS = ['brand', 'model', 'lens', 'throw_min', 'throw_max', 'ansi_lumens', 'distance',
+                'width_min', 'width_max', 'height_min', 'height_max',
+                'lux_min', 'lux_max', 'pixel_min_mm', 'pixel_max_mm']
+
+
+def distance_grid(distance_min, distance_max, step):
+    """ Grille de distances (m) de distance_min à distance_max incluse. """
+    count = int(np.floor((distance_max - distance_min) / step + 1e-9)) + 1
+    return distance_min + step * np.arange(max(count, 1))
+
+
+class ThrowTable:
+    """
+    Plages d'image de toutes les optiques d'un LensIndex sur une grille de distances.
+
+    Les tableaux sont de forme (L, D) : une ligne par optique de l'index, une colonne
+    par distance. Le zoom le plus court (throw_min) donne l'image la plus grande, donc
+    le lux le plus faible et les pixels les plus gros. Les optiques sans throw ratio
+    connu donnent NaN.
+    """
+
+    def __init__(self, index, distances, resolution='1920x1200'):
+        self.index = index
+        self.resolution = resolution
+        self.distances = np.asarray(distances, dtype=float)
+
+        throw_min = index.throw_min[:, None]
+        throw_max = index.throw_max[:, None]
+        lumens = index.ansi_lumens[:, None]
+        distances = self.distances[None, :]
+        widest = compute_metrics(throw_min, distances, resolution, lumens)
+        narrowest = compute_metrics(throw_max, distances, resolution, lumens)
+
+        self.width_min = narrowest.screen_width
+        self.width_max = widest.screen_width
+        self.height_min = narrowest.screen_height
+        self.height_max = widest.screen_height
+        self.lux_min = widest.lux
+        self.lux_max = narrowest.lux
+        self.pixel_min_mm = narrowest.pixel_width_mm
+        self.pixel_max_mm = widest.pixel_width_mm
+
+    def column(self, distance):
+        """ Colonne de la grille la plus proche d'une distance. """
+        return int(np.argmin(np.abs(self.distances - distance)))
+
+    def lookup(self, image_width, distance, rows=None):
+        """
+        Optiques capables de donner `image_width` mètres de base à `distance` mètres,
+        optionnellement parmi `rows`. La largeur étant proportionnelle à la distance,
+        les bornes sont interpolées exactement entre deux colonnes de la grille (et
+        extrapolées au-delà). Retourne les lignes de l'index, triées.
+        """
+        if len(self.distances) > 1:
+            k = int(np.clip(np.searchsorted(self.distances, distance) - 1, 0, len(self.distances) - 2))
+            d0, d1 = self.distances[k], self.distances[k + 1]
+            ratio = (distance - d0) / (d1 - d0)
+            width_min = self.width_min[:, k] + ratio * (self.width_min[:, k + 1] - self.width_min[:, k])
+            width_max = self.width_max[:, k] + ratio * (self.width_max[:, k + 1] - self.width_max[:, k])
+        else:
+            scale = distance / self.distances[0]
+            width_min = self.width_min[:, 0] * scale
+            width_max = self.width_max[:, 0] * scale
+
+        tolerance = 1e-9 * max(image_width, 1.0)
+        found = np.flatnonzero((width_min <= image_width + tolerance) & (width_max >= image_width - tolerance))
+        if rows is not None:
+            found = np.intersect1d(found, rows)
+        return found
+
+    def records(self):
+        """ Une entrée (dict) par optique et par distance, dans l'ordre du catalogue. """
+        index = self.index
+        for i in range(len(index)):
+            for k, distance in enumerate(self.distances):
+                yield {
+                    'brand': index.brand[i],
+                    'model': index.model[i],
+                    'lens': index.lens[i],
+                    'throw_min': float(index.throw_min[i]),
+                    'throw_max': float(index.throw_max[i]),
+                    'ansi_lumens': float(index.ansi_lumens[i]),
+                    'distance': float(distance),
+                    'width_min': float(self.width_min[i, k]),
+                    'width_max': float(self.width_max[i, k]),
+                    'height_min': float(self.height_min[i, k]),
+                    'height_max': float(self.height_max[i, k]),
+                    'lux_min': float(self.lux_min[i, k]),
+                    'lux_max': float(self.lux_max[i, k]),
+                    'pixel_min_mm': float(self.pixel_min_mm[i, k]),
+                    'pixel_max_mm': float(self.pixel_max_mm[i, k]),
+                }
+
+    def write_csv(self, filepath):
+        """ Écrit la table en CSV (une ligne par optique et par distance). Retourne le nombre de lignes. """
+        count = 0
+        with open(filepath, 'w', newline='', encoding='utf-8') as csvfile:
+            writer = csv.writer(csvfile)
+            writer.writerow(TABLE_FIELDS)
+            for record in self.records():
+                writer.writerow([value if isinstance(value, str) else
+                                 ('' if np.isnan(value) else f"{value:.4g}") for value in record.values()])
+                count += 1
+        return count
+
+    def write_json(self, filepath):
+        """ Écrit la table en JSON (résolution, distances et entrées). Retourne le nombre d'entrées. """
+        entries = [{key: (None if isinstance(value, float) and np.isnan(value) else value)
+                    for key, value in record.items()} for record in self.records()]
+        with open(filepath, 'w', encoding='utf-8') as jsonfile:
+            json.dump({'resolution': self.resolution,
+                       'distances': self.distances.tolist(),
+                       'entries': entries}, jsonfile, ensure_ascii=False, indent=1)
+        return len(entries)
@@ -4,6 +4,7 @@ import bpy
 from bpy.types import Operator
 
 from .helper import get_projectors
+from .registry import refresh_rig_registry
 
 logging.basicConfig(
     format='[Projectors Addon]: %(name)s - %(levelname)s - %(message)s')
@@ -183,6 +184,9 @@ class PROJECTOR_OT_duplicate_projector(Operator):
             
          
             
+            # La copie porte l'identifiant de rig de l'original : le registre lui en attribue un nouveau
+            refresh_rig_registry(context.scene)
+            
             self.report({'INFO'}, f"Duplicated and renamed {renamed_count} object(s)")
             log.info(f"Duplicated parent {parent_to_duplicate.name} and renamed {renamed_count} objects")
             
@@ -21,42 +21,18 @@ def random_color(alpha=False):
     return rgb
 
 
-def find_projector_in_children(obj):
+def get_projectors(context, only_selected=False):
     """
-    Recherche récursivement un projecteur dans les enfants d'un objet.
-    Retourne le premier projecteur trouvé ou None.
+    Get all or only the selected projectors from the scene. A selected projector
+    or any of its ancestors designates it. Lookups go through the rig registry and
+    the selection is resolved once per selection change (see get_selected_projectors).
     """
-    for child in obj.children:
-        if child.type == 'CAMERA' and child.name.startswith('Projector'):
-            return child
-        # Recherche récursive dans les enfants
-        projector = find_projector_in_children(child)
-        if projector:
-            return projector
-    return None
-
+    # Import tardif : registry importe helper
+    from .registry import get_rig_registry, get_selected_projectors
 
-def get_projectors(context, only_selected=False):
-    """ Get all or only the selected projectors from the scene. """
-    objs = context.selected_objects if only_selected else context.scene.objects
-    projectors = []
-    
-    for obj in objs:
-        # Vérification directe : l'objet est-il un projecteur ?
-        if obj.type == 'CAMERA' and obj.name.startswith('Projector'):
-            if only_selected:
-                if obj.select_get():
-                    projectors.append(obj)
-            else:
-                projectors.append(obj)
-        
-        # Nouvelle logique : recherche dans les enfants
-        elif only_selected and obj.select_get():
-            projector_child = find_projector_in_children(obj)
-            if projector_child:
-                projectors.append(projector_child)
-    
-    return projectors
+    if only_selected:
+        return list(get_selected_projectors(context))
+    return list(get_rig_registry(context.scene).projectors)
 
 
 def get_projector(context):
@@ -68,6 +44,32 @@ def get_projector(context):
         return None
 
 
+def get_rig_parent(projector, context=None):
+    """
+    Retourne l'objet du rig qui porte les custom properties (SCREEN_DISTANCE, VP_PAN...).
+    L'objet actif est utilisé s'il fait partie de la hiérarchie du projecteur,
+    sinon le parent du projecteur, et en dernier recours le projecteur lui-même.
+    """
+    # Pas d'objet actif dans le contexte d'un timer
+    active = getattr(context, 'active_object', None) if context else None
+    if active and active != projector:
+        parent = projector.parent
+        while parent:
+            if parent == active:
+                return active
+            parent = parent.parent
+    return projector.parent if projector.parent else projector
+
+
+def get_screen_distance(projector, parent_obj=None):
+    """ Return the SCREEN_DISTANCE of a projector rig or None if it is not defined. """
+    if parent_obj and "SCREEN_DISTANCE" in parent_obj:
+        return parent_obj["SCREEN_DISTANCE"]
+    if "SCREEN_DISTANCE" in projector:
+        return projector["SCREEN_DISTANCE"]
+    return None
+
+
 def auto_offset():
     offset = 0
 
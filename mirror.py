@@ -4,6 +4,7 @@ from bpy.types import Operator
 import math
 
 from .helper import get_projectors
+from .registry import refresh_rig_registry
 
 logging.basicConfig(
     format='[Projectors Addon]: %(name)s - %(levelname)s - %(message)s')
@@ -266,6 +267,7 @@ class PROJECTOR_OT_mirror_with_duplicate(Operator):
                     mirror_op.apply_landscape_mirror(duplicated_parent, duplicated_projector)
                 
                 bpy.context.view_layer.update()
+                refresh_rig_registry(context.scene)
                 
                 self.report({'INFO'}, f"Duplicated and mirrored as '{self.new_name}'")
             else:
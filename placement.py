@@ -0,0 +1,144 @@
+import logging
+import bpy
+import numpy as np
+from bpy.types import Operator
+
+from .analysis import get_projection_arrays, get_screen_plane
+from .helper import get_projectors, get_rig_parent
+from .core.photometry import projector_frames, solve_placement
+from .projector import get_screen_offset, update_throw_ratio
+from .registry import get_rig_component
+from .projector_database import get_lens_index
+
+logging.basicConfig(
+    format='[Projectors Addon]: %(name)s - %(levelname)s - %(message)s')
+log = logging.getLogger(name=__file__)
+
+
+def get_screen_target(screen_obj, origin, right, up, forward):
+    """
+    Mesure l'écran vu par un projecteur : distance le long de l'axe optique,
+    largeur et hauteur selon les axes de l'image, et décalage de son centre
+    par rapport à l'axe. Retourne None si l'écran n'est pas devant le projecteur.
+    """
+    plane_origin, plane_normal = get_screen_plane(screen_obj)
+    denom = forward @ plane_normal
+    if abs(denom) < 1e-9:
+        return None
+    distance = ((plane_origin - origin) @ plane_normal) / denom
+    if distance <= 0:
+        return None
+    axis_point = origin + forward * distance
+
+    matrix = np.array(screen_obj.matrix_world, dtype=float)
+    corners = np.array([tuple(corner) for corner in screen_obj.bound_box]) @ matrix[:3, :3].T + matrix[:3, 3]
+    along_h = (corners - axis_point) @ right
+    along_v = (corners - axis_point) @ up
+    return (distance,
+            along_h.max() - along_h.min(),
+            along_v.max() - along_v.min(),
+            (along_h.max() + along_h.min()) / 2,
+            (along_v.max() + along_v.min()) / 2)
+
+
+class PROJECTOR_OT_fit_to_screen(Operator):
+    """Solve distance, throw ratio and lens shift so the image of each selected projector fills its screen"""
+    bl_idname = 'projector.fit_to_screen'
+    bl_label = 'Fit to Screen'
+    bl_description = ('Compute the screen distance, the throw ratio within the lens zoom range and the lens shift '
+                      'that fill the screen, and apply them to all selected projectors')
+    bl_options = {'REGISTER', 'UNDO'}
+
+    @classmethod
+    def poll(cls, context):
+        return bool(get_projectors(context, only_selected=True))
+
+    def execute(self, context):
+        index = get_lens_index()
+        rigs = []
+        targets = []
+        limits = []
+
+        projectors = get_projectors(context, only_selected=True)
+        matrices, _, aspect_ratios, _, _, _ = get_projection_arrays(projectors)
+        origins, right, up, forward = projector_frames(matrices)
+
+        for i, projector in enumerate(projectors):
+            proj_settings = projector.proj_settings
+            parent_obj = get_rig_parent(projector, context)
+            screen_obj = get_rig_component(projector, 'screen', context)
+            if not screen_obj:
+                self.report({'WARNING'}, f"No screen object found for {projector.name}")
+                continue
+            target = get_screen_target(screen_obj, origins[i], right[i], up[i], forward[i])
+            if target is None:
+                self.report({'WARNING'}, f"Screen {screen_obj.name} is not in front of {projector.name}")
+                continue
+
+            # Plage de zoom de l'optique choisie, sinon throw ratio libre
+            row = index.find(proj_settings.projector_brand, proj_settings.projector_model,
+                             proj_settings.projector_lens)
+            throw_min, throw_max = (index.throw_min[row], index.throw_max[row]) if row is not None else (0.0, np.inf)
+            if np.isnan(throw_min):
+                throw_min, throw_max = 0.0, np.inf
+
+            rigs.append((i, projector, parent_obj, screen_obj))
+            targets.append(target)
+            limits.append((throw_min, throw_max,
+                           proj_settings.h_shift_min, proj_settings.h_shift_max,
+                           proj_settings.v_shift_min, proj_settings.v_shift_max))
+
+        if not rigs:
+            self.report({'WARNING'}, "No projector could be fitted")
+            return {'CANCELLED'}
+
+        # Résolution en un seul appel pour toute la sélection
+        targets = np.array(targets, dtype=float)
+        limits = np.array(limits, dtype=float)
+        aspects = aspect_ratios[[rig[0] for rig in rigs]]
+        placement = solve_placement(targets[:, 1], targets[:, 2], targets[:, 0], targets[:, 3], targets[:, 4],
+                                    aspects, *limits.T)
+
+        for k, (_, projector, parent_obj, screen_obj) in enumerate(rigs):
+            proj_settings = projector.proj_settings
+            h_shift = float(placement.h_shift[k])
+            v_shift = float(placement.v_shift[k])
+            throw_ratio = float(placement.throw_ratio[k])
+            # Le rig ne bouge pas : la distance enregistrée reste celle de l'écran, même
+            # quand le zoom est borné (l'image n'a alors pas la taille de l'écran)
+            screen_distance = float(targets[k, 0])
+            image_width = screen_distance / throw_ratio
+            image_height = image_width / aspects[k]
+
+            # Écriture directe (sans callbacks), puis une seule mise à jour du rig
+            parent_obj["SCREEN_DISTANCE"] = screen_distance
+            proj_settings['throw_ratio'] = throw_ratio
+            proj_settings['h_shift'] = h_shift
+            proj_settings['v_shift'] = v_shift
+
+            # L'écran reste en place : sa position d'origine absorbe le nouveau décalage
+            offset_x, offset_z = get_screen_offset(proj_settings.orientation, h_shift / 100, v_shift / 100,
+                                                   image_width, image_height)
+            location = list(screen_obj.location)
+            screen_obj['_original_location'] = [location[0] - offset_x, location[1], location[2] - offset_z]
+
+            update_throw_ratio(proj_settings, context)
+
+            if not placement.zoom_ok[k]:
+                self.report({'WARNING'}, f"{projector.name}: lens zoom range exceeded, move the projector to "
+                                         f"{placement.screen_distance[k]:.2f}m from the screen to fill it")
+            if not placement.shift_ok[k]:
+                self.report({'WARNING'}, f"{projector.name}: required lens shift exceeds the lens limits")
+            log.info(f"Fitted {projector.name}: distance {screen_distance:.2f}m, "
+                     f"TR {placement.throw_ratio[k]:.2f}, shift H {h_shift:.1f}% V {v_shift:.1f}%")
+
+        self.report({'INFO'}, f"Fitted {len(rigs)} projector(s) to their screen")
+        return {'FINISHED'}
+
+
+def register():
+    bpy.utils.register_class(PROJECTOR_OT_fit_to_screen)
+
+
+def unregister():
+    bpy.utils.unregister_class(PROJECTOR_OT_fit_to_screen)
@@ -1,109 +1,65 @@
 import logging
 import math
 import os
+import time
 
 from enum import Enum
 import bpy
+import numpy as np
+from bpy.app.handlers import persistent
 from bpy.types import Operator
 
-from .helper import (ADDON_ID, auto_offset,
-                     get_projectors, get_projector, random_color)
+from .helper import (ADDON_ID, auto_offset, get_projectors,
+                     get_rig_parent, get_screen_distance, random_color)
+from .registry import (ROLE_TAG, get_rig_component, get_rig_nodes, get_rig_registry, get_spot, invalidate_rig_nodes,
+                       refresh_rig_registry)
+from .scheduler import ASPECTS, batched_updates, deferred_update, flush_updates, register_aspect, schedule_update
+from .core.layout import ProjectorLayout
+from .core.photometry import calculate_screen_size, compute_metrics, compute_rig_optics, parse_resolution
 
-from .projector_database import get_brands, get_models, get_lenses, update_projector_brand, update_projector_model
+from .projector_database import (get_brands, get_models, get_lenses, search_catalog, update_projector_brand,
+                                 update_projector_model)
 
 logging.basicConfig(
     format='[Projectors Addon]: %(name)s - %(levelname)s - %(message)s')
 log = logging.getLogger(name=__file__)
 
-def calculate_screen_size(throw_ratio, screen_distance, resolution):
+def compute_projectors_metrics(projectors, context=None):
     """
-    Calcule la taille de l'écran selon throw ratio et distance
+    Calcule en un seul passage vectorisé les grandeurs de tous les projecteurs donnés.
+    Retourne (screen_distances, metrics) : la distance vaut NaN pour les rigs
+    sans SCREEN_DISTANCE, metrics est un ProjectorMetrics de tableaux de longueur N.
     """
-    # Largeur image = distance / throw_ratio
-    screen_width = screen_distance / throw_ratio
-    
-    # Hauteur selon aspect ratio de la résolution
-    res_w, res_h = resolution.split('x')
-    aspect_ratio = float(res_w) / float(res_h)
-    screen_height = screen_width / aspect_ratio
-    
-    return screen_width, screen_height
-
-def calculate_lux(power_lumens_ansi, screen_width, screen_height):
-    """
-    Calcule les lux sur l'écran
-    Lux = Lumens ANSI / Surface_écran_m²
-    """
-    surface_m2 = (screen_width * screen_height)
-    if surface_m2 > 0:
-        return power_lumens_ansi / surface_m2
-    return 0
-
-def calculate_pixel_size(screen_width, screen_height, resolution):
-    """
-    Calcule la taille physique d'un pixel sur l'écran
-    """
-    res_w, res_h = resolution.split('x')
-    pixel_width_m = screen_width / float(res_w)
-    pixel_height_m = screen_height / float(res_h)
-    
-    # Convertir en millimètres
-    pixel_width_mm = pixel_width_m * 1000
-    pixel_height_mm = pixel_height_m * 1000
-    
-    return pixel_width_mm, pixel_height_mm
-
-def find_screen_object_recursive(obj):
-    """Trouve récursivement un objet dont le nom contient 'écran' ou 'screen'"""
-    if not obj:
-        return None
-    
-    # Vérifier l'objet actuel
-    name_lower = obj.name.lower()
-    if 'écran' in name_lower or 'ecran' in name_lower or 'screen' in name_lower:
-        return obj
-    
-    # Recherche récursive dans tous les enfants
-    for child in obj.children:
-        result = find_screen_object_recursive(child)
-        if result:
-            return result
-    
-    return None
-
-def find_dual_object_recursive(obj):
-    """Trouve récursivement un objet dont le nom contient 'dual'"""
-    if not obj:
-        return None
-    
-    # Vérifier l'objet actuel
-    name_lower = obj.name.lower()
-    if 'dual' in name_lower:
-        return obj
-    
-    # Recherche récursive dans tous les enfants
-    for child in obj.children:
-        result = find_dual_object_recursive(child)
-        if result:
-            return result
-    
-    return None
+    count = len(projectors)
+    throw_ratios = np.empty(count)
+    distances = np.full(count, np.nan)
+    lumens = np.empty(count)
+    h_shifts = np.empty(count)
+    v_shifts = np.empty(count)
+    resolutions = []
+
+    for i, projector in enumerate(projectors):
+        proj_settings = projector.proj_settings
+        throw_ratios[i] = proj_settings.throw_ratio
+        lumens[i] = proj_settings.lumens
+        h_shifts[i] = proj_settings.h_shift
+        v_shifts[i] = proj_settings.v_shift
+        resolutions.append(get_resolution_text(proj_settings))
+        screen_distance = get_screen_distance(projector, get_rig_parent(projector, context))
+        if screen_distance is not None:
+            distances[i] = screen_distance
+
+    metrics = compute_metrics(throw_ratios, distances, resolutions, lumens, h_shifts, v_shifts)
+    return distances, metrics
 
 def update_orientation(proj_settings, context):
     """
     Met à jour la visibilité des objets selon l'orientation
     """
-    projector = get_projector(context)
-    
-    # Chercher l'objet parent qui pourrait contenir l'objet dual
-    parent_obj = context.active_object if context.active_object != projector else projector.parent
-    if not parent_obj:
-        parent_obj = projector
+    projector = proj_settings.id_data
     
-    # Trouver l'objet dual
-    dual_obj = find_dual_object_recursive(parent_obj)
-    if not dual_obj:
-        dual_obj = find_dual_object_recursive(projector)
+    # Objet dual du rig (résolu par le registre)
+    dual_obj = get_rig_component(projector, 'dual', context)
     
     if dual_obj:
         if proj_settings.orientation == 'LANDSCAPE DUAL':
@@ -119,71 +75,104 @@ def update_orientation(proj_settings, context):
 
 def update_projector_model_local(proj_settings, context):
     """Version locale de update_projector_model"""
-    from .projector_database import PROJECTOR_DATABASE
+    from .projector_database import get_lens_index
     
     proj_settings.projector_lens = 'NONE'
+    index = get_lens_index()
     
     brand = proj_settings.projector_brand
     model = proj_settings.projector_model
+    rows = index.model_slice(brand, model)
     
-    print(f"LOCAL DEBUG: Brand: {brand}, Model: {model}")
+    log.debug(f"Model update - Brand: {brand}, Model: {model}")
     
-    if (brand in PROJECTOR_DATABASE and 
-        model in PROJECTOR_DATABASE[brand]):
+    if rows is not None and rows.stop > rows.start:
         
-        first_lens = next(iter(PROJECTOR_DATABASE[brand][model].values()))
-        new_lumens = first_lens['ansi_lumens']
+        new_lumens = index.ansi_lumens[rows.start]
         proj_settings.lumens = new_lumens
-        print(f"LOCAL DEBUG: Lumens set to {new_lumens}")
+        log.debug(f"Model update - Lumens set to {new_lumens}")
         
         # Sauvegarder dans custom properties
-        projector = get_projector(bpy.context)
-        if projector:
-            projector["SELECTED_BRAND"] = brand
-            projector["SELECTED_MODEL"] = model
+        projector = proj_settings.id_data
+        projector["SELECTED_BRAND"] = brand
+        projector["SELECTED_MODEL"] = model
         
         # Force UI refresh
         bpy.context.area.tag_redraw() if bpy.context.area else None
 
 def update_projector_lens_local(proj_settings, context):
     """Version locale de update_projector_lens"""
-    from .projector_database import PROJECTOR_DATABASE, BARCO_SHIFT_COEFFICIENT
+    from .projector_database import get_lens_index
     
     brand = proj_settings.projector_brand
     model = proj_settings.projector_model
     lens = proj_settings.projector_lens
     
-    print(f"LOCAL DEBUG LENS: Brand: {brand}, Model: {model}, Lens: {lens}")
+    log.debug(f"Lens update - Brand: {brand}, Model: {model}, Lens: {lens}")
     
-    if (brand in PROJECTOR_DATABASE and 
-        model in PROJECTOR_DATABASE[brand] and 
-        lens in PROJECTOR_DATABASE[brand][model]):
-        
-        lens_data = PROJECTOR_DATABASE[brand][model][lens]
-        
+    index = get_lens_index()
+    row = index.find(brand, model, lens)
+    if row is not None:
         # Mettre à jour les lumens
-        proj_settings.lumens = lens_data['ansi_lumens']
-        print(f"LOCAL DEBUG LENS: Lumens set to {lens_data['ansi_lumens']}")
+        proj_settings.lumens = index.ansi_lumens[row]
         
-        # NOUVEAU : Mettre à jour les limites de shift selon la lentille
-        proj_settings.v_shift_min = lens_data['v_shift_min'] * BARCO_SHIFT_COEFFICIENT
-        proj_settings.v_shift_max = lens_data['v_shift_max'] * BARCO_SHIFT_COEFFICIENT  
-        proj_settings.h_shift_min = lens_data['h_shift_min'] * BARCO_SHIFT_COEFFICIENT
-        proj_settings.h_shift_max = lens_data['h_shift_max'] * BARCO_SHIFT_COEFFICIENT
+        # Limites de shift de la lentille (coefficient déjà appliqué dans l'index)
+        proj_settings.v_shift_min = index.v_shift_min[row]
+        proj_settings.v_shift_max = index.v_shift_max[row]
+        proj_settings.h_shift_min = index.h_shift_min[row]
+        proj_settings.h_shift_max = index.h_shift_max[row]
         
-        print(f"LOCAL DEBUG LENS: Shift limits - H: {proj_settings.h_shift_min:.1f} to {proj_settings.h_shift_max:.1f}, V: {proj_settings.v_shift_min:.1f} to {proj_settings.v_shift_max:.1f}")
+        log.debug(f"Shift limits - H: {proj_settings.h_shift_min:.1f} to {proj_settings.h_shift_max:.1f}, "
+                  f"V: {proj_settings.v_shift_min:.1f} to {proj_settings.v_shift_max:.1f}")
         
         # Sauvegarder dans custom properties
-        projector = get_projector(bpy.context)
-        if projector:
-            projector["SELECTED_BRAND"] = brand
-            projector["SELECTED_MODEL"] = model  
-            projector["SELECTED_LENS"] = lens
+        projector = proj_settings.id_data
+        projector["SELECTED_BRAND"] = brand
+        projector["SELECTED_MODEL"] = model
+        projector["SELECTED_LENS"] = lens
         
         # Force UI refresh
         bpy.context.area.tag_redraw() if bpy.context.area else None
     else:
-        print(f"LOCAL DEBUG LENS: Brand/Model/Lens not found in database")
+        log.debug("Lens update - Brand/Model/Lens not found in database")
+def assign_catalog_entry(proj_settings, context, brand, model, lens):
+    """
+    Affecte marque, modèle et optique en une seule fois : les valeurs des trois listes
+    sont écrites directement, sans leurs callbacks en cascade, puis le callback de
+    l'optique est appelé une seule fois (lumens, limites de shift, SELECTED_*).
+    """
+    from .projector_database import get_enum_items
+
+    # Les valeurs des listes dynamiques sont les positions des items
+    brands = [item[0] for item in get_enum_items(('brands',))]
+    models = [item[0] for item in get_enum_items(('models', brand))]
+    lenses = [item[0] for item in get_enum_items(('lenses', brand, model))]
+    proj_settings['projector_brand'] = brands.index(brand)
+    proj_settings['projector_model'] = models.index(model)
+    proj_settings['projector_lens'] = lenses.index(lens)
+    update_projector_lens_local(proj_settings, context)
+
+def update_catalog_search(proj_settings, context):
+    """ Applique l'entrée du catalogue choisie (ou la meilleure correspondance du texte saisi). """
+    from .projector_database import get_catalog_search
+
+    text = proj_settings.catalog_search
+    if not text.strip():
+        return
+    search = get_catalog_search()
+    row = search.find_label(text)
+    if row is None:
+        matches = search.search(text, limit=1)
+        if not matches:
+            log.info(f"No catalog entry matches '{text}'")
+            return
+        row = matches[0].row
+
+    index = search.index
+    assign_catalog_entry(proj_settings, context, index.brand[row], index.model[row], index.lens[row])
+    # Afficher l'entrée retenue (écriture directe, sans rappeler ce callback)
+    proj_settings['catalog_search'] = search.labels[row]
+
 class Textures(Enum):
     CHECKER = 'checker_texture'
     COLOR_GRID = 'color_grid_texture'
@@ -208,6 +197,28 @@ RESOLUTIONS = [
     # 17:9 aspect ratio
     ('4096x2160', 'Native 4K (4096x2160) 17:9', '', 12)
 ]
+# Toute autre résolution (toile de blending 5120x1200...) : largeur et hauteur libres
+CUSTOM_RESOLUTION = 'CUSTOM'
+PROJECTOR_RESOLUTIONS = RESOLUTIONS + [
+    (CUSTOM_RESOLUTION, 'Custom', 'Any width and height, e.g. a blended canvas', 13)
+]
+
+
+def get_resolution_text(settings):
+    """ 'WxH' resolution of projector (or batch) settings, from the list or the custom size. """
+    if settings.resolution == CUSTOM_RESOLUTION:
+        width, height = settings.custom_resolution
+        return f'{width}x{height}'
+    return settings.resolution
+
+
+def set_resolution_text(settings, resolution):
+    """ Set a 'WxH' resolution: the list entry when there is one, the custom size otherwise. """
+    if any(resolution == res[0] for res in RESOLUTIONS):
+        settings.resolution = resolution
+    else:
+        settings.custom_resolution = [int(size) for size in parse_resolution(resolution)]
+        settings.resolution = CUSTOM_RESOLUTION
 
 PROJECTED_OUTPUTS = [(Textures.CHECKER.value, 'Checker', '', 1),
                      (Textures.COLOR_GRID.value, 'Color Grid', '', 2),
@@ -247,74 +258,28 @@ class PROJECTOR_OT_auto_adjust_screen_size(Operator):
     def execute(self, context):
         selected_projectors = get_projectors(context, only_selected=True)
         adjusted_screens = 0
-        
-        for projector in selected_projectors:
-            # Obtenir les paramètres du projecteur
+
+        # Toutes les tailles d'écran sont calculées en une seule fois
+        distances, metrics = compute_projectors_metrics(selected_projectors, context)
+
+        for i, projector in enumerate(selected_projectors):
             proj_settings = projector.proj_settings
             throw_ratio = proj_settings.throw_ratio
-            resolution = proj_settings.resolution
-            
-            # DEBUG : Afficher les objets et leurs propriétés
-            print(f"DEBUG: Processing projector: {projector.name}")
-            print(f"DEBUG: Projector parent: {projector.parent.name if projector.parent else 'None'}")
-            print(f"DEBUG: Active object: {context.active_object.name if context.active_object else 'None'}")
-            print(f"DEBUG: Number of selected projectors: {len(selected_projectors)}")
-            
-            # Vérifier où se trouve SCREEN_DISTANCE
-            screen_distance_found = False
-            if "SCREEN_DISTANCE" in projector:
-                print(f"DEBUG: SCREEN_DISTANCE found in projector: {projector['SCREEN_DISTANCE']}")
-                screen_distance_found = True
-            if projector.parent and "SCREEN_DISTANCE" in projector.parent:
-                print(f"DEBUG: SCREEN_DISTANCE found in parent: {projector.parent['SCREEN_DISTANCE']}")
-                screen_distance_found = True
-            if context.active_object and "SCREEN_DISTANCE" in context.active_object:
-                print(f"DEBUG: SCREEN_DISTANCE found in active object: {context.active_object['SCREEN_DISTANCE']}")
-                screen_distance_found = True
-            
-            if not screen_distance_found:
-                print("DEBUG: SCREEN_DISTANCE not found anywhere!")
-            
-            # Chercher l'objet parent qui contient la distance écran
-            parent_obj = None
-            
-            # En sélection INDIVIDUELLE : utiliser l'objet actif 
-            if len(selected_projectors) == 1 and context.active_object and context.active_object != projector:
-                parent_obj = context.active_object
-                print(f"DEBUG: Using active object: {parent_obj.name}")
-            # En MULTI-sélection OU si pas d'objet actif valide : utiliser le parent de CHAQUE projecteur
-            elif projector.parent:
-                parent_obj = projector.parent
-                print(f"DEBUG: Using projector parent: {parent_obj.name}")
-            # En dernier recours, le projecteur lui-même
-            else:
-                parent_obj = projector
-                print(f"DEBUG: Using projector itself: {parent_obj.name}")
-            
-            # Vérifier si SCREEN_DISTANCE existe
-            screen_distance = None
-            if "SCREEN_DISTANCE" in parent_obj:
-                screen_distance = parent_obj["SCREEN_DISTANCE"]
-            elif "SCREEN_DISTANCE" in projector:
-                screen_distance = projector["SCREEN_DISTANCE"]
-            
-            if screen_distance is None:
+            resolution = get_resolution_text(proj_settings)
+            screen_distance = distances[i]
+
+            if np.isnan(screen_distance):
                 self.report({'WARNING'}, f"No SCREEN_DISTANCE property found for {projector.name}")
                 continue
-            
-            # Calculer la taille de l'écran
-            try:
-                screen_width, screen_height = calculate_screen_size(throw_ratio, screen_distance, resolution)
-            except Exception as e:
-                self.report({'ERROR'}, f"Error calculating screen size for {projector.name}: {str(e)}")
+
+            screen_width = float(metrics.screen_width[i])
+            screen_height = float(metrics.screen_height[i])
+            if not math.isfinite(screen_width):
+                self.report({'ERROR'}, f"Error calculating screen size for {projector.name}: invalid throw ratio")
                 continue
-            
+
             # Trouver l'objet écran
-            screen_obj = find_screen_object_recursive(parent_obj)
-            if not screen_obj:
-                # Chercher dans le projecteur lui-même
-                screen_obj = find_screen_object_recursive(projector)
-            
+            screen_obj = get_rig_component(projector, 'screen', context)
             if not screen_obj:
                 self.report({'WARNING'}, f"No screen object found for {projector.name}")
                 continue
@@ -341,59 +306,104 @@ class PROJECTOR_OT_auto_adjust_screen_size(Operator):
         
         return {'FINISHED'}
 
-def create_projector_textures():
-    """ This function checks if the needed images exist and if not creates them. """
-    name_template = '_proj.tex.{}'
-    for res in RESOLUTIONS:
-        img_name = name_template.format(res[0])
-        w, h = res[0].split('x')
-        if not bpy.data.images.get(img_name):
-            log.debug(f'Create projection texture: {res}')
-            bpy.ops.image.new(name=img_name,
-                              width=int(w),
-                              height=int(h),
-                              color=(0.0, 0.0, 0.0, 1.0),
-                              alpha=True,
-                              generated_type='COLOR_GRID',
-                              float=False)
-
-        bpy.data.images[img_name].use_fake_user = True
+# Images de test créées à la demande, une par résolution utilisée ; marquées pour
+# être supprimées dès qu'aucun rig ne les utilise plus
+TEST_IMAGE_NAME = '_proj.tex.{}'
+TEST_IMAGE_TAG = ADDON_ID.format('test_image')
+# Cadre de l'image (alpha) sous le damier : quelques pixels suffisent en 'Closest'
+FRAME_IMAGE_SIZE = 4
 
 
-def add_projector_node_tree_to_spot(spot):
+def get_test_image(resolution):
+    """ Color grid image of a 'WxH' resolution, created the first time it is needed. """
+    name = TEST_IMAGE_NAME.format(resolution)
+    image = bpy.data.images.get(name)
+    if image is None:
+        log.debug(f'Create projection texture: {resolution}')
+        width, height = parse_resolution(resolution)
+        image = bpy.data.images.new(name, int(width), int(height), alpha=True)
+        image.generated_type = 'COLOR_GRID'
+    image[TEST_IMAGE_TAG] = True
+    return image
+
+
+def get_frame_image():
+    """ Small opaque image whose alpha frames the checker, used when no color grid is projected. """
+    name = TEST_IMAGE_NAME.format('frame')
+    image = bpy.data.images.get(name)
+    if image is None:
+        image = bpy.data.images.new(name, FRAME_IMAGE_SIZE, FRAME_IMAGE_SIZE, alpha=True)
+    image[TEST_IMAGE_TAG] = True
+    return image
+
+
+def release_test_image(image):
+    """ Remove a test image once no rig uses it any more. """
+    if image is not None and image.get(TEST_IMAGE_TAG) and image.users == 0:
+        log.debug(f'Release projection texture: {image.name}')
+        bpy.data.images.remove(image)
+
+
+def release_unused_test_images():
+    for image in [image for image in bpy.data.images if image.get(TEST_IMAGE_TAG)]:
+        release_test_image(image)
+
+
+def release_legacy_test_images():
     """
-    This function turns a spot light into a projector.
-    This is achieved through a texture on the spot light and some basic math.
+    Les fichiers plus anciens gardent les images de toutes les résolutions avec un
+    faux utilisateur : elles sont marquées comme images de test, pour être libérées
+    dès que les rigs passent aux images à la demande. Retourne True s'il y en avait.
     """
+    legacy = False
+    for image in bpy.data.images:
+        if image.name.startswith(TEST_IMAGE_NAME.format('')) and not image.get(TEST_IMAGE_TAG):
+            image.use_fake_user = False
+            image[TEST_IMAGE_TAG] = True
+            legacy = True
+    return legacy
 
-    spot.data.use_nodes = True
-    root_tree = spot.data.node_tree
-    root_tree.nodes.clear()
 
-    node_group = bpy.data.node_groups.new('_Projector', 'ShaderNodeTree')
+# Groupe de projection partagé par tous les rigs : marqué avec sa version, pour
+# ne pas réutiliser un groupe '_Projector' d'un fichier plus ancien
+PROJECTION_GROUP_NAME = '_Projector'
+PROJECTION_GROUP_TAG = ADDON_ID.format('projection_group')
+PROJECTION_GROUP_VERSION = 2
 
-    # Create output sockets for the node group.
-    if(bpy.app.version >= (4, 0)):
-        node_group.interface.new_socket('texture vector',  in_out="OUTPUT", socket_type='NodeSocketVector')
-        node_group.interface.new_socket('color', in_out="OUTPUT", socket_type='NodeSocketColor')
-    else:
-        output = node_group.outputs
-        output.new('NodeSocketVector', 'texture vector')
-        output.new('NodeSocketColor', 'color')
 
-    # # Inside Group Node #
-    # #####################
+def new_group_socket(node_group, name, in_out, socket_type):
+    if bpy.app.version >= (4, 0):
+        return node_group.interface.new_socket(name, in_out=in_out, socket_type=socket_type)
+    sockets = node_group.inputs if in_out == 'INPUT' else node_group.outputs
+    return sockets.new(socket_type, name)
 
-    # Hold important nodes inside a group node.
-    group = spot.data.node_tree.nodes.new('ShaderNodeGroup')
-    group.node_tree = node_group
-    group.label = "!! Don't touch !!"
 
-    nodes = group.node_tree.nodes
-    tree = group.node_tree
+def create_projection_node_group():
+    """
+    Groupe commun à tous les rigs : vecteur de texture (throw ratio et shift reçus par
+    les entrées Location et Scale) et damier (couleur reçue par Checker Color).
+    Les valeurs propres à un rig sont sur les entrées de son nœud de groupe.
+    """
+    node_group = bpy.data.node_groups.new(PROJECTION_GROUP_NAME, 'ShaderNodeTree')
+    node_group[PROJECTION_GROUP_TAG] = PROJECTION_GROUP_VERSION
+
+    # Create input and output sockets for the node group.
+    new_group_socket(node_group, 'Location', 'INPUT', 'NodeSocketVector')
+    scale = new_group_socket(node_group, 'Scale', 'INPUT', 'NodeSocketVector')
+    scale.default_value = (1, 1, 1)
+    color = new_group_socket(node_group, 'Checker Color', 'INPUT', 'NodeSocketColor')
+    color.default_value = (1, 1, 1, 1)
+    new_group_socket(node_group, 'texture vector', 'OUTPUT', 'NodeSocketVector')
+    new_group_socket(node_group, 'checker', 'OUTPUT', 'NodeSocketColor')
+
+    nodes = node_group.nodes
+    tree = node_group
 
     auto_pos = auto_offset()
 
+    group_input = nodes.new('NodeGroupInput')
+    group_input.location = auto_pos(0, -500)
+
     tex = nodes.new('ShaderNodeTexCoord')
     tex.location = auto_pos(200)
 
@@ -406,12 +416,9 @@ def add_projector_node_tree_to_spot(spot):
     map_1 = nodes.new('ShaderNodeMapping')
     map_1.vector_type = 'TEXTURE'
     # Flip the image horizontally and vertically to display it the intended way.
-    if bpy.app.version < (2, 81):
-        map_1.scale[0] = -1
-        map_1.scale[1] = -1
-    else:
-        map_1.inputs[3].default_value[0] = -1
-        map_1.inputs[3].default_value[1] = -1
+    # Entrées du nœud Mapping : Blender 2.81+, sous la version minimale de bl_info
+    map_1.inputs[3].default_value[0] = -1
+    map_1.inputs[3].default_value[1] = -1
     map_1.location = auto_pos(200)
 
     sep = nodes.new('ShaderNodeSeparateXYZ')
@@ -431,7 +438,9 @@ def add_projector_node_tree_to_spot(spot):
     com.inputs['Z'].default_value = 1.0
     com.location = auto_pos(200)
 
+    # Mapping du throw ratio et du shift, piloté par les entrées du groupe
     map_2 = nodes.new('ShaderNodeMapping')
+    map_2.name = 'Mapping.001'
     map_2.location = auto_pos(200)
     map_2.vector_type = 'TEXTURE'
 
@@ -440,48 +449,18 @@ def add_projector_node_tree_to_spot(spot):
     add.inputs[0].default_value = 1
     add.location = auto_pos(350)
 
-    # Texture
-    # a) Image
-    img = nodes.new('ShaderNodeTexImage')
-    img.extension = 'CLIP'
-    img.location = auto_pos(200)
-
-    # b) Generated checker texture.
+    # Generated checker texture.
     checker_tex = nodes.new('ShaderNodeTexChecker')
-    # checker_tex.inputs['Color2'].default_value = random_color(alpha=True)
     checker_tex.inputs[3].default_value = 8
     checker_tex.inputs[1].default_value = (1, 1, 1, 1)
-    checker_tex.location = auto_pos(y=-300)
-
-    mix_rgb = nodes.new('ShaderNodeMixRGB')
-    mix_rgb.name = 'Mix.001'
-    mix_rgb.inputs[1].default_value = (0, 0, 0, 0)
-    mix_rgb.location = auto_pos(200, y=-300)
+    checker_tex.location = auto_pos(200, y=-300)
 
-    group_output_node = node_group.nodes.new('NodeGroupOutput')
+    group_output_node = nodes.new('NodeGroupOutput')
     group_output_node.location = auto_pos(200)
 
-    # # Root Nodes #
-    # ##############
-    auto_pos_root = auto_offset()
-    # Image Texture
-    user_texture = root_tree.nodes.new('ShaderNodeTexImage')
-    user_texture.extension = 'CLIP'
-    user_texture.label = 'Add your Image Texture or Movie here'
-    user_texture.location = auto_pos_root(200, y=200)
-    # Emission
-    emission = root_tree.nodes.new('ShaderNodeEmission')
-    emission.inputs['Strength'].default_value = 1
-    emission.location = auto_pos_root(300)
-    # Material Output
-    output = root_tree.nodes.new('ShaderNodeOutputLight')
-    output.location = auto_pos_root(200)
-
     # # LINK NODES #
     # ##############
-
-    # Link inside group node
-    if(bpy.app.version >= (4, 0)):
+    if bpy.app.version >= (4, 0):
         tree.links.new(geo.outputs['Incoming'], vec_transform.inputs['Vector'])
         tree.links.new(vec_transform.outputs['Vector'], map_1.inputs['Vector'])
     else:
@@ -497,127 +476,271 @@ def add_projector_node_tree_to_spot(spot):
     tree.links.new(div_2.outputs[0], com.inputs[1])
 
     tree.links.new(com.outputs['Vector'], map_2.inputs['Vector'])
+    tree.links.new(group_input.outputs['Location'], map_2.inputs['Location'])
+    tree.links.new(group_input.outputs['Scale'], map_2.inputs['Scale'])
 
-    # Textures
-    # a) generated texture
     tree.links.new(map_2.outputs['Vector'], add.inputs['Color1'])
-    tree.links.new(add.outputs['Color'], img.inputs['Vector'])
-    tree.links.new(add.outputs['Color'], group_output_node.inputs[0])
-    # b) checker texture
+    tree.links.new(add.outputs['Color'], group_output_node.inputs['texture vector'])
     tree.links.new(add.outputs['Color'], checker_tex.inputs['Vector'])
-    tree.links.new(img.outputs['Alpha'], mix_rgb.inputs[0])
-    tree.links.new(checker_tex.outputs['Color'], mix_rgb.inputs[2])
+    tree.links.new(group_input.outputs['Checker Color'], checker_tex.inputs['Color2'])
+    tree.links.new(checker_tex.outputs['Color'], group_output_node.inputs['checker'])
+
+    return node_group
+
+
+def get_projection_node_group():
+    """ Return the projection group shared by every rig, created on first use. """
+    node_group = bpy.data.node_groups.get(PROJECTION_GROUP_NAME)
+    if node_group is None or node_group.get(PROJECTION_GROUP_TAG) != PROJECTION_GROUP_VERSION:
+        # Nom déjà pris par le groupe d'un rig ancien : chercher par le marquage
+        node_group = next((group for group in bpy.data.node_groups
+                           if group.get(PROJECTION_GROUP_TAG) == PROJECTION_GROUP_VERSION), None)
+    if node_group is None:
+        node_group = create_projection_node_group()
+    return node_group
+
+
+def add_projector_node_tree_to_spot(spot):
+    """
+    This function turns a spot light into a projector.
+    This is achieved through a texture on the spot light and some basic math.
+    The math lives in the shared projection group; the spot tree only holds the
+    values and textures of this rig.
+    """
+
+    spot.data.use_nodes = True
+    root_tree = spot.data.node_tree
+    root_tree.nodes.clear()
+
+    auto_pos_root = auto_offset()
+
+    # Shared projection group
+    group = root_tree.nodes.new('ShaderNodeGroup')
+    group.node_tree = get_projection_node_group()
+    group.name = 'Group'
+    group.label = "!! Don't touch !!"
+    group.location = auto_pos_root(0)
+
+    # Test image of the resolution (Color Grid) and checker inside the image frame
+    img = root_tree.nodes.new('ShaderNodeTexImage')
+    img.name = 'Test Texture'
+    img.extension = 'CLIP'
+    img.location = auto_pos_root(250, y=-250)
+
+    mix_rgb = root_tree.nodes.new('ShaderNodeMixRGB')
+    mix_rgb.name = 'Mix.001'
+    mix_rgb.inputs[1].default_value = (0, 0, 0, 0)
+    mix_rgb.location = auto_pos_root(300)
+
+    # Image Texture
+    user_texture = root_tree.nodes.new('ShaderNodeTexImage')
+    user_texture.name = 'Image Texture'
+    user_texture.extension = 'CLIP'
+    user_texture.label = 'Add your Image Texture or Movie here'
+    user_texture.location = auto_pos_root(0, y=450)
+    # Emission
+    emission = root_tree.nodes.new('ShaderNodeEmission')
+    emission.inputs['Strength'].default_value = 1
+    emission.location = auto_pos_root(250, y=-450)
+    # Material Output
+    output = root_tree.nodes.new('ShaderNodeOutputLight')
+    output.location = auto_pos_root(200)
 
     # Link in root
+    root_tree.links.new(group.outputs['texture vector'], img.inputs['Vector'])
     root_tree.links.new(group.outputs['texture vector'], user_texture.inputs['Vector'])
-    root_tree.links.new(group.outputs['color'], emission.inputs['Color'])
+    root_tree.links.new(img.outputs['Alpha'], mix_rgb.inputs[0])
+    root_tree.links.new(group.outputs['checker'], mix_rgb.inputs[2])
+    root_tree.links.new(mix_rgb.outputs['Color'], emission.inputs['Color'])
     root_tree.links.new(emission.outputs['Emission'], output.inputs['Surface'])
+    # La grille de pixels n'est attachée que lorsqu'elle est affichée (update_pixel_grid)
 
-    # Pixel Grid Setup
-    pixel_grid_group = create_pixel_grid_node_group()
-    pixel_grid_node = spot.data.node_tree.nodes.new('ShaderNodeGroup')
-    pixel_grid_node.node_tree = pixel_grid_group
-    pixel_grid_node.label = "Pixel Grid"
-    pixel_grid_node.name = 'pixel_grid'
-    loc = root_tree.nodes['Emission'].location
-    pixel_grid_node.location = (loc[0], loc[1] - 150)
 
-    root_tree.links.new(group.outputs[0], pixel_grid_node.inputs[1])
-    root_tree.links.new(emission.outputs[0], pixel_grid_node.inputs[0])
+def is_shared_projection_tree(spot):
+    """ Whether the spot uses the shared projection group (rigs made before it have their own group). """
+    group = spot.data.node_tree.nodes.get('Group') if spot.data.node_tree else None
+    return bool(group and group.node_tree and group.node_tree.get(PROJECTION_GROUP_TAG) == PROJECTION_GROUP_VERSION)
+
+
+def has_own_pixel_grid(spot):
+    """ Whether the spot carries a pixel grid group of its own (rigs made before the shared one). """
+    pixel_grid = spot.data.node_tree.nodes.get('pixel_grid')
+    return bool(pixel_grid and (pixel_grid.node_tree is None or
+                                pixel_grid.node_tree.get(PIXEL_GRID_GROUP_TAG) != PIXEL_GRID_GROUP_VERSION))
+
+
+def upgrade_projector_node_tree(projector, spot):
+    """
+    Remplace l'arbre d'un rig ancien (groupes de projection et de grille propres au
+    rig) par l'arbre aux groupes partagés, en gardant la texture de l'utilisateur.
+    Les valeurs du rig sont recalculées au prochain flush. Les groupes anciens, sans
+    utilisateur, ne sont plus enregistrés.
+    """
+    if is_shared_projection_tree(spot):
+        # Seule la grille est ancienne : elle est rattachée au besoin par update_pixel_grid
+        spot.data.node_tree.nodes.remove(spot.data.node_tree.nodes['pixel_grid'])
+        schedule_update(projector, ('PIXEL_GRID',))
+        return
+    user_texture = spot.data.node_tree.nodes.get('Image Texture')
+    image = user_texture.image if user_texture else None
+    add_projector_node_tree_to_spot(spot)
+    spot.data.node_tree.nodes['Image Texture'].image = image
+    schedule_update(projector, ASPECTS)
+
+
+@persistent
+def upgrade_projector_node_trees(*args):
+    """
+    Move the rigs of a loaded file to the shared projection and pixel grid groups,
+    and to the test images created on demand.
+    """
+    legacy_images = release_legacy_test_images()
+    upgraded = 0
+    for scene in bpy.data.scenes:
+        for rig in get_rig_registry(scene).rigs.values():
+            spot = rig.spot
+            if spot is None or spot.type != 'LIGHT' or spot.data.node_tree is None:
+                continue
+            if not is_shared_projection_tree(spot) or has_own_pixel_grid(spot):
+                upgrade_projector_node_tree(rig.projector, spot)
+                upgraded += 1
+            elif legacy_images:
+                # Les images de toutes les résolutions sont libérées quand le rig change d'image
+                schedule_update(rig.projector, ('TEXTURE',))
+    if upgraded:
+        invalidate_rig_nodes()
+        log.info(f"Moved {upgraded} projector(s) to the shared node groups")
+    # Tout de suite : un rendu en arrière-plan n'attend pas le timer
+    flush_updates()
+    if legacy_images:
+        release_unused_test_images()
+
 
 def get_resolution(proj_settings, context):
     """ Find out what resolution is currently used and return it.
     Resolution from the dropdown or the resolution from the custom texture.
     """
     if proj_settings.use_custom_texture_res and proj_settings.projected_texture == Textures.CUSTOM_TEXTURE.value:
-        projector = get_projector(context)
-        root_tree = projector.children[0].data.node_tree
-        image = root_tree.nodes['Image Texture'].image
+        image = get_rig_nodes(proj_settings.id_data, context).custom_image.image
         if image:
             w = image.size[0]
             h = image.size[1]
         else:
             w, h = 300, 300
     else:
-        w, h = proj_settings.resolution.split('x')
+        w, h = parse_resolution(get_resolution_text(proj_settings))
 
     return float(w), float(h)
 
 
+def get_rigs_optics(settings, context):
+    """ Camera and mapping settings of many rigs, computed in one vectorized pass. """
+    throw_ratios = [proj_settings.get('throw_ratio') for proj_settings in settings]
+    h_shifts = [proj_settings.get('h_shift', 0.0) for proj_settings in settings]
+    v_shifts = [proj_settings.get('v_shift', 0.0) for proj_settings in settings]
+    resolutions = [get_resolution(proj_settings, context) for proj_settings in settings]
+    return compute_rig_optics(throw_ratios, h_shifts, v_shifts, resolutions)
+
+
+def apply_cameras(settings, context):
+    """ Field of view and lens shift of the cameras of many rigs. """
+    optics = get_rigs_optics(settings, context)
+    for i, proj_settings in enumerate(settings):
+        camera = proj_settings.id_data.data
+        camera.lens_unit = 'FOV'
+        camera.angle = optics.angle[i]
+        camera.sensor_width = 10
+        camera.display_size = 1
+        camera.shift_x = optics.shift_x[i]
+        camera.shift_y = optics.shift_y[i]
+
+
+def apply_camera(proj_settings, context):
+    """ Field of view and lens shift of the camera. """
+    apply_cameras([proj_settings], context)
+
+
+def apply_mappings(settings, context):
+    """ Scale (throw ratio) and translation (lens shift) of the projected textures of many rigs. """
+    optics = get_rigs_optics(settings, context)
+    for i, proj_settings in enumerate(settings):
+        # Entrées du nœud de groupe du rig : le groupe de projection est partagé
+        rig_nodes = get_rig_nodes(proj_settings.id_data, context)
+        rig_nodes.scale_input.default_value = (optics.scale_x[i], optics.scale_y[i], 1)
+        rig_nodes.location_input.default_value = (optics.translation_x[i], optics.translation_y[i], 0)
+
+
+def apply_mapping(proj_settings, context):
+    """ Scale (throw ratio) and translation (lens shift) of the projected texture. """
+    apply_mappings([proj_settings], context)
+
+
+def apply_texture(proj_settings, context):
+    """
+    Test image and projected output source. Only the color grid needs an image of
+    the resolution; the checker only reads the alpha of the frame image.
+    """
+    rig_nodes = get_rig_nodes(proj_settings.id_data, context)
+    test_image = rig_nodes.test_image
+    if proj_settings.projected_texture == Textures.COLOR_GRID.value:
+        image = get_test_image(get_resolution_text(proj_settings))
+        test_image.interpolation = 'Linear'
+    else:
+        image = get_frame_image()
+        test_image.interpolation = 'Closest'
+    previous = test_image.image
+    if previous != image:
+        test_image.image = image
+        release_test_image(previous)
+    update_projected_texture(proj_settings, context)
+
+
 def update_throw_ratio(proj_settings, context):
     """
-    Adjust some settings on a camera to achieve a throw ratio
+    Adjust some settings on a camera to achieve a throw ratio (immediately, for
+    operators; the property itself schedules these updates).
     """
-    projector = get_projector(context)
-    # Update properties of the camera.
-    throw_ratio = proj_settings.get('throw_ratio')
-    distance = 1
-    alpha = math.atan((distance/throw_ratio)*.5) * 2
-    projector.data.lens_unit = 'FOV'
-    projector.data.angle = alpha
-    projector.data.sensor_width = 10
-    projector.data.display_size = 1
-
-    # Adjust Texture to fit new camera ###
-    w, h = get_resolution(proj_settings, context)
-    aspect_ratio = w/h
-    inverted_aspect_ratio = 1/aspect_ratio
-
-    # Projected Texture
     update_projected_texture(proj_settings, context)
+    apply_camera(proj_settings, context)
+    apply_mapping(proj_settings, context)
+    # Le décalage de l'écran dépend du throw ratio
+    apply_screen_offset(proj_settings, context)
 
-    # Update spotlight properties.
-    spot = projector.children[0]
-    nodes = spot.data.node_tree.nodes['Group'].node_tree.nodes
-    if bpy.app.version < (2, 81):
-        nodes['Mapping.001'].scale[0] = 1 / throw_ratio
-        nodes['Mapping.001'].scale[1] = 1 / throw_ratio * inverted_aspect_ratio
-    else:
-        nodes['Mapping.001'].inputs[3].default_value[0] = 1 / throw_ratio
-        nodes['Mapping.001'].inputs[3].default_value[1] = 1 / \
-            throw_ratio * inverted_aspect_ratio
+def get_screen_offset(orientation, h_shift, v_shift, screen_width, screen_height):
+    """
+    Déplacement (X, Z) de l'écran dans le repère du rig pour un lens shift donné
+    (shifts en fraction de l'image, pas en pourcentage).
+    """
+    # Le déplacement de l'écran dépend de l'orientation
+    if orientation == 'PORTRAIT':
+        return -v_shift * screen_height, -h_shift * screen_width  # V devient X, H devient Z
+    # PAYSAGE : X = largeur, Z = hauteur
+    return h_shift * screen_width, v_shift * screen_height
 
-    # Update lens shift because it depends on the throw ratio.
-    update_lens_shift(proj_settings, context)
 
 def update_lens_shift(proj_settings, context):
     """
-    Apply the shift to the camera, texture, and screen position.
+    Apply the shift to the camera, texture, and screen position (immediately).
     """
-    projector = get_projector(context)
+    apply_camera(proj_settings, context)
+    apply_mapping(proj_settings, context)
+    apply_screen_offset(proj_settings, context)
+
+
+def apply_screen_offset(proj_settings, context):
+    """ Move the screen of the rig so that it follows the lens shift. """
+    projector = proj_settings.id_data
     h_shift = proj_settings.get('h_shift', 0.0) / 100
     v_shift = proj_settings.get('v_shift', 0.0) / 100
     throw_ratio = proj_settings.get('throw_ratio')
 
-    w, h = get_resolution(proj_settings, context)
-    inverted_aspect_ratio = h/w
-
-    # Update the properties of the camera.
-    cam = projector
-    cam.data.shift_x = h_shift
-    cam.data.shift_y = v_shift * inverted_aspect_ratio
-
-    # Update spotlight node setup.
-    spot = projector.children[0]
-    nodes = spot.data.node_tree.nodes['Group'].node_tree.nodes
-    if bpy.app.version < (2, 81):
-        nodes['Mapping.001'].translation[0] = h_shift / throw_ratio
-        nodes['Mapping.001'].translation[1] = v_shift / throw_ratio * inverted_aspect_ratio
-    else:
-        nodes['Mapping.001'].inputs[1].default_value[0] = h_shift / throw_ratio
-        nodes['Mapping.001'].inputs[1].default_value[1] = v_shift / throw_ratio * inverted_aspect_ratio
-
     # ===== Déplacer l'écran automatiquement =====
     
     # Chercher l'objet parent qui pourrait contenir l'écran
-    parent_obj = context.active_object if context.active_object != projector else projector.parent
-    if not parent_obj:
-        parent_obj = projector
+    parent_obj = get_rig_parent(projector, context)
     
-    # Trouver l'objet écran
-    screen_obj = find_screen_object_recursive(parent_obj)
-    if not screen_obj:
-        screen_obj = find_screen_object_recursive(projector)
+    # Objet écran du rig : simple lecture du registre, pas de parcours de la hiérarchie
+    screen_obj = get_rig_component(projector, 'screen', context)
     
     if screen_obj:
         # Obtenir la distance à l'écran
@@ -630,15 +753,10 @@ def update_lens_shift(proj_settings, context):
         if screen_distance:
             # Calculer le déplacement physique de l'écran basé sur le lens shift
             try:
-                screen_width, screen_height = calculate_screen_size(throw_ratio, screen_distance, proj_settings.resolution)
+                screen_width, screen_height = calculate_screen_size(throw_ratio, screen_distance, get_resolution_text(proj_settings))
                 
-                # Le déplacement de l'écran dépend de l'orientation
-                if proj_settings.orientation == 'PORTRAIT':
-                    screen_offset_x = -v_shift * screen_height  # V devient X
-                    screen_offset_z = -h_shift * screen_width   # H devient Z
-                else:  # PAYSAGE
-                    screen_offset_x = h_shift * screen_width   # X = largeur
-                    screen_offset_z = v_shift * screen_height  # Z = hauteur
+                screen_offset_x, screen_offset_z = get_screen_offset(
+                    proj_settings.orientation, h_shift, v_shift, screen_width, screen_height)
                 
                 # Appliquer le déplacement à l'écran
                 if '_original_location' not in screen_obj:
@@ -658,61 +776,94 @@ def update_lens_shift(proj_settings, context):
                 log.warning(f"Could not calculate screen offset: {e}")
 
 def update_resolution(proj_settings, context):
-    projector = get_projector(context)
-    nodes = projector.children[0].data.node_tree.nodes['Group'].node_tree.nodes
-    # Change resolution image texture
-    nodes['Image Texture'].image = bpy.data.images[f'_proj.tex.{proj_settings.resolution}']
+    apply_texture(proj_settings, context)
     update_throw_ratio(proj_settings, context)
     update_pixel_grid(proj_settings, context)
 
 
 def update_checker_color(proj_settings, context):
     # Update checker texture color
-    nodes = get_projector(
-        context).children[0].data.node_tree.nodes['Group'].node_tree.nodes
+    color_input = get_rig_nodes(proj_settings.id_data, context).color_input
     c = proj_settings.projected_color
-    nodes['Checker Texture'].inputs['Color2'].default_value = [c.r, c.g, c.b, 1]
+    color_input.default_value = [c.r, c.g, c.b, 1]
 
 
 def update_power(proj_settings, context):
     # Update spotlight power - convertir le pourcentage en intensité
-    spot = get_projector(context).children[0]
+    spot = get_spot(proj_settings.id_data, context)
     power_percentage = proj_settings["power"]
     actual_power = (power_percentage / 100.0) * 10000.0
     spot.data.energy = actual_power
 
 
 def update_pixel_grid(proj_settings, context):
-    """ Update the pixel grid. Meaning, make it visible by linking the right node and updating the resolution. """
-    root_tree = get_projector(context).children[0].data.node_tree
-    nodes = root_tree.nodes
-    pixel_grid_nodes = nodes['pixel_grid'].node_tree.nodes
-    width, height = get_resolution(proj_settings, context)
-    pixel_grid_nodes['_width'].outputs[0].default_value = width
-    pixel_grid_nodes['_height'].outputs[0].default_value = height
+    """
+    Update the pixel grid. The shared grid group is attached to the spot only while
+    the grid is shown (its resolution fed through the Width and Height inputs) and
+    detached when it is hidden, so the spot shader does not carry its nodes.
+    """
+    projector = proj_settings.id_data
+    rig_nodes = get_rig_nodes(projector, context)
+    tree = rig_nodes.tree
     if proj_settings.show_pixel_grid:
-        root_tree.links.new(nodes['pixel_grid'].outputs[0], nodes['Light Output'].inputs[0])
+        pixel_grid = rig_nodes.pixel_grid
+        if pixel_grid is None:
+            pixel_grid = attach_pixel_grid(rig_nodes)
+            invalidate_rig_nodes(projector)
+        width, height = get_resolution(proj_settings, context)
+        pixel_grid.inputs['Width'].default_value = width
+        pixel_grid.inputs['Height'].default_value = height
+        tree.links.new(pixel_grid.outputs[0], rig_nodes.light_output.inputs[0])
     else:
-        root_tree.links.new(nodes['Emission'].outputs[0], nodes['Light Output'].inputs[0])
+        if rig_nodes.pixel_grid is not None:
+            tree.nodes.remove(rig_nodes.pixel_grid)
+            invalidate_rig_nodes(projector)
+        tree.links.new(rig_nodes.emission.outputs[0], rig_nodes.light_output.inputs[0])
 
-    
-def create_pixel_grid_node_group():
-    node_group = bpy.data.node_groups.new(
-        '_Projectors-Addon_PixelGrid', 'ShaderNodeTree')
 
-    # Create input/output sockets for the node group.
-    if(bpy.app.version >= (4, 0)):
-        node_group.interface.new_socket('Shader', socket_type='NodeSocketShader')
-        node_group.interface.new_socket('Vector', socket_type='NodeSocketVector')
+def attach_pixel_grid(rig_nodes):
+    """ Add the shared pixel grid group to a spot tree, between its emission and its output. """
+    tree = rig_nodes.tree
+    pixel_grid_node = tree.nodes.new('ShaderNodeGroup')
+    pixel_grid_node.node_tree = get_pixel_grid_node_group()
+    pixel_grid_node.label = "Pixel Grid"
+    pixel_grid_node.name = 'pixel_grid'
+    loc = rig_nodes.emission.location
+    pixel_grid_node.location = (loc[0], loc[1] - 150)
 
-        node_group.interface.new_socket('Shader', in_out='OUTPUT', socket_type='NodeSocketShader')
-    else:
-        inputs = node_group.inputs
-        inputs.new('NodeSocketShader', 'Shader')
-        inputs.new('NodeSocketVector', 'Vector')
+    tree.links.new(rig_nodes.group.outputs['texture vector'], pixel_grid_node.inputs['Vector'])
+    tree.links.new(rig_nodes.emission.outputs[0], pixel_grid_node.inputs['Shader'])
+    return pixel_grid_node
+
+
+# Grille de pixels partagée, marquée avec sa version comme le groupe de projection
+PIXEL_GRID_GROUP_NAME = '_Projectors-Addon_PixelGrid'
+PIXEL_GRID_GROUP_TAG = ADDON_ID.format('pixel_grid_group')
+PIXEL_GRID_GROUP_VERSION = 2
 
-        outputs = node_group.outputs
-        outputs.new('NodeSocketShader', 'Shader')
+
+def get_pixel_grid_node_group():
+    """ Return the pixel grid group shared by every rig, created on first use. """
+    node_group = bpy.data.node_groups.get(PIXEL_GRID_GROUP_NAME)
+    if node_group is None or node_group.get(PIXEL_GRID_GROUP_TAG) != PIXEL_GRID_GROUP_VERSION:
+        node_group = next((group for group in bpy.data.node_groups
+                           if group.get(PIXEL_GRID_GROUP_TAG) == PIXEL_GRID_GROUP_VERSION), None)
+    if node_group is None:
+        node_group = create_pixel_grid_node_group()
+    return node_group
+
+
+def create_pixel_grid_node_group():
+    node_group = bpy.data.node_groups.new(PIXEL_GRID_GROUP_NAME, 'ShaderNodeTree')
+    node_group[PIXEL_GRID_GROUP_TAG] = PIXEL_GRID_GROUP_VERSION
+
+    # Create input/output sockets for the node group.
+    new_group_socket(node_group, 'Shader', 'INPUT', 'NodeSocketShader')
+    new_group_socket(node_group, 'Vector', 'INPUT', 'NodeSocketVector')
+    # Résolution du rig, sur les entrées de son nœud de groupe
+    new_group_socket(node_group, 'Width', 'INPUT', 'NodeSocketFloat')
+    new_group_socket(node_group, 'Height', 'INPUT', 'NodeSocketFloat')
+    new_group_socket(node_group, 'Shader', 'OUTPUT', 'NodeSocketShader')
 
     nodes = node_group.nodes
 
@@ -724,16 +875,6 @@ def create_pixel_grid_node_group():
     sepXYZ = nodes.new('ShaderNodeSeparateXYZ')
     sepXYZ.location = auto_pos(200)
 
-    in_width = nodes.new('ShaderNodeValue')
-    in_width.name = '_width'
-    in_width.label = 'Width'
-    in_width.location = auto_pos(100)
-
-    in_height = nodes.new('ShaderNodeValue')
-    in_height.name = '_height'
-    in_height.label = 'Height'
-    in_height.location = auto_pos(y=-200)
-
     mul1 = nodes.new('ShaderNodeMath')
     mul1.operation = 'MULTIPLY'
     mul1.location = auto_pos(100)
@@ -780,11 +921,11 @@ def create_pixel_grid_node_group():
     # Link Nodes
     links = node_group.links
 
-    links.new(group_input.outputs[0], mix_shader.inputs[2])
-    links.new(group_input.outputs[1], sepXYZ.inputs[0])
+    links.new(group_input.outputs['Shader'], mix_shader.inputs[2])
+    links.new(group_input.outputs['Vector'], sepXYZ.inputs[0])
 
-    links.new(in_width.outputs[0], mul1.inputs[1])
-    links.new(in_height.outputs[0], mul2.inputs[1])
+    links.new(group_input.outputs['Width'], mul1.inputs[1])
+    links.new(group_input.outputs['Height'], mul2.inputs[1])
 
     links.new(sepXYZ.outputs[0], mul1.inputs[0])
     links.new(sepXYZ.outputs[1], mul2.inputs[0])
@@ -806,46 +947,75 @@ def create_pixel_grid_node_group():
     return node_group
     
 
-def create_projector(context):
+def new_spot_data(template=None):
     """
-    Create a new projector composed out of a camera (parent obj) and a spotlight (child not intended for user interaction).
-    The camera is the object intended for the user to manipulate and custom properties are stored there.
-    The spotlight with a custom nodetree is responsible for actual projection of the texture.
+    Light data of a projector spot. With `template` (the spot data of another rig),
+    its node tree is copied instead of being built node by node.
     """
-    create_projector_textures()
-    log.debug('Creating projector.')
+    if template is not None:
+        # Les groupes de projection et de grille sont partagés : seul l'arbre du spot est copié
+        return template.copy()
+
+    spot_data = bpy.data.lights.new('Projector.Spot', 'SPOT')
+    spot_data.spot_size = math.pi - 0.001
+    spot_data.spot_blend = 0
+    spot_data.shadow_soft_size = 0.0
+    spot_data.cycles.use_multiple_importance_sampling = False
+    return spot_data
 
-    # Create a camera and a spotlight
+
+def create_projector_rig(collection, location=(0, 0, 0), rotation=(0, 0, 0), name='Projector', template=None):
+    """
+    Create the camera and the spot of a projector with the data API (no operator:
+    no undo step, no depsgraph evaluation, no dependency on context.object).
+    Return (camera, spot). The settings are not initialized.
+    """
     # ### Spot Light ###
-    bpy.ops.object.light_add(type='SPOT', location=(0, 0, 0))
-    spot = context.object
-    spot.name = 'Projector.Spot'
+    spot_data = new_spot_data(template)
+    spot = bpy.data.objects.new('Projector.Spot', spot_data)
     spot.scale = (.01, .01, .01)
-    spot.data.spot_size = math.pi - 0.001
-    spot.data.spot_blend = 0
-    spot.data.shadow_soft_size = 0.0
     spot.hide_select = True
     spot[ADDON_ID.format('spot')] = True
-    spot.data.cycles.use_multiple_importance_sampling = False
-    add_projector_node_tree_to_spot(spot)
+    spot[ROLE_TAG] = 'SPOT'
+    collection.objects.link(spot)
+    if template is None:
+        add_projector_node_tree_to_spot(spot)
 
     # ### Camera ###
-    bpy.ops.object.camera_add(enter_editmode=False,
-                              location=(0, 0, 0),
-                              rotation=(0, 0, 0))
-    cam = context.object
-    cam.name = 'Projector'
+    cam = bpy.data.objects.new(name, bpy.data.cameras.new(name))
+    # L'identifiant du rig est attribué par le registre
+    cam[ROLE_TAG] = 'PROJECTOR'
+    cam.location = location
+    cam.rotation_euler = rotation
+    collection.objects.link(cam)
 
     # Parent light to cam.
     spot.parent = cam
+    return cam, spot
+
+
+def create_projector(context):
+    """
+    Create a new projector composed out of a camera (parent obj) and a spotlight (child not intended for user interaction).
+    The camera is the object intended for the user to manipulate and custom properties are stored there.
+    The spotlight with a custom nodetree is responsible for actual projection of the texture.
+    """
+    log.debug('Creating projector.')
 
     # Move newly create projector (cam and spotlight) to 3D-Cursor position.
-    cam.location = context.scene.cursor.location
-    cam.rotation_euler = context.scene.cursor.rotation_euler
+    cursor = context.scene.cursor
+    cam, spot = create_projector_rig(context.collection, cursor.location, cursor.rotation_euler)
+
+    # Le nouveau projecteur devient la sélection, comme avec bpy.ops.object.camera_add
+    for obj in context.selected_objects:
+        obj.select_set(False)
+    cam.select_set(True)
+    context.view_layer.objects.active = cam
+    refresh_rig_registry(context.scene)
     return cam
 
 
-def init_projector(proj_settings, context):
+def set_default_settings(proj_settings):
     # # Add custom properties to store projector settings on the camera obj.
     proj_settings.throw_ratio = 0.8
     proj_settings.power = 100.0
@@ -857,14 +1027,56 @@ def init_projector(proj_settings, context):
     proj_settings.resolution = '1920x1200'
     proj_settings.use_custom_texture_res = True
 
-    # Init Projector
-    update_throw_ratio(proj_settings, context)
-    update_projected_texture(proj_settings, context)
-    update_resolution(proj_settings, context)
-    update_checker_color(proj_settings, context)
-    update_lens_shift(proj_settings, context)
-    update_power(proj_settings, context)
-    update_pixel_grid(proj_settings, context)
+
+def init_projector(proj_settings, context):
+    # Init Projector : les réglages ne font que planifier leurs mises à jour, chaque
+    # aspect du rig est calculé une seule fois à la fin du bloc
+    with batched_updates(context):
+        set_default_settings(proj_settings)
+        schedule_update(proj_settings.id_data, ASPECTS)
+
+
+def create_projectors_from_layout(context, entries, collection):
+    """
+    Crée un rig par entrée d'implantation (core.layout.LayoutEntry) dans `collection`,
+    en une seule transaction : objets créés par l'API de données, arbre de nœuds
+    construit une fois puis copié, registre reconstruit une fois et mises à jour
+    calculées en un seul passage vectorisé. Retourne les caméras créées.
+    """
+    with batched_updates(context):
+        template = None
+        cameras = []
+        for entry in entries:
+            cam, spot = create_projector_rig(collection, entry.location, entry.rotation, entry.name or 'Projector',
+                                             template)
+            template = template or spot.data
+
+            proj_settings = cam.proj_settings
+            set_default_settings(proj_settings)
+            # L'optique d'abord : elle fixe les lumens et les limites de shift
+            if entry.lens:
+                assign_catalog_entry(proj_settings, context, entry.brand, entry.model, entry.lens)
+            if entry.throw_ratio is not None:
+                proj_settings.throw_ratio = entry.throw_ratio
+            if entry.resolution:
+                set_resolution_text(proj_settings, entry.resolution)
+            if entry.power is not None:
+                proj_settings.power = entry.power
+            if entry.h_shift is not None:
+                proj_settings.h_shift = entry.h_shift
+            if entry.v_shift is not None:
+                proj_settings.v_shift = entry.v_shift
+            if entry.screen_distance is not None:
+                cam["SCREEN_DISTANCE"] = entry.screen_distance
+            schedule_update(cam, ASPECTS)
+            cameras.append(cam)
+
+        # Le registre d'abord : les mises à jour y trouvent le spot de chaque rig
+        refresh_rig_registry(context.scene)
+        for cam, entry in zip(cameras, entries):
+            if entry.orientation:
+                cam.proj_settings.orientation = entry.orientation
+    return cameras
 
 
 class PROJECTOR_OT_create_projector(Operator):
@@ -883,30 +1095,94 @@ class PROJECTOR_OT_create_projector(Operator):
         return {'FINISHED'}
 
 
+class PROJECTOR_OT_create_from_layout(Operator):
+    """Create one projector per row of a layout file (CSV, XLSX or JSON)"""
+    bl_idname = 'projector.create_from_layout'
+    bl_label = 'Create Projectors from Layout'
+    bl_description = ('Create a projector per row of a layout file: position, rotation (degrees), lens and settings. '
+                      'Issues are reported with their row')
+    bl_options = {'REGISTER', 'UNDO'}
+
+    # Nombre de problèmes affichés dans les rapports
+    REPORTED_ISSUES = 10
+
+    filepath: bpy.props.StringProperty(subtype="FILE_PATH")
+    filter_glob: bpy.props.StringProperty(
+        default="*.csv;*.xlsx;*.json",
+        options={'HIDDEN'},
+        maxlen=255,
+    )
+    use_collection: bpy.props.BoolProperty(
+        name="New Collection",
+        description="Create the projectors in a new collection named after the layout file",
+        default=True,
+    )
+    skip_invalid: bpy.props.BoolProperty(
+        name="Skip Invalid Rows",
+        description="Create the valid rows even if some rows have errors",
+        default=False,
+    )
+
+    @classmethod
+    def poll(cls, context):
+        return context.mode == 'OBJECT'
+
+    def execute(self, context):
+        from .projector_database import get_lens_index
+
+        try:
+            layout = ProjectorLayout.from_file(self.filepath, get_lens_index())
+        except (OSError, ValueError, KeyError) as e:
+            self.report({'ERROR'}, f"Layout could not be read: {str(e)}")
+            return {'CANCELLED'}
+
+        for issue in layout.issues[:self.REPORTED_ISSUES]:
+            self.report({issue.severity}, f"Row {issue.row}: {issue.message}")
+        if layout.errors and not self.skip_invalid:
+            self.report({'ERROR'}, f"{len(layout.errors)} invalid row(s), nothing created")
+            return {'CANCELLED'}
+        if not layout.entries:
+            self.report({'WARNING'}, "No valid row in the layout")
+            return {'CANCELLED'}
+
+        collection = context.collection
+        if self.use_collection:
+            collection = bpy.data.collections.new(os.path.splitext(os.path.basename(self.filepath))[0])
+            context.scene.collection.children.link(collection)
+
+        start = time.perf_counter()
+        cameras = create_projectors_from_layout(context, layout.entries, collection)
+        for obj in context.selected_objects:
+            obj.select_set(False)
+        for cam in cameras:
+            cam.select_set(True)
+        context.view_layer.objects.active = cameras[-1]
+
+        log.info(f"Created {len(cameras)} projectors in {time.perf_counter() - start:.2f}s")
+        self.report({'INFO'}, f"Created {len(cameras)} projector(s) in {collection.name}")
+        return {'FINISHED'}
+
+    def invoke(self, context, event):
+        context.window_manager.fileselect_add(self)
+        return {'RUNNING_MODAL'}
+
+
 def update_projected_texture(proj_settings, context):
     """ Update the projected output source. """
-    projector = get_projectors(context, only_selected=True)[0]
-    root_tree = projector.children[0].data.node_tree
-    group_tree = root_tree.nodes['Group'].node_tree
-    group_output_node = group_tree.nodes['Group Output']
-    group_node = root_tree.nodes['Group']
-    emission_node = root_tree.nodes['Emission']
-
-    # Switch between the three possible cases by relinking some nodes.
+    rig_nodes = get_rig_nodes(proj_settings.id_data, context)
+    emission_input = rig_nodes.emission.inputs['Color']
+
+    # Switch between the three possible cases by relinking the emission color.
     case = proj_settings.projected_texture
     if case == Textures.CHECKER.value:
-        mix_node = group_tree.nodes['Mix.001']
-        group_tree.links.new(
-            mix_node.outputs['Color'], group_output_node.inputs[1])
-        root_tree.links.new(group_node.outputs[1], emission_node.inputs[0])
+        source = rig_nodes.mix.outputs['Color']
     elif case == Textures.COLOR_GRID.value:
-        img_node = group_tree.nodes['Image Texture']
-        group_tree.links.new(img_node.outputs[0], group_output_node.inputs[1])
-        root_tree.links.new(group_node.outputs[1], emission_node.inputs[0])
+        source = rig_nodes.test_image.outputs['Color']
     elif case == Textures.CUSTOM_TEXTURE.value:
-        custom_tex_node = root_tree.nodes['Image Texture']
-        root_tree.links.new(
-            custom_tex_node.outputs[0], emission_node.inputs[0])
+        source = rig_nodes.custom_image.outputs['Color']
+    else:
+        return
+    rig_nodes.tree.links.new(source, emission_input)
 
 
 class PROJECTOR_OT_delete_projector(Operator):
@@ -922,6 +1198,9 @@ class PROJECTOR_OT_delete_projector(Operator):
     def execute(self, context):
         selected_projectors = get_projectors(context, only_selected=True)
         deleted_count = 0
+        # Lumières des spots supprimés : retirées avec leur arbre, qui retient l'image de test
+        spot_lights = [spot.data for spot in (get_spot(p, context) for p in selected_projectors)
+                       if spot is not None and spot.type == 'LIGHT']
         
         for projector in selected_projectors:
             # Identifier l'objet parent à supprimer
@@ -947,6 +1226,11 @@ class PROJECTOR_OT_delete_projector(Operator):
             delete_hierarchy_recursive(parent_to_delete)
             deleted_count += 1
         
+        for light in spot_lights:
+            if light.users == 0:
+                bpy.data.lights.remove(light)
+        release_unused_test_images()
+        refresh_rig_registry(context.scene)
         self.report({'INFO'}, f"Deleted {deleted_count} projector hierarchy(ies)")
         return {'FINISHED'}
 
@@ -966,6 +1250,12 @@ class ProjectorSettings(bpy.types.PropertyGroup):
         ],
         default='LANDSCAPE',
         update=update_orientation)
+    catalog_search: bpy.props.StringProperty(
+        name="Search",
+        description="Search the catalog by brand, model, lens or part number (e.g. 'R9802300' or '0.8 UST 4K')",
+        search=search_catalog,
+        search_options={'SUGGESTION'},
+        update=update_catalog_search)
     projector_brand: bpy.props.EnumProperty(
         name="Brand",
         description="Projector brand", 
@@ -986,7 +1276,7 @@ class ProjectorSettings(bpy.types.PropertyGroup):
     throw_ratio: bpy.props.FloatProperty(
         name="Throw Ratio",
         soft_min=0.4, soft_max=3,
-        update=update_throw_ratio,
+        update=deferred_update('TEXTURE', 'CAMERA', 'MAPPING', 'SCREEN'),
         precision=2,
         subtype='FACTOR')
     power: bpy.props.FloatProperty(
@@ -995,7 +1285,7 @@ class ProjectorSettings(bpy.types.PropertyGroup):
         default=100.0,
         soft_min=0, soft_max=100,
         precision=0,
-        update=update_power,
+        update=deferred_update('POWER'),
         subtype='PERCENTAGE')
     lumens: bpy.props.FloatProperty(
     name="Projector Lumens",
@@ -1006,20 +1296,27 @@ class ProjectorSettings(bpy.types.PropertyGroup):
     unit='NONE',
     update=update_lumens)
     resolution: bpy.props.EnumProperty(
-        items=RESOLUTIONS,
+        items=PROJECTOR_RESOLUTIONS,
         default='1920x1200',
         description="Select a Resolution for your Projector",
-        update=update_resolution)
+        update=deferred_update('TEXTURE', 'CAMERA', 'MAPPING', 'SCREEN', 'PIXEL_GRID'))
+    custom_resolution: bpy.props.IntVectorProperty(
+        name="Custom Resolution",
+        description="Width and height in pixels, used when the resolution is Custom",
+        size=2,
+        default=(2560, 1600),
+        min=1, soft_max=16384,
+        update=deferred_update('TEXTURE', 'CAMERA', 'MAPPING', 'SCREEN', 'PIXEL_GRID'))
     use_custom_texture_res: bpy.props.BoolProperty(
         name="Let Image Define Projector Resolution",
         default=True,
         description="Use the resolution from the image as the projector resolution. Warning: After selecting a new image toggle this checkbox to update",
-        update=update_throw_ratio)
+        update=deferred_update('TEXTURE', 'CAMERA', 'MAPPING', 'SCREEN', 'PIXEL_GRID'))
     h_shift: bpy.props.FloatProperty(
     name="Horizontal Shift",
     description="Horizontal Lens Shift",
     soft_min=-100, soft_max=100,  # Valeurs par défaut
-    update=update_lens_shift,
+    update=deferred_update('CAMERA', 'MAPPING', 'SCREEN'),
     subtype='PERCENTAGE',
     get=lambda self: self.get("h_shift", 0.0),
     set=lambda self, value: self.__setitem__("h_shift", max(self.h_shift_min, min(self.h_shift_max, value))))
@@ -1028,7 +1325,7 @@ class ProjectorSettings(bpy.types.PropertyGroup):
         name="Vertical Shift",
         description="Vertical Lens Shift", 
         soft_min=-100, soft_max=100,  # Valeurs par défaut
-        update=update_lens_shift,
+        update=deferred_update('CAMERA', 'MAPPING', 'SCREEN'),
         subtype='PERCENTAGE',
         get=lambda self: self.get("v_shift", 0.0),
         set=lambda self, value: self.__setitem__("v_shift", max(self.v_shift_min, min(self.v_shift_max, value))))
@@ -1054,33 +1351,47 @@ class ProjectorSettings(bpy.types.PropertyGroup):
         default=50.0)
     projected_color: bpy.props.FloatVectorProperty(
         subtype='COLOR',
-        update=update_checker_color)
+        update=deferred_update('COLOR'))
     projected_texture: bpy.props.EnumProperty(
         items=PROJECTED_OUTPUTS,
         default=Textures.CHECKER.value,
         description="What do you to project?",
-        update=update_throw_ratio)
+        update=deferred_update('TEXTURE', 'CAMERA', 'MAPPING', 'SCREEN', 'PIXEL_GRID'))
     show_pixel_grid: bpy.props.BoolProperty(
         name="Show Pixel Grid",
         description="When checked the image is divided into a pixel grid with the dimensions of the image resolution.",
         default=False,
-        update=update_pixel_grid)
+        update=deferred_update('PIXEL_GRID'))
 
 
 def register():
+    register_aspect('TEXTURE', apply_texture)
+    register_aspect('CAMERA', apply_camera, apply_cameras)
+    register_aspect('MAPPING', apply_mapping, apply_mappings)
+    register_aspect('SCREEN', apply_screen_offset)
+    register_aspect('PIXEL_GRID', update_pixel_grid)
+    register_aspect('POWER', update_power)
+    register_aspect('COLOR', update_checker_color)
+
     bpy.utils.register_class(ProjectorSettings)
     bpy.utils.register_class(PROJECTOR_OT_create_projector)
+    bpy.utils.register_class(PROJECTOR_OT_create_from_layout)
     bpy.utils.register_class(PROJECTOR_OT_delete_projector)
     bpy.utils.register_class(PROJECTOR_OT_change_color_randomly)
     bpy.utils.register_class(PROJECTOR_OT_auto_adjust_screen_size)
 
     bpy.types.Object.proj_settings = bpy.props.PointerProperty(
         type=ProjectorSettings)
+    if upgrade_projector_node_trees not in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.append(upgrade_projector_node_trees)
 
 
 def unregister():
+    if upgrade_projector_node_trees in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.remove(upgrade_projector_node_trees)
     bpy.utils.unregister_class(PROJECTOR_OT_change_color_randomly)
     bpy.utils.unregister_class(PROJECTOR_OT_auto_adjust_screen_size)
     bpy.utils.unregister_class(PROJECTOR_OT_delete_projector)
+    bpy.utils.unregister_class(PROJECTOR_OT_create_from_layout)
     bpy.utils.unregister_class(PROJECTOR_OT_create_projector)
     bpy.utils.unregister_class(ProjectorSettings)
\ No newline at end of file
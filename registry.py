@@ -0,0 +1,407 @@
+"""
+Registre persistant des rigs de projecteurs.
+
+Chaque rig (objet parent, caméra du projecteur, spot, écran, objet dual) est connu
+par des propriétés de marquage posées sur ses objets, et non plus par le préfixe
+'Projector' de leur nom :
+- ROLE_TAG : rôle de l'objet dans le rig ('PARENT', 'PROJECTOR', 'SPOT', 'SCREEN', 'DUAL') ;
+- RIG_ID_TAG : identifiant entier et stable du rig, sur la caméra du projecteur.
+
+Le registre de chaque scène est construit en une passe sur ses objets puis gardé
+tant que la structure ne change pas : les recherches des polls, des panneaux et des
+opérateurs sont des accès à des dicts, sans parcours des objets de la scène. Les
+handlers load_post, undo/redo et depsgraph_update_post l'invalident quand des objets
+sont ajoutés ou supprimés (mise à jour d'une collection) et quand des objets de rig
+sont renommés ou re-parentés, et posent les marquages manquants (fichiers anciens,
+rigs dupliqués qui partagent un identifiant). Les opérateurs qui créent ou suppriment
+des rigs appellent refresh_rig_registry sans attendre le depsgraph.
+
+Les nœuds du spot que les mises à jour modifient (mapping, textures, émission,
+grille de pixels...) sont aussi gardés par rig (get_rig_nodes) : un déplacement de
+curseur écrit directement dans leurs sockets, sans recherche par nom.
+"""
+import logging
+from collections import namedtuple
+
+import bpy
+from bpy.app.handlers import persistent
+
+from .helper import ADDON_ID
+
+logging.basicConfig(
+    format='[Projectors Addon]: %(name)s - %(levelname)s - %(message)s')
+log = logging.getLogger(name=__file__)
+
+ROLE_TAG = ADDON_ID.format('role')
+RIG_ID_TAG = ADDON_ID.format('rig')
+# Marquage historique du spot, posé par create_projector
+SPOT_TAG = ADDON_ID.format('spot')
+ROLES = ('PARENT', 'PROJECTOR', 'SPOT', 'SCREEN', 'DUAL')
+
+Rig = namedtuple('Rig', [
+    'rig_id',     # Identifiant stable (RIG_ID_TAG de la caméra)
+    'parent',     # Objet qui porte SCREEN_DISTANCE... (la caméra si elle n'a pas de parent)
+    'projector',  # Caméra portant proj_settings
+    'spot',       # Spot de projection (ou None)
+    'screen',     # Écran du rig (ou None)
+    'dual',       # Objet dual (ou None)
+])
+
+RigNodes = namedtuple('RigNodes', [
+    'spot',            # Objet spot du rig
+    'tree',            # Arbre de nœuds du spot
+    'group',           # Nœud du groupe de projection (partagé par tous les rigs)
+    'group_tree',      # Arbre de ce groupe
+    'location_input',  # Entrées du nœud de groupe : translation (lens shift),
+    'scale_input',     # échelle (throw ratio)
+    'color_input',     # et couleur du damier du rig
+    'test_image',      # Image de test de la résolution (Test Texture)
+    'mix',             # Damier dans le cadre de l'image (Mix.001)
+    'custom_image',    # Texture de l'utilisateur (Image Texture)
+    'emission',
+    'light_output',
+    'pixel_grid',      # Nœud de la grille de pixels partagée, None quand la grille est masquée
+])
+# Noms des nœuds gardés dans RigNodes, contrôlés par get_nodes_key
+RIG_NODE_NAMES = ('Group', 'Test Texture', 'Mix.001', 'Image Texture', 'Emission', 'Light Output', 'pixel_grid')
+
+# Registres par scène (clé : pointeur de la scène), reconstruits à la demande
+_REGISTRIES = {}
+# Instantané de la sélection : (clé, projecteurs) ; la génération avance à chaque mise à jour du depsgraph
+_SELECTION = None
+_GENERATION = 0
+# Nœuds par rig (clé : pointeur du projecteur) -> (clé de validation, RigNodes)
+_RIG_NODES = {}
+
+
+def is_screen_name(name):
+    name_lower = name.lower()
+    return 'écran' in name_lower or 'ecran' in name_lower or 'screen' in name_lower
+
+
+def is_dual_name(name):
+    return 'dual' in name.lower()
+
+
+def is_projector_object(obj):
+    """ Tagged projector camera, or untagged camera named 'Projector...' (files made before the tags). """
+    if obj.type != 'CAMERA':
+        return False
+    role = obj.get(ROLE_TAG)
+    return role == 'PROJECTOR' if role is not None else obj.name.startswith('Projector')
+
+
+def looks_like_rig_object(obj):
+    """ Whether an object unknown to the registry could belong to a rig. """
+    return (ROLE_TAG in obj or is_projector_object(obj) or
+            is_screen_name(obj.name) or is_dual_name(obj.name))
+
+
+def find_role(obj, role, name_test):
+    """
+    Premier objet de la hiérarchie de `obj` (obj compris, parcours en profondeur)
+    marqué avec `role`, ou non marqué et dont le nom satisfait `name_test`.
+    """
+    stack = [obj]
+    while stack:
+        current = stack.pop()
+        current_role = current.get(ROLE_TAG)
+        if current_role == role or (current_role is None and name_test(current.name)):
+            return current
+        stack.extend(reversed(current.children))
+    return None
+
+
+def find_spot(projector):
+    for child in projector.children:
+        if child.get(ROLE_TAG) == 'SPOT' or SPOT_TAG in child:
+            return child
+    # Rigs anciens : la première lumière enfant, sinon le premier enfant
+    for child in projector.children:
+        if child.type == 'LIGHT':
+            return child
+    return projector.children[0] if projector.children else None
+
+
+class RigRegistry:
+    """ Rigs d'une scène, avec des index par objet pour des recherches en O(1). """
+
+    def __init__(self, scene):
+        self.rigs = {}
+        self.projectors = []
+        # Pointeur de chaque objet de rig -> identifiant de son rig
+        self._rig_ids = {}
+        # Pointeur d'un objet sélectionnable -> projecteur qu'il désigne (le projecteur et ses ancêtres)
+        self._selection = {}
+        # Nom et parent des objets de rig, pour détecter renommage et re-parentage
+        self._signatures = {}
+        # Marquages à écrire (objet, propriété, valeur), l'écriture étant interdite dans draw/poll
+        self.pending_tags = []
+
+        # Nombre d'objets de la scène, contrôlé par le handler du depsgraph
+        self.object_count = len(scene.objects)
+        projectors = []
+        for obj in scene.objects:
+            if is_projector_object(obj):
+                projectors.append(obj)
+            elif looks_like_rig_object(obj):
+                # Écran ou dual hors rig : connu, pour ne pas reconstruire à chacune de ses mises à jour
+                self._signatures[obj.as_pointer()] = (obj.name, obj.parent.as_pointer() if obj.parent else 0)
+        used_ids = set()
+        next_id = max((obj.get(RIG_ID_TAG, 0) for obj in projectors), default=0) + 1
+        for projector in projectors:
+            rig_id = projector.get(RIG_ID_TAG)
+            # Rig dupliqué : la copie porte l'identifiant de l'original
+            if rig_id is None or rig_id in used_ids:
+                rig_id = next_id
+                next_id += 1
+                self.pending_tags.append((projector, RIG_ID_TAG, rig_id))
+            used_ids.add(rig_id)
+            self._add_rig(rig_id, projector)
+
+    def _add_rig(self, rig_id, projector):
+        parent = projector.parent if projector.parent else projector
+        screen = find_role(parent, 'SCREEN', is_screen_name)
+        dual = find_role(parent, 'DUAL', is_dual_name)
+        rig = Rig(rig_id, parent, projector, find_spot(projector), screen, dual)
+        self.rigs[rig_id] = rig
+        self.projectors.append(projector)
+
+        roles = {}
+        for obj, role in ((projector, 'PROJECTOR'), (rig.spot, 'SPOT'), (parent, 'PARENT'), (screen, 'SCREEN'),
+                          (dual, 'DUAL')):
+            if obj is None or obj.as_pointer() in roles:
+                continue
+            pointer = obj.as_pointer()
+            roles[pointer] = role
+            self._rig_ids.setdefault(pointer, rig_id)
+            self._signatures[pointer] = (obj.name, obj.parent.as_pointer() if obj.parent else 0)
+            if obj.get(ROLE_TAG) is None:
+                self.pending_tags.append((obj, ROLE_TAG, role))
+
+        ancestor = projector
+        while ancestor:
+            self._selection.setdefault(ancestor.as_pointer(), projector)
+            ancestor = ancestor.parent
+
+    def get_rig(self, obj):
+        """ Rig an object belongs to (parent, projector, spot, screen or dual), or None. """
+        rig_id = self._rig_ids.get(obj.as_pointer())
+        return None if rig_id is None else self.rigs[rig_id]
+
+    def get_selected_projector(self, obj):
+        """ Projector designated by a selected object: the projector itself or one of its ancestors. """
+        return self._selection.get(obj.as_pointer())
+
+    def is_structure_changed(self, obj):
+        """ Whether an updated object changes the rigs (renamed or re-parented rig object, new rig object). """
+        signature = self._signatures.get(obj.as_pointer())
+        if signature is None:
+            return looks_like_rig_object(obj)
+        return signature != (obj.name, obj.parent.as_pointer() if obj.parent else 0)
+
+    def write_pending_tags(self):
+        """ Write the missing tags. Only call this where writing to IDs is allowed (handlers, operators). """
+        for obj, key, value in self.pending_tags:
+            obj[key] = value
+        if self.pending_tags:
+            log.debug(f"Tagged {len(self.pending_tags)} rig object(s)")
+        self.pending_tags = []
+
+
+def get_rig_registry(scene):
+    """ Return the registry of a scene, built on first use after an invalidation. """
+    key = scene.as_pointer()
+    registry = _REGISTRIES.get(key)
+    if registry is None:
+        registry = _REGISTRIES[key] = RigRegistry(scene)
+    return registry
+
+
+def get_rig(obj, scene=None):
+    """ Rig of an object in a scene (the current scene by default), or None. """
+    return get_rig_registry(scene or bpy.context.scene).get_rig(obj)
+
+
+def get_rig_component(projector, component, context=None):
+    """
+    Screen, dual or spot of a projector's rig, or None. The components are resolved
+    once when the registry is built (and again after a rename or a re-parenting),
+    so this is a dict lookup, not a hierarchy walk.
+    """
+    scene = context.scene if context else bpy.context.scene
+    rig = get_rig_registry(scene).get_rig(projector)
+    return getattr(rig, component) if rig else None
+
+
+def get_selected_projectors(context):
+    """
+    Projecteurs désignés par la sélection, calculés une fois par changement de
+    sélection ou de depsgraph et partagés par tous les draw et poll d'un redraw.
+    Un objet sélectionné désigne un projecteur s'il en est la caméra ou un ancêtre.
+    """
+    global _SELECTION
+    registry = get_rig_registry(context.scene)
+    selected_objects = context.selected_objects
+    active = context.active_object
+    # Clé bon marché : sans handler (scripts), une sélection modifiée change au moins l'une de ces valeurs
+    key = (_GENERATION, registry, active.as_pointer() if active else 0, len(selected_objects),
+           selected_objects[0].as_pointer() if selected_objects else 0,
+           selected_objects[-1].as_pointer() if selected_objects else 0)
+    if _SELECTION is not None and _SELECTION[0] == key:
+        return _SELECTION[1]
+
+    projectors = []
+    seen = set()
+    for obj in selected_objects:
+        projector = registry.get_selected_projector(obj)
+        if projector is not None and projector.as_pointer() not in seen:
+            seen.add(projector.as_pointer())
+            projectors.append(projector)
+    projectors = tuple(projectors)
+    _SELECTION = (key, projectors)
+    return projectors
+
+
+def invalidate_selection():
+    """ Forget the selection snapshot (the selection or the depsgraph changed). """
+    global _GENERATION, _SELECTION
+    _GENERATION += 1
+    _SELECTION = None
+
+
+def get_spot(projector, context=None):
+    """ Spot light of a projector's rig, from the registry (or its hierarchy if it is in another scene). """
+    spot = get_rig_component(projector, 'spot', context)
+    return spot if spot is not None else find_spot(projector)
+
+
+def get_nodes_key(spot):
+    """
+    Clé bon marché qui change quand l'arbre du spot est remplacé, que des nœuds sont
+    ajoutés ou supprimés (grille de pixels attachée ou détachée...), qu'un nœud gardé
+    est remplacé par un autre du même nom ou que les entrées du groupe changent. Seuls
+    les nœuds vivants de l'arbre sont lus, jamais ceux gardés dans le cache.
+    """
+    tree = spot.data.node_tree
+    nodes = tree.nodes
+    key = (spot.as_pointer(), spot.data.as_pointer(), tree.as_pointer(), len(nodes),
+           tuple(node.as_pointer() if node else 0 for node in (nodes.get(name) for name in RIG_NODE_NAMES)))
+    group = nodes.get('Group')
+    if group is None or group.node_tree is None:
+        return key
+    return key + (group.node_tree.as_pointer(), tuple(socket.as_pointer() for socket in group.inputs))
+
+
+def build_rig_nodes(spot):
+    """ Look the nodes of a spot up by name, once. """
+    tree = spot.data.node_tree
+    nodes = tree.nodes
+    group = nodes['Group']
+    return RigNodes(spot, tree, group, group.node_tree, group.inputs['Location'], group.inputs['Scale'],
+                    group.inputs['Checker Color'], nodes['Test Texture'], nodes['Mix.001'], nodes['Image Texture'],
+                    nodes['Emission'], nodes['Light Output'], nodes.get('pixel_grid'))
+
+
+def get_rig_nodes(projector, context=None):
+    """
+    Nodes of a projector's spot that the updates write to. They are looked up by name
+    once, then kept until the spot, its node tree or one of these nodes changes, and
+    forgotten on undo and file load.
+    """
+    spot = get_spot(projector, context)
+    pointer = projector.as_pointer()
+    cached = _RIG_NODES.get(pointer)
+    key = get_nodes_key(spot)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    rig_nodes = build_rig_nodes(spot)
+    _RIG_NODES[pointer] = (key, rig_nodes)
+    return rig_nodes
+
+
+def invalidate_rig_nodes(projector=None):
+    """ Forget the node handles of a projector, or of every rig (the nodes may have been freed). """
+    if projector is None:
+        _RIG_NODES.clear()
+    else:
+        _RIG_NODES.pop(projector.as_pointer(), None)
+
+
+def invalidate_rig_registry():
+    """ Forget every registry and node handle; they are rebuilt on next access. """
+    _REGISTRIES.clear()
+    invalidate_rig_nodes()
+    invalidate_selection()
+
+
+def sync_rig_registry(scene):
+    """ Rebuild the registry of a scene if needed and write its missing tags. """
+    get_rig_registry(scene).write_pending_tags()
+
+
+def refresh_rig_registry(scene):
+    """ Rebuild the registry of a scene now, for operators that add or remove rigs. """
+    _REGISTRIES.pop(scene.as_pointer(), None)
+    # Un rig supprimé peut libérer des pointeurs réutilisés par un nouveau rig
+    invalidate_rig_nodes()
+    invalidate_selection()
+    sync_rig_registry(scene)
+
+
+@persistent
+def on_load_post(*args):
+    invalidate_rig_registry()
+    for scene in bpy.data.scenes:
+        sync_rig_registry(scene)
+
+
+@persistent
+def on_undo_redo_post(*args):
+    # Les objets ont été recréés : les pointeurs enregistrés ne sont plus valides
+    invalidate_rig_registry()
+
+
+@persistent
+def on_depsgraph_update_post(scene, depsgraph=None):
+    # Une sélection modifiée passe aussi par ici (mise à jour de la scène)
+    invalidate_selection()
+    registry = _REGISTRIES.get(scene.as_pointer())
+    if registry is None:
+        sync_rig_registry(scene)
+        return
+    if depsgraph is None:
+        return
+    # Objets ajoutés ou supprimés (même un de chaque) : leurs collections sont mises à jour.
+    # La collection principale de la scène est signalée avec la scène, comme une simple
+    # sélection : le nombre d'objets départage, une fois par mise à jour et non par recherche
+    if depsgraph.id_type_updated('COLLECTION') or (depsgraph.id_type_updated('SCENE') and
+                                                   registry.object_count != len(scene.objects)):
+        refresh_rig_registry(scene)
+        return
+    for update in depsgraph.updates:
+        # Les objets du depsgraph sont des copies évaluées : revenir à l'original
+        if isinstance(update.id, bpy.types.Object) and registry.is_structure_changed(update.id.original):
+            refresh_rig_registry(scene)
+            return
+
+
+HANDLERS = (
+    (bpy.app.handlers.load_post, on_load_post),
+    (bpy.app.handlers.undo_post, on_undo_redo_post),
+    (bpy.app.handlers.redo_post, on_undo_redo_post),
+    (bpy.app.handlers.depsgraph_update_post, on_depsgraph_update_post),
+)
+
+
+def register():
+    for handlers, handler in HANDLERS:
+        if handler not in handlers:
+            handlers.append(handler)
+
+
+def unregister():
+    for handlers, handler in HANDLERS:
+        if handler in handlers:
+            handlers.remove(handler)
+    invalidate_rig_registry()
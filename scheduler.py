@@ -0,0 +1,169 @@
+"""
+Mises à jour regroupées des rigs.
+
+Les callbacks `update=` des propriétés marquent le rig comme à mettre à jour pour
+certains aspects (caméra, mapping des nœuds, position de l'écran, grille de
+pixels...), puis appliquent tout de suite ce qui est en attente : une édition dans
+le panneau laisse un rig complet dans le pas d'annulation poussé juste après.
+
+Le code qui écrit beaucoup de propriétés (opérateurs sur la sélection, création en
+lot) le fait dans un bloc `with batched_updates(context):` : les mises à jour y sont
+seulement planifiées, puis calculées une fois à la fin du bloc, aspect par aspect
+dans l'ordre ASPECTS, chaque rig une seule fois, même si plusieurs propriétés qui
+en dépendent ont changé (throw ratio + shift + résolution...).
+
+Les fonctions qui appliquent un aspect sont déclarées par projector.py
+(register_aspect). Un aspect peut aussi avoir une fonction par lot, appelée une
+fois avec tous les rigs à recalculer (calcul vectorisé puis écriture en bloc).
+Ce qui reste planifié hors d'un bloc (handlers de chargement...) est appliqué par
+un timer bpy.app.timers au tick suivant, et au plus tard avant un pas
+d'annulation, un enregistrement, un rendu ou un changement d'image.
+"""
+import logging
+from contextlib import contextmanager
+
+import bpy
+from bpy.app.handlers import persistent
+
+logging.basicConfig(
+    format='[Projectors Addon]: %(name)s - %(levelname)s - %(message)s')
+log = logging.getLogger(name=__file__)
+
+# Aspects d'un rig, dans l'ordre où ils sont recalculés
+ASPECTS = ('TEXTURE', 'CAMERA', 'MAPPING', 'SCREEN', 'PIXEL_GRID', 'POWER', 'COLOR')
+
+# Aspect -> fonction(proj_settings, context)
+_APPLIERS = {}
+# Aspect -> fonction(liste de proj_settings, context), optionnelle
+_BATCH_APPLIERS = {}
+# Pointeur du projecteur -> (projecteur, aspects à recalculer)
+_PENDING = {}
+# Profondeur des blocs batched_updates en cours
+_BATCH_DEPTH = 0
+
+
+def register_aspect(aspect, function, batch_function=None):
+    """ Declare the function that recomputes an aspect of a rig, and optionally of many rigs at once. """
+    assert aspect in ASPECTS, aspect
+    _APPLIERS[aspect] = function
+    if batch_function is not None:
+        _BATCH_APPLIERS[aspect] = batch_function
+
+
+def mark_dirty(projector, aspects):
+    """ Mark aspects of a rig as dirty, without arming the timer (the caller flushes). """
+    pending = _PENDING.get(projector.as_pointer())
+    if pending is None:
+        _PENDING[projector.as_pointer()] = (projector, set(aspects))
+    else:
+        pending[1].update(aspects)
+
+
+def schedule_update(projector, aspects):
+    """ Mark aspects of a rig as dirty; they are recomputed on the next flush or timer tick. """
+    mark_dirty(projector, aspects)
+    if not bpy.app.timers.is_registered(_on_timer):
+        bpy.app.timers.register(_on_timer, first_interval=0.0)
+
+
+def deferred_update(*aspects):
+    """
+    Property update callback that schedules the given aspects of the edited rig,
+    applied at once unless a batched_updates block is running.
+    """
+    def update(proj_settings, context):
+        if _BATCH_DEPTH:
+            schedule_update(proj_settings.id_data, aspects)
+        else:
+            mark_dirty(proj_settings.id_data, aspects)
+            flush_updates(context)
+    return update
+
+
+@contextmanager
+def batched_updates(context=None):
+    """ Only schedule the rig updates of the block, then apply them all at once at its end. """
+    global _BATCH_DEPTH
+    _BATCH_DEPTH += 1
+    try:
+        yield
+    finally:
+        _BATCH_DEPTH -= 1
+        if not _BATCH_DEPTH:
+            flush_updates(context)
+
+
+def flush_updates(context=None):
+    """ Recompute now every pending aspect, once per rig. Return the number of rigs updated. """
+    context = context or bpy.context
+    updated = 0
+    while _PENDING:
+        # Un recalcul peut en planifier d'autres (ils sont traités dans la même boucle)
+        pending = []
+        for projector, aspects in _PENDING.values():
+            try:
+                pending.append((projector.proj_settings, aspects))
+            except ReferenceError:
+                # Rig supprimé (ou annulé) avant le tick
+                continue
+        _PENDING.clear()
+        # Aspect par aspect : l'ordre ASPECTS est respecté pour chaque rig
+        for aspect in ASPECTS:
+            settings = [proj_settings for proj_settings, aspects in pending if aspect in aspects]
+            if not settings:
+                continue
+            # Seul un rig supprimé pendant le recalcul est ignoré : les autres erreurs remontent
+            batch_function = _BATCH_APPLIERS.get(aspect)
+            if batch_function is not None and len(settings) > 1:
+                try:
+                    batch_function(settings, context)
+                    continue
+                except ReferenceError:
+                    log.debug(f"A rig was removed while updating {aspect.lower()}, updating rigs one by one")
+            for proj_settings in settings:
+                try:
+                    _APPLIERS[aspect](proj_settings, context)
+                except ReferenceError:
+                    log.debug(f"Skipped {aspect.lower()} update of a removed rig")
+        updated += len(pending)
+    return updated
+
+
+def has_pending_updates():
+    return bool(_PENDING)
+
+
+def _on_timer():
+    flush_updates()
+    # Pas de répétition : le timer est réenregistré par schedule_update
+    return None
+
+
+@persistent
+def on_flush_pre(*args):
+    """ Apply the pending updates before an undo step, a save, a render or a frame change. """
+    flush_updates()
+
+
+HANDLERS = (
+    (bpy.app.handlers.undo_pre, on_flush_pre),
+    (bpy.app.handlers.save_pre, on_flush_pre),
+    (bpy.app.handlers.render_init, on_flush_pre),
+    (bpy.app.handlers.render_pre, on_flush_pre),
+    (bpy.app.handlers.frame_change_pre, on_flush_pre),
+)
+
+
+def register():
+    for handlers, handler in HANDLERS:
+        if handler not in handlers:
+            handlers.append(handler)
+
+
+def unregister():
+    for handlers, handler in HANDLERS:
+        if handler in handlers:
+            handlers.remove(handler)
+    if bpy.app.timers.is_registered(_on_timer):
+        bpy.app.timers.unregister(_on_timer)
+    _PENDING.clear()
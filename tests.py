@@ -1,8 +1,13 @@
+import math
 import unittest
 import bpy
 from bpy.app.handlers import persistent
 from bpy.types import Operator
 
+# Les mises à jour des rigs sont différées au tick suivant : les tests les appliquent eux-mêmes
+from Projectors.scheduler import flush_updates
+from Projectors.projector import get_resolution_text
+
 
 class TestAddon(unittest.TestCase):
     def test_existenc_of_operators(self):
@@ -42,53 +47,54 @@ class TestProjector(unittest.TestCase):
 
     def test_update_throw_ratio(self):
         self.c.proj_settings.throw_ratio = 1
+        flush_updates()
         self.assertEqual(self.c.proj_settings.throw_ratio, 1)
         self.assertAlmostEqual(self.c.data.angle, 0.9272952180016123, places=6)
-        # Test if mapping nodes was updated correctly
-        mapping_node = self.s.data.node_tree.nodes['Group'].node_tree.nodes['Mapping.001']
-        if bpy.app.version < (2, 81):
-            self.assertEqual(mapping_node.scale[0], 1)
-            self.assertAlmostEqual(mapping_node.scale[1], 0.5625)
-        else:
-            self.assertEqual(mapping_node.inputs['Scale'].default_value[0], 1)
-            self.assertAlmostEqual(
-                mapping_node.inputs['Scale'].default_value[1], 0.5625)
+        # Test if the inputs of the shared projection group were updated correctly
+        group = self.nodes['Group']
+        self.assertEqual(group.inputs['Scale'].default_value[0], 1)
+        self.assertAlmostEqual(group.inputs['Scale'].default_value[1], 0.5625)
         # Test 2
         self.c.proj_settings.throw_ratio = 0.8
+        flush_updates()
         self.assertAlmostEqual(self.c.proj_settings.throw_ratio, 0.8)
         self.assertAlmostEqual(self.c.data.angle, 1.1171986306871249, places=6)
-        if bpy.app.version < (2, 81):
-            self.assertEqual(mapping_node.scale[0], 1.250)
-            self.assertAlmostEqual(mapping_node.scale[1], 0.703125)
-        else:
-            self.assertEqual(
-                mapping_node.inputs['Scale'].default_value[0], 1.250)
-            self.assertAlmostEqual(
-                mapping_node.inputs['Scale'].default_value[1], 0.703125)
+        self.assertEqual(group.inputs['Scale'].default_value[0], 1.250)
+        self.assertAlmostEqual(group.inputs['Scale'].default_value[1], 0.703125)
+
+    def test_single_edit_is_applied_at_once(self):
+        # Sans attendre le timer : le pas d'annulation et un rendu voient le rig à jour
+        self.c.proj_settings.throw_ratio = 1
+        self.assertAlmostEqual(self.c.data.angle, 0.9272952180016123, places=6)
 
     def test_update_lens_shift(self):
         self.c.proj_settings.throw_ratio = 1
+        flush_updates()
         shift = 10  # 10%
         # x shift
         self.c.proj_settings.h_shift = shift
+        flush_updates()
         self.assertAlmostEqual(self.c.data.shift_x, 0.1)
         # y shift
         self.c.proj_settings.v_shift = shift
+        flush_updates()
         self.assertAlmostEqual(self.c.data.shift_y, 0.1)
-        # Check correct update of mapping node
-        mapping_node = self.s.data.node_tree.nodes['Group'].node_tree.nodes['Mapping.001']
-        if bpy.app.version < (2, 81):
-            self.assertAlmostEqual(mapping_node.translation[0], 0.1)
-            self.assertAlmostEqual(mapping_node.translation[1], 0.1)
-        else:
-            self.assertAlmostEqual(
-                mapping_node.inputs['Location'].default_value[0], 0.1)
-            self.assertAlmostEqual(
-                mapping_node.inputs['Location'].default_value[1], 0.1)
+        # Check correct update of the group inputs
+        group = self.nodes['Group']
+        self.assertAlmostEqual(group.inputs['Location'].default_value[0], 0.1)
+        self.assertAlmostEqual(group.inputs['Location'].default_value[1], 0.1)
+
+    def test_shared_projection_group(self):
+        bpy.ops.projector.create()
+        other = bpy.context.object
+        self.assertEqual(other.children[0].data.node_tree.nodes['Group'].node_tree, self.nodes['Group'].node_tree)
+        bpy.ops.projector.delete()
+        bpy.ops.object.select_all(action='DESELECT')
 
     def test_pixel_gird_on_off(self):
         # Turn Pixel Grid on
         self.c.proj_settings.show_pixel_grid = True
+        flush_updates()
         links_as_node_names = []
         for link in self.s.data.node_tree.links:
             links_as_node_names.append(
@@ -98,6 +104,7 @@ class TestProjector(unittest.TestCase):
             self.assertNotIn(('Emission', 'Light Output'), links_as_node_names)
         # Turn Pixel Grid off
         self.c.proj_settings.show_pixel_grid = False
+        flush_updates()
         links_as_node_names = []
         for link in self.s.data.node_tree.links:
             links_as_node_names.append(
@@ -108,27 +115,56 @@ class TestProjector(unittest.TestCase):
             self.assertIn(('Emission', 'Light Output'), links_as_node_names)
 
     def test_pixel_grid_resolution(self):
-        nodes = self.s.data.node_tree.nodes['pixel_grid'].node_tree.nodes
+        # La grille n'est attachée au spot que lorsqu'elle est affichée
+        self.assertNotIn('pixel_grid', self.nodes)
+        self.c.proj_settings.show_pixel_grid = True
+        flush_updates()
+        pixel_grid = self.nodes['pixel_grid']
         # Check Pixel Grid default resolution
-        width, height = self.c.proj_settings.resolution.split('x')
-        self.assertEqual(
-            nodes['_width'].outputs[0].default_value, float(width))
-        self.assertEqual(
-            nodes['_height'].outputs[0].default_value, float(height))
+        width, height = get_resolution_text(self.c.proj_settings).split('x')
+        self.assertEqual(pixel_grid.inputs['Width'].default_value, float(width))
+        self.assertEqual(pixel_grid.inputs['Height'].default_value, float(height))
         # Check Pixel Grid resolution update
         x, y = 1024, 768
         self.c.proj_settings.resolution = f'{x}x{y}'
-        self.assertEqual(
-            nodes['_width'].outputs[0].default_value, float(x))
-        self.assertEqual(
-            nodes['_height'].outputs[0].default_value, float(y))
-        
-
-
+        flush_updates()
+        self.assertEqual(pixel_grid.inputs['Width'].default_value, float(x))
+        self.assertEqual(pixel_grid.inputs['Height'].default_value, float(y))
+        self.c.proj_settings.show_pixel_grid = False
+        flush_updates()
+        self.assertNotIn('pixel_grid', self.nodes)
+
+    def test_test_images_on_demand(self):
+        # Le damier n'utilise que la petite image du cadre
+        self.assertEqual(self.nodes['Test Texture'].image.name, '_proj.tex.frame')
+        self.assertNotIn('_proj.tex.1920x1200', bpy.data.images)
+        # Grille de couleurs d'une résolution hors liste, libérée quand le rig n'en a plus besoin
+        self.c.proj_settings.projected_texture = 'color_grid_texture'
+        self.c.proj_settings.resolution = 'CUSTOM'
+        self.c.proj_settings.custom_resolution = (5120, 1200)
+        flush_updates()
+        image = self.nodes['Test Texture'].image
+        self.assertEqual(image.name, '_proj.tex.5120x1200')
+        self.assertEqual(tuple(image.size), (5120, 1200))
+        self.assertFalse(image.use_fake_user)
+        self.c.proj_settings.projected_texture = 'checker_texture'
+        flush_updates()
+        self.assertNotIn('_proj.tex.5120x1200', bpy.data.images)
+
+    def test_rig_tags(self):
+        self.assertEqual(self.c['protor_role'], 'PROJECTOR')
+        self.assertEqual(self.s['protor_role'], 'SPOT')
+        self.assertIn('protor_rig', self.c)
+        # Le projecteur reste reconnu après renommage
+        self.c.name = 'Beamer'
+        bpy.ops.object.select_all(action='DESELECT')
+        self.c.select_set(True)
+        self.assertTrue(bpy.ops.projector.delete.poll())
 
     def test_update_power(self):
         new_power = 30
         self.c.proj_settings.power = new_power
+        flush_updates()
         self.assertEqual(self.s.data.energy, new_power)
 
     def tearDown(self):
@@ -137,6 +173,54 @@ class TestProjector(unittest.TestCase):
         bpy.ops.projector.delete()
 
 
+class TestOverlaps(unittest.TestCase):
+    def test_overlaps_without_screen(self):
+        from Projectors.analysis import get_projector_overlaps
+        projectors = []
+        for x in (0.0, 1.0):
+            bpy.ops.projector.create()
+            cam = bpy.context.object
+            cam.location.x = x
+            # Pas d'objet écran : le plan est pris à SCREEN_DISTANCE
+            cam["SCREEN_DISTANCE"] = 5.0
+            projectors.append(cam)
+        bpy.context.view_layer.update()
+        self.assertEqual(bpy.ops.projector.detect_overlaps(), {'FINISHED'})
+        overlaps = get_projector_overlaps(projectors[0])
+        self.assertEqual(len(overlaps), 1)
+        self.assertEqual(overlaps[0][0], projectors[1].name)
+        for cam in projectors:
+            bpy.ops.object.select_all(action='DESELECT')
+            cam.select_set(True)
+            bpy.ops.projector.delete()
+
+
+class TestLayout(unittest.TestCase):
+    def test_create_from_layout(self):
+        import os
+        import tempfile
+        path = os.path.join(tempfile.mkdtemp(), 'stadium.csv')
+        with open(path, 'w') as csvfile:
+            csvfile.write('name,x,y,z,rot_x,throw_ratio,power\n')
+            for i in range(20):
+                csvfile.write(f'P{i},{i},-10,6,80,1.2,50\n')
+        bpy.ops.projector.create_from_layout(filepath=path)
+        collection = bpy.data.collections['stadium']
+        cameras = [obj for obj in collection.objects if obj.type == 'CAMERA']
+        self.assertEqual(len(cameras), 20)
+        self.assertAlmostEqual(cameras[0].proj_settings.throw_ratio, 1.2)
+        self.assertAlmostEqual(cameras[0].data.angle, 2 * math.atan(0.5 / 1.2), places=6)
+        self.assertEqual(cameras[0].children[0]['protor_role'], 'SPOT')
+        # Un seul groupe de projection pour tous les rigs
+        groups = {cam.children[0].data.node_tree.nodes['Group'].node_tree for cam in cameras}
+        self.assertEqual(len(groups), 1)
+        for obj in list(collection.objects):
+            bpy.data.objects.remove(obj, do_unlink=True)
+        bpy.data.collections.remove(collection)
+        # Le registre est invalidé par le handler du depsgraph
+        bpy.context.view_layer.update()
+
+
 def run_tests():
     testLoader = unittest.TestLoader()
     testLoader.testMethodPrefix = "test"
@@ -1,7 +1,15 @@
-from .helper import get_projectors
-from .projector import RESOLUTIONS, Textures, calculate_screen_size, calculate_lux, calculate_pixel_size
+from .analysis import compute_keystone_metrics, get_projector_coverage, get_projector_overlaps
+from .helper import get_projector, get_projectors, get_rig_parent, get_screen_distance
+from .registry import get_rig_component, get_rig_nodes
+from .scheduler import batched_updates
+from .core.photometry import compute_metrics, evaluate_lenses
+from .projector_database import (SpecSheetImport, get_lens_index, get_throw_table, get_user_catalog_path, reload_catalog,
+                                 update_catalog_file)
+from .projector import (CUSTOM_RESOLUTION, RESOLUTIONS, Textures, assign_catalog_entry, compute_projectors_metrics,
+                        get_resolution_text)
 
 import bpy, math
+import numpy as np
 from bpy.types import Panel, PropertyGroup, UIList, Operator
 
 def get_custom_icons():
@@ -39,24 +47,6 @@ class PROJECTOR_OT_toggle_screen(Operator):
     bl_label = 'Toggle Screen Visibility'
     bl_options = {'REGISTER', 'UNDO'}
 
-    def find_screen_object(self, obj):
-        """Trouve récursivement un objet dont le nom contient 'écran' ou 'screen'"""
-        if not obj:
-            return None
-        
-        # Vérifier l'objet actuel
-        name_lower = obj.name.lower()
-        if 'écran' in name_lower or 'ecran' in name_lower or 'screen' in name_lower:
-            return obj
-        
-        # Recherche récursive dans tous les enfants
-        for child in obj.children:
-            result = self.find_screen_object(child)
-            if result:
-                return result
-        
-        return None
-
     def execute(self, context):
         # Agir sur tous les objets parents des projecteurs sélectionnés
         projectors = get_projectors(context, only_selected=True)
@@ -64,24 +54,13 @@ class PROJECTOR_OT_toggle_screen(Operator):
             self.report({'WARNING'}, "No projectors found")
             return {'FINISHED'}
         
-        # Obtenir tous les objets parents
-        parent_objects = []
-        for obj in context.selected_objects:
-            # Chercher l'objet parent qui a déclenché la détection du projecteur
-            projector_child = None
-            for projector in projectors:
-                if projector.parent == obj or obj == projector:
-                    parent_objects.append(obj)
-                    break
-        
-        # Si pas de parents trouvés, utiliser les objets sélectionnés
-        if not parent_objects:
-            parent_objects = context.selected_objects
-        
+        # Écrans des rigs sélectionnés, chacun une seule fois
         screens_toggled = 0
-        for parent_obj in parent_objects:
-            screen_obj = self.find_screen_object(parent_obj)
-            if screen_obj:
+        toggled = set()
+        for projector in projectors:
+            screen_obj = get_rig_component(projector, 'screen', context)
+            if screen_obj and screen_obj.as_pointer() not in toggled:
+                toggled.add(screen_obj.as_pointer())
                 # Toggle "Show in viewports" 
                 current_state = screen_obj.hide_get()
                 screen_obj.hide_set(not current_state)
@@ -100,18 +79,6 @@ class PROJECTOR_OT_toggle_light(Operator):
     bl_label = 'Toggle Light Visibility'
     bl_options = {'REGISTER', 'UNDO'}
 
-    def find_light_object(self, projector):
-        """Trouve la lumière enfant de la caméra projecteur"""
-        if not projector:
-            return None
-        
-        # Recherche dans les enfants directs du projecteur
-        for child in projector.children:
-            if child.type == 'LIGHT':
-                return child
-        
-        return None
-
     def execute(self, context):
         projectors = get_projectors(context, only_selected=True)
         if not projectors:
@@ -120,7 +87,7 @@ class PROJECTOR_OT_toggle_light(Operator):
         
         lights_toggled = 0
         for projector in projectors:
-            light_obj = self.find_light_object(projector)
+            light_obj = get_rig_component(projector, 'spot', context)
             if light_obj:
                 # Toggle visibility in viewport ET disable in renders
                 current_viewport = light_obj.hide_viewport
@@ -139,35 +106,23 @@ class PROJECTOR_OT_toggle_light(Operator):
         return {'FINISHED'}
 
 
-def get_screen_button_text(context):
+def get_screen_button_text(context, projectors=None):
     """Retourne le texte du bouton selon l'état des écrans"""
-    projectors = get_projectors(context, only_selected=True)
+    if projectors is None:
+        projectors = get_projectors(context, only_selected=True)
     if not projectors:
         return "Screen"
     
-    def find_screen_recursive(obj):
-        if not obj:
-            return None
-        name_lower = obj.name.lower()
-        if 'écran' in name_lower or 'screen' in name_lower:
-            return obj
-        for child in obj.children:
-            result = find_screen_recursive(child)
-            if result:
-                return result
-        return None
-    
     # Compter les états des écrans
     screen_on = 0
     screen_off = 0
     
-    for obj in context.selected_objects:
-        screen_obj = find_screen_recursive(obj)
-        if screen_obj:
-            if screen_obj.hide_get():
-                screen_off += 1
-            else:
-                screen_on += 1
+    screens = {get_rig_component(projector, 'screen', context) for projector in projectors} - {None}
+    for screen_obj in screens:
+        if screen_obj.hide_get():
+            screen_off += 1
+        else:
+            screen_on += 1
     
     if screen_on > 0 and screen_off > 0:
         return "Screen Mixed"
@@ -178,9 +133,10 @@ def get_screen_button_text(context):
     else:
         return "Screen"
 
-def get_light_button_text(context):
+def get_light_button_text(context, projectors=None):
     """Retourne le texte du bouton selon l'état des lumières"""
-    projectors = get_projectors(context, only_selected=True)
+    if projectors is None:
+        projectors = get_projectors(context, only_selected=True)
     if not projectors:
         return "Light"
     
@@ -189,13 +145,12 @@ def get_light_button_text(context):
     light_off = 0
     
     for projector in projectors:
-        for child in projector.children:
-            if child.type == 'LIGHT':
-                if child.hide_viewport:
-                    light_off += 1
-                else:
-                    light_on += 1
-                break
+        light_obj = get_rig_component(projector, 'spot', context)
+        if light_obj:
+            if light_obj.hide_viewport:
+                light_off += 1
+            else:
+                light_on += 1
     
     if light_on > 0 and light_off > 0:
         return "Light Mixed"
@@ -232,13 +187,12 @@ class PROJECTOR_OT_set_color(Operator):
         return False
 
     def execute(self, context):
-        from .projector import update_checker_color
         selected_projectors = get_projectors(context, only_selected=True)
         
-        for projector in selected_projectors:
-            if projector.proj_settings.projected_texture == Textures.CHECKER.value:
-                projector.proj_settings.projected_color = self.color
-                update_checker_color(projector.proj_settings, context)
+        with batched_updates(context):
+            for projector in selected_projectors:
+                if projector.proj_settings.projected_texture == Textures.CHECKER.value:
+                    projector.proj_settings.projected_color = self.color
         
         return {'FINISHED'}
 
@@ -257,29 +211,31 @@ class PROJECTOR_OT_reset_values(Operator):
         selected_projectors = get_projectors(context, only_selected=True)
         reset_count = 0
         
-        for projector in selected_projectors:
-            proj_settings = projector.proj_settings
-            parent_obj = context.active_object if context.active_object != projector else projector.parent
-            if not parent_obj:
-                parent_obj = projector
+        # Les rigs sont recalculés une seule fois, à la fin du bloc
+        with batched_updates(context):
+            for projector in selected_projectors:
+                proj_settings = projector.proj_settings
+                parent_obj = context.active_object if context.active_object != projector else projector.parent
+                if not parent_obj:
+                    parent_obj = projector
             
-            # Reset shifts
-            proj_settings.h_shift = 0.0
-            proj_settings.v_shift = 0.0
+                # Reset shifts
+                proj_settings.h_shift = 0.0
+                proj_settings.v_shift = 0.0
             
-            # Reset angles if they exist
-            if "VP_PAN" in parent_obj:
-                parent_obj["VP_PAN"] = 0.0
-            if "VP_TILT" in parent_obj:
-                parent_obj["VP_TILT"] = 0.0
-            if "VP_DOUBLE_PAN" in parent_obj:
-                parent_obj["VP_DOUBLE_PAN"] = 0.0
+                # Reset angles if they exist
+                if "VP_PAN" in parent_obj:
+                    parent_obj["VP_PAN"] = 0.0
+                if "VP_TILT" in parent_obj:
+                    parent_obj["VP_TILT"] = 0.0
+                if "VP_DOUBLE_PAN" in parent_obj:
+                    parent_obj["VP_DOUBLE_PAN"] = 0.0
             
-            # Forcer la mise à jour
-            parent_obj.update_tag()
-            bpy.context.view_layer.update()
+                # Forcer la mise à jour
+                parent_obj.update_tag()
+                bpy.context.view_layer.update()
                 
-            reset_count += 1
+                reset_count += 1
         
         self.report({'INFO'}, f"Reset values for {reset_count} projector(s)")
         return {'FINISHED'}
@@ -310,17 +266,21 @@ class PROJECTOR_OT_export_csv(Operator):
         # CSV headers (normalized in English)
         headers = ['vp_name', 'brand', 'model', 'lens', 'resolution', 'lumens', 
            'orientation', 'throw_ratio', 'pan', 'tilt', 'dpan', 'shift_h', 'shift_v', 
-           'pixel_size', 'lux', 'screen_distance', 'image_width', 'image_height']
+           'pixel_size', 'lux', 'screen_distance', 'image_width', 'image_height', 'overlaps',
+           'real_area', 'pixel_min', 'pixel_mean', 'pixel_max', 'lux_near', 'lux_far']
         
         rows = []
+
+        # Grandeurs calculées pour tous les projecteurs en un seul appel
+        distances, metrics = compute_projectors_metrics(projectors, context)
+        # Géométrie oblique (pan/tilt) à partir des matrices monde
+        _, keystone = compute_keystone_metrics(projectors, context)
         
-        for projector in projectors:
+        for i, projector in enumerate(projectors):
             proj_settings = projector.proj_settings
             
             # Get parent object for custom properties
-            parent_obj = context.active_object if context.active_object != projector else projector.parent
-            if not parent_obj:
-                parent_obj = projector
+            parent_obj = get_rig_parent(projector, context)
             
             # Basic info avec récupération depuis custom properties
             vp_name = projector.name
@@ -339,9 +299,7 @@ class PROJECTOR_OT_export_csv(Operator):
                 except:
                     pass
 
-            resolution = proj_settings.resolution
-
-            print(f"DEBUG CSV - {vp_name}: Brand='{brand}', Model='{model}', Lens='{lens}'")
+            resolution = get_resolution_text(proj_settings)
             
             orientation = proj_settings.orientation
             throw_ratio = proj_settings.throw_ratio
@@ -365,30 +323,31 @@ class PROJECTOR_OT_export_csv(Operator):
             image_width = ""
             image_height = ""
             
-            if screen_distance > 0:
-                try:
-                    # Calculate screen size
-                    screen_w, screen_h = calculate_screen_size(throw_ratio, screen_distance, resolution)
-                    image_width = f"{screen_w:.3f}"
-                    image_height = f"{screen_h:.3f}"
-                    
-                    # Calculate lux
-                    lux_value = calculate_lux(proj_settings.lumens, screen_w, screen_h)
-                    lux = f"{lux_value:.0f}"
-                    
-                    # Calculate pixel size (taking only width for simplicity)
-                    pixel_w_mm, pixel_h_mm = calculate_pixel_size(screen_w, screen_h, resolution)
-                    pixel_size = f"{pixel_w_mm:.2f}"
-                    
-                except Exception as e:
-                    pass
+            if screen_distance > 0 and math.isfinite(metrics.screen_width[i]):
+                image_width = f"{metrics.screen_width[i]:.3f}"
+                image_height = f"{metrics.screen_height[i]:.3f}"
+                lux = f"{metrics.lux[i]:.0f}"
+                # Taille de pixel (largeur seulement pour simplifier)
+                pixel_size = f"{metrics.pixel_width_mm[i]:.2f}"
+
+            # Recouvrements issus de la dernière détection (Detect Overlaps)
+            overlaps = " | ".join(f"{other} {width:.2f}m {percent:.1f}%"
+                                  for other, width, percent in get_projector_overlaps(projector))
+
+            # Image réelle sur le plan d'écran, déformée par le pan/tilt
+            oblique = ["", "", "", "", "", ""]
+            if keystone.valid[i]:
+                oblique = [f"{keystone.area[i]:.2f}", f"{keystone.pixel_min_mm[i]:.2f}",
+                           f"{keystone.pixel_mean_mm[i]:.2f}", f"{keystone.pixel_max_mm[i]:.2f}",
+                           f"{keystone.lux_near[i]:.0f}", f"{keystone.lux_far[i]:.0f}"]
             
             # Create row
             # Create row avec formatage des valeurs numériques
             row = [vp_name, brand, model, lens, resolution, f"{lumens_value:.0f}", orientation, 
                 f"{throw_ratio:.2f}", f"{math.degrees(pan):.0f}", f"{math.degrees(tilt):.0f}", f"{math.degrees(dpan):.0f}",
                 f"{shift_h:.2f}", f"{shift_v:.2f}", f"{float(pixel_size):.2f}" if pixel_size else "", lux,
-                f"{screen_distance:.2f}", f"{float(image_width):.2f}" if image_width else "", f"{float(image_height):.2f}" if image_height else ""]
+                f"{screen_distance:.2f}", f"{float(image_width):.2f}" if image_width else "", f"{float(image_height):.2f}" if image_height else "",
+                overlaps] + oblique
             rows.append(row)
             
             # Special case: if orientation is "Paysage Dual", add duplicate row
@@ -459,9 +418,13 @@ class PROJECTOR_PT_projector_settings(Panel):
         row = layout.row(align=True)
         row.operator('projector.create',
                      icon='ADD', text="New")
+        row.operator('projector.create_from_layout',
+                     icon='IMPORT', text="Layout")
         
-        # Bouton Dupliquer - seulement si exactement un projecteur est sélectionné
+        # Sélection résolue une fois pour tout le panneau (instantané partagé avec les polls)
         selected_projectors = get_projectors(context, only_selected=True)
+
+        # Bouton Dupliquer - seulement si exactement un projecteur est sélectionné
         if len(selected_projectors) == 1:
             row.operator('projector.duplicate',
                          icon='DUPLICATE', text="Duplicate")
@@ -472,12 +435,18 @@ class PROJECTOR_PT_projector_settings(Panel):
         row.operator('projector.delete',
                      text='Remove', icon='REMOVE')
 
+        # Recherche inverse dans le catalogue d'optiques
+        catalog_row = layout.row(align=True)
+        catalog_row.operator('projector.find_lenses', text="Find Lenses", icon='VIEWZOOM')
+        catalog_row.operator('projector.export_throw_table', text="Throw Table", icon='EXPORT')
+        catalog_row.operator('projector.import_spec_sheet', text="", icon='IMPORT')
+        catalog_row.operator('projector.reload_catalog', text="", icon='FILE_REFRESH')
+
         if context.scene.render.engine == 'BLENDER_EEVEE':
             box = layout.box()
             box.label(text='Image Projection only works in Cycles.', icon='ERROR')
             box.operator('projector.switch_to_cycles')
 
-        selected_projectors = get_projectors(context, only_selected=True)
         if len(selected_projectors) >= 1:  # ← CHANGEMENT : >= au lieu de ==
             
             layout.separator()
@@ -494,13 +463,18 @@ class PROJECTOR_PT_projector_settings(Panel):
             buttons_row = info_box.row(align=True)
             buttons_row.operator('projector.focus_selected', text="Focus", icon='ZOOM_SELECTED')
             buttons_row.operator('projector.view_camera', text="POV", icon='VIEW_CAMERA')
-            screen_btn_text = get_screen_button_text(context)
+            screen_btn_text = get_screen_button_text(context, selected_projectors)
             buttons_row.operator('projector.toggle_screen', text=screen_btn_text, icon='HIDE_OFF')
-            light_btn_text = get_light_button_text(context)
+            light_btn_text = get_light_button_text(context, selected_projectors)
             buttons_row.operator('projector.toggle_light', text=light_btn_text, icon='LIGHT')
             # Bouton Export en dessous
             export_row = info_box.row()
             export_row.operator('projector.export_csv', text="Export CSV", icon='EXPORT')
+            # Analyses de la projection
+            analysis_row = info_box.row(align=True)
+            analysis_row.operator('projector.illuminance_heatmap', text="Lux Heatmap", icon='COLOR')
+            analysis_row.operator('projector.detect_overlaps', text="Overlaps", icon='MOD_BOOLEAN')
+            analysis_row.operator('projector.beam_coverage', text="Coverage", icon='LIGHT_SPOT')
             
             # Boutons de couleurs de projection
             # colors_box = info_box.box()
@@ -546,6 +520,7 @@ class PROJECTOR_PT_projector_settings(Panel):
                 # Base de données projecteurs
                 db_col = box.column(align=True)
 
+                db_col.prop(proj_settings, 'catalog_search', text='', icon='VIEWZOOM')
                 db_col.prop(proj_settings, 'projector_brand', text='Brand')
                 db_col.prop(proj_settings, 'projector_model', text='Model') 
                 db_col.prop(proj_settings, 'projector_lens', text='Lens')
@@ -553,9 +528,11 @@ class PROJECTOR_PT_projector_settings(Panel):
                 #box.prop(proj_settings, 'lumens', text='Lumens')
                 box.prop(proj_settings, 'throw_ratio')
                 
-                res_row = box.row()
+                res_row = box.column()
                 res_row.prop(proj_settings, 'resolution',
                              text='Resolution', icon='PRESET')
+                if proj_settings.resolution == CUSTOM_RESOLUTION:
+                    res_row.row(align=True).prop(proj_settings, 'custom_resolution', text='')
                 if proj_settings.projected_texture == Textures.CUSTOM_TEXTURE.value and proj_settings.use_custom_texture_res:
                     res_row.active = False
                     res_row.enabled = False
@@ -598,23 +575,24 @@ class PROJECTOR_PT_projector_settings(Panel):
                 auto_box = layout.box()
 
                 auto_box.label(text="Projection infos")
-                auto_box.operator('projector.auto_adjust_screen_size', 
+                auto_row = auto_box.row(align=True)
+                auto_row.operator('projector.auto_adjust_screen_size', 
                                   text="Adjust Screen Size", 
                                   icon='FULLSCREEN_ENTER')
+                auto_row.operator('projector.fit_to_screen', text="Fit to Screen", icon='PIVOT_BOUNDBOX')
 
                 # Afficher les informations de calcul si disponible
                 if parent_obj and "SCREEN_DISTANCE" in parent_obj:
                     try:
-                        # Calculs de base
-                        screen_w, screen_h = calculate_screen_size(proj_settings.throw_ratio, 
-                                                                  parent_obj["SCREEN_DISTANCE"], 
-                                                                  proj_settings.resolution)
-                        
-                        # Calcul des lux
-                        lux = calculate_lux(proj_settings.lumens, screen_w, screen_h)
-                        
-                        # Calcul de la taille de pixel
-                        pixel_w_mm, pixel_h_mm = calculate_pixel_size(screen_w, screen_h, proj_settings.resolution)
+                        # Calculs de base (taille écran, lux, taille pixel)
+                        metrics = compute_metrics(proj_settings.throw_ratio,
+                                                  parent_obj["SCREEN_DISTANCE"],
+                                                  get_resolution_text(proj_settings),
+                                                  proj_settings.lumens)
+                        screen_w = float(metrics.screen_width)
+                        screen_h = float(metrics.screen_height)
+                        lux = float(metrics.lux)
+                        pixel_w_mm = float(metrics.pixel_width_mm)
                         
                         # Affichage des informations avec espacement réduit
                         info_col = auto_box.column(align=True)  # align=True réduit l'espacement
@@ -632,25 +610,55 @@ class PROJECTOR_PT_projector_settings(Panel):
                             v_min = proj_settings.v_shift_min
                             v_max = proj_settings.v_shift_max
                             
-                            # Construire le texte de la lentille (version courte)
-                            lens_short = lens.split(' ')[0] if ' ' in lens else lens  # Prendre seulement le ratio
+                            # Nom court de la lentille (ratio), lu dans l'index du catalogue
+                            lens_short = get_lens_index().info(lens).short_name
                             
                             info_col.label(text=f"{brand} {model} | {proj_settings.lumens:.0f} ANSI", icon='CAMERA_DATA')
                         
                         info_col.label(text=f"Lens: {lens_short} | H:{h_min:.0f}/{h_max:.0f} V:{v_min:.0f}/{v_max:.0f}", icon='LIGHT_AREA')
                         info_col.label(text=f"Distance: {parent_obj['SCREEN_DISTANCE']:.1f}m, TR: {proj_settings.throw_ratio:.2f}", icon='INFO')
 
-                        # Calcul du ratio d'image
-                        res_w, res_h = proj_settings.resolution.split('x')
-                        image_ratio = float(res_w) / float(res_h)
+                        # Ratio d'image
+                        image_ratio = float(metrics.aspect_ratio)
                         
                         info_col.label(text=f"Screen: {screen_w:.2f}×{screen_h:.2f}m (Ratio: {image_ratio:.1f})", icon='MESH_PLANE')
                         info_col.label(text=f"Lux: {lux:.0f} lx", icon='LIGHT_SUN')
                         info_col.label(text=f"Pixel: {pixel_w_mm:.2f}mm", icon='GRID')
+
+                        # Image réelle avec pan/tilt : keystone, pixels et lux extrêmes
+                        _, keystone = compute_keystone_metrics([projector], context)
+                        if keystone.valid[0] and not np.isclose(keystone.pixel_min_mm[0], keystone.pixel_max_mm[0],
+                                                                rtol=1e-3):
+                            info_col.label(text=f"Oblique: {keystone.area[0]:.2f}m², "
+                                                f"pixel {keystone.pixel_min_mm[0]:.2f}-{keystone.pixel_max_mm[0]:.2f}mm",
+                                           icon='MOD_LATTICE')
+                            info_col.label(text=f"Lux near/far: {keystone.lux_near[0]:.0f}/{keystone.lux_far[0]:.0f} lx",
+                                           icon='LIGHT_SUN')
                         
                     except Exception as e:
                         # Fallback en cas d'erreur
                         auto_box.label(text="Calculation error", icon='ERROR')
+
+                # Zones de blend avec les autres projecteurs (dernière détection)
+                overlaps = get_projector_overlaps(projector)
+                if overlaps:
+                    blend_col = auto_box.column(align=True)
+                    blend_col.scale_y = 0.8
+                    for other, width, percent in overlaps:
+                        blend_col.label(text=f"Blend {other}: {width:.2f}m ({percent:.1f}%)", icon='MOD_BOOLEAN')
+
+                # Couverture du faisceau (dernière analyse)
+                coverage = get_projector_coverage(projector)
+                if coverage:
+                    coverage_col = auto_box.column(align=True)
+                    coverage_col.scale_y = 0.8
+                    if coverage['shadowed'] is not None:
+                        coverage_col.label(text=f"Shadowed: {coverage['shadowed']:.0%} of {coverage['screen']}",
+                                           icon='ERROR' if coverage['shadowed'] > 0 else 'CHECKMARK')
+                    if coverage['occluders']:
+                        coverage_col.label(text=f"Blocked by: {', '.join(coverage['occluders'][:3])}")
+                    for name, fraction in coverage['surfaces'][:3]:
+                        coverage_col.label(text=f"Hits {name}: {fraction:.0%}", icon='LIGHT_SPOT')
                 layout.prop(proj_settings,
                             'projected_texture', text='Project')
                 # Pixel Grid TO DELETE ??
@@ -660,17 +668,40 @@ class PROJECTOR_PT_projector_settings(Panel):
                 if proj_settings.projected_texture == Textures.CUSTOM_TEXTURE.value:
                     box = layout.box()
                     box.prop(proj_settings, 'use_custom_texture_res')
-                    node = get_projectors(context, only_selected=True)[
-                        0].children[0].data.node_tree.nodes['Image Texture']
+                    node = get_rig_nodes(projector, context).custom_image
                     box.template_image(node, 'image', node.image_user, compact=False)
             
-            # === MESSAGE POUR SÉLECTION MULTIPLE ===
+            # === ÉDITION GROUPÉE POUR SÉLECTION MULTIPLE ===
             else:
-                layout.separator()
-                msg_box = layout.box()
-                msg_box.label(text=f"{len(selected_projectors)} projectors selected", icon='INFO')
-                msg_box.label(text="• Buttons affect all projectors")
-                msg_box.label(text="• Select one projector to edit properties")
+                draw_batch_settings(layout, context, selected_projectors)
+
+
+def draw_batch_settings(layout, context, projectors):
+    """ Checked values of the batch settings, applied to every selected projector at once. """
+    batch = context.scene.proj_batch
+    layout.label(text=f'Batch Settings ({len(projectors)} projectors):')
+    box = layout.box()
+    box.operator('projector.batch_pick', text="Pick from Active", icon='EYEDROPPER')
+
+    def checked_row(use_prop, props):
+        col = box.column(align=True)
+        col.prop(batch, use_prop)
+        sub = col.column(align=True)
+        sub.active = getattr(batch, use_prop)
+        for prop in props:
+            sub.prop(batch, prop)
+
+    checked_row('use_lens', ('projector_brand', 'projector_model', 'projector_lens'))
+    checked_row('use_throw_ratio', ('throw_ratio',))
+    checked_row('use_resolution', ('resolution', 'custom_resolution') if batch.resolution == CUSTOM_RESOLUTION
+                else ('resolution',))
+    checked_row('use_h_shift', ('h_shift',))
+    checked_row('use_v_shift', ('v_shift',))
+    checked_row('use_power', ('power',))
+
+    apply_row = box.row()
+    apply_row.scale_y = 1.3
+    apply_row.operator('projector.batch_apply', text=f"Apply to {len(projectors)} Projectors", icon='CHECKMARK')
 
 class PROJECTOR_PT_projected_color(Panel):
     bl_label = "Projected Color"
@@ -699,6 +730,327 @@ class PROJECTOR_PT_projected_color(Panel):
                      icon='MODIFIER_ON', text='Random Color')
 
 
+# Tableaux what-if déjà calculés, par (portée, marque, modèle, réglages du rig)
+_LENS_WHAT_IF_CACHE = {}
+
+
+def get_lens_what_if(scope, brand, model, screen_distance, resolution, throw_ratio, h_shift, v_shift):
+    """
+    Évalue toutes les optiques du modèle (ou de tout le catalogue) pour le rig, en un
+    seul appel vectorisé. Le résultat est mis en cache pour les redessins suivants.
+    Retourne une liste de dicts triée : optiques compatibles d'abord, puis par lux.
+    """
+    key = (scope, brand, model, screen_distance, resolution, throw_ratio, h_shift, v_shift)
+    rows = _LENS_WHAT_IF_CACHE.get(key)
+    if rows is not None:
+        return rows
+
+    index = get_lens_index()
+    rows_index = index.select(brand, model) if scope == 'MODEL' else np.arange(len(index))
+
+    evaluation = evaluate_lenses(index.throw_min[rows_index], index.throw_max[rows_index],
+                                 index.ansi_lumens[rows_index],
+                                 index.h_shift_min[rows_index], index.h_shift_max[rows_index],
+                                 index.v_shift_min[rows_index], index.v_shift_max[rows_index],
+                                 screen_distance, resolution, throw_ratio, h_shift, v_shift)
+    fits = evaluation.in_zoom_range & evaluation.h_shift_ok & evaluation.v_shift_ok
+    rows = []
+    for k, i in enumerate(rows_index):
+        rows.append({
+            'brand': index.brand[i],
+            'model': index.model[i],
+            'lens': index.lens[i],
+            'lens_short': index.short_name[i],
+            'throw_ratio': float(evaluation.throw_ratio[k]),
+            'in_zoom_range': bool(evaluation.in_zoom_range[k]),
+            'width': float(evaluation.screen_width[k]),
+            'height': float(evaluation.screen_height[k]),
+            'lux': float(evaluation.lux[k]),
+            'pixel': float(evaluation.pixel_width_mm[k]),
+            'shift_ok': bool(evaluation.h_shift_ok[k] and evaluation.v_shift_ok[k]),
+            'fits': bool(fits[k]),
+        })
+    rows.sort(key=lambda row: (not row['fits'], -row['lux']))
+
+    if len(_LENS_WHAT_IF_CACHE) > 64:
+        _LENS_WHAT_IF_CACHE.clear()
+    _LENS_WHAT_IF_CACHE[key] = rows
+    return rows
+
+
+class PROJECTOR_OT_apply_lens(Operator):
+    """Use this lens on the selected projector"""
+    bl_idname = 'projector.apply_lens'
+    bl_label = 'Apply Lens'
+    bl_options = {'REGISTER', 'UNDO'}
+
+    brand: bpy.props.StringProperty()
+    model: bpy.props.StringProperty()
+    lens: bpy.props.StringProperty()
+    throw_ratio: bpy.props.FloatProperty()
+
+    @classmethod
+    def poll(cls, context):
+        return get_projector(context) is not None
+
+    def execute(self, context):
+        proj_settings = get_projector(context).proj_settings
+        with batched_updates(context):
+            try:
+                # Les trois valeurs en une fois, le callback de l'optique une seule fois
+                assign_catalog_entry(proj_settings, context, self.brand, self.model, self.lens)
+            except ValueError as e:
+                self.report({'ERROR'}, f"Lens not available: {str(e)}")
+                return {'CANCELLED'}
+            # Ramener le throw ratio dans la plage de zoom de l'optique
+            if self.throw_ratio > 0 and abs(proj_settings.throw_ratio - self.throw_ratio) > 1e-6:
+                proj_settings.throw_ratio = self.throw_ratio
+        return {'FINISHED'}
+
+
+class PROJECTOR_PT_lens_what_if(Panel):
+    bl_label = "Lens What-If"
+    bl_parent_id = "OBJECT_PT_projector_n_panel"
+    bl_options = {'DEFAULT_CLOSED'}
+    bl_space_type = 'VIEW_3D'
+    bl_region_type = 'UI'
+
+    @classmethod
+    def poll(cls, context):
+        """ Only show if exactly one projector is selected. """
+        return len(get_projectors(context, only_selected=True)) == 1
+
+    def draw(self, context):
+        projector = get_projectors(context, only_selected=True)[0]
+        proj_settings = projector.proj_settings
+        layout = self.layout
+        layout.prop(context.scene, 'projector_lens_scope', expand=True)
+
+        screen_distance = get_screen_distance(projector, get_rig_parent(projector, context))
+        if not screen_distance:
+            layout.label(text="No SCREEN_DISTANCE on this projector", icon='INFO')
+            return
+
+        scope = context.scene.projector_lens_scope
+        if scope == 'MODEL' and proj_settings.projector_model in ('', 'NONE'):
+            layout.label(text="Select a brand and a model first", icon='INFO')
+            return
+
+        rows = get_lens_what_if(scope, proj_settings.projector_brand, proj_settings.projector_model,
+                                screen_distance, get_resolution_text(proj_settings), proj_settings.throw_ratio,
+                                proj_settings.h_shift, proj_settings.v_shift)
+
+        col = layout.column(align=True)
+        col.scale_y = 0.8
+        header = col.row(align=True)
+        for title in ("Lens", "TR", "Image (m)", "Lux", "Pixel"):
+            header.label(text=title)
+        for row in rows:
+            lens_short = row['lens_short']
+            if scope == 'CATALOG':
+                lens_short = f"{row['model']} {lens_short}"
+            line = col.row(align=True)
+            line.active = row['fits']
+            line.label(text=lens_short, icon='CHECKMARK' if row['fits'] else 'X')
+            line.label(text=f"{row['throw_ratio']:.2f}" + ("" if row['in_zoom_range'] else "*"))
+            line.label(text=f"{row['width']:.2f}×{row['height']:.2f}")
+            line.label(text=f"{row['lux']:.0f}")
+            line.label(text=f"{row['pixel']:.2f}mm" + ("" if row['shift_ok'] else " ⚠"))
+            op = line.operator('projector.apply_lens', text='', icon='IMPORT')
+            op.brand = row['brand']
+            op.model = row['model']
+            op.lens = row['lens']
+            op.throw_ratio = row['throw_ratio']
+        layout.label(text="* throw clamped to the zoom range, ⚠ shift out of range")
+
+
+class PROJECTOR_OT_export_throw_table(Operator):
+    """Export the throw / distance table of the whole lens catalog"""
+    bl_idname = 'projector.export_throw_table'
+    bl_label = 'Export Throw Table'
+
+    filepath: bpy.props.StringProperty(subtype="FILE_PATH")
+    filename_ext = ".csv"
+
+    filter_glob: bpy.props.StringProperty(
+        default="*.csv;*.json",
+        options={'HIDDEN'},
+        maxlen=255,
+    )
+    distance_min: bpy.props.FloatProperty(name="Min Distance", default=1.0, min=0.1, unit='LENGTH')
+    distance_max: bpy.props.FloatProperty(name="Max Distance", default=30.0, min=0.1, unit='LENGTH')
+    step: bpy.props.FloatProperty(name="Step", default=0.5, min=0.01, unit='LENGTH')
+    resolution: bpy.props.EnumProperty(name="Resolution", items=RESOLUTIONS, default='1920x1200')
+
+    def execute(self, context):
+        import os
+
+        if self.distance_max < self.distance_min:
+            self.report({'ERROR'}, "Max distance must be greater than min distance")
+            return {'CANCELLED'}
+
+        table = get_throw_table(self.distance_min, self.distance_max, self.step, self.resolution)
+        try:
+            if self.filepath.lower().endswith('.json'):
+                count = table.write_json(self.filepath)
+            else:
+                count = table.write_csv(self.filepath)
+        except Exception as e:
+            self.report({'ERROR'}, f"Export failed: {str(e)}")
+            return {'CANCELLED'}
+
+        self.report({'INFO'}, f"Exported {count} entries to {os.path.basename(self.filepath)}")
+        return {'FINISHED'}
+
+    def invoke(self, context, event):
+        import os
+
+        folder = os.path.dirname(bpy.data.filepath) if bpy.data.filepath else \
+            os.path.join(os.path.expanduser("~"), "Downloads")
+        self.filepath = os.path.join(folder, "throw_table.csv")
+        context.window_manager.fileselect_add(self)
+        return {'RUNNING_MODAL'}
+
+
+class PROJECTOR_OT_find_lenses(Operator):
+    """Find every lens of the catalog giving an image width at a distance"""
+    bl_idname = 'projector.find_lenses'
+    bl_label = 'Find Lenses'
+
+    image_width: bpy.props.FloatProperty(name="Image Width", default=6.0, min=0.1, unit='LENGTH')
+    distance: bpy.props.FloatProperty(name="Distance", default=9.0, min=0.1, unit='LENGTH')
+    resolution: bpy.props.EnumProperty(name="Resolution", items=RESOLUTIONS, default='1920x1200')
+
+    def get_matches(self):
+        """ Rows of the lens index matching the request (cached table, instant lookup). """
+        return get_throw_table(resolution=self.resolution).lookup(self.image_width, self.distance)
+
+    def invoke(self, context, event):
+        projector = get_projector(context)
+        # Le dialogue ne propose que les résolutions de la liste
+        if projector and projector.proj_settings.resolution != CUSTOM_RESOLUTION:
+            self.resolution = projector.proj_settings.resolution
+        return context.window_manager.invoke_props_dialog(self, width=520)
+
+    def draw(self, context):
+        layout = self.layout
+        row = layout.row(align=True)
+        row.prop(self, 'image_width')
+        row.prop(self, 'distance')
+        layout.prop(self, 'resolution')
+
+        index = get_lens_index()
+        rows = self.get_matches()
+        throw_ratio = self.distance / self.image_width
+        metrics = compute_metrics(throw_ratio, self.distance, self.resolution, index.ansi_lumens[rows])
+        layout.label(text=f"Throw ratio {throw_ratio:.2f}: {len(rows)} lens(es)", icon='VIEWZOOM')
+
+        col = layout.column(align=True)
+        col.scale_y = 0.8
+        for k in np.argsort(-metrics.lux, kind='stable')[:40]:
+            i = rows[k]
+            line = col.row(align=True)
+            line.label(text=f"{index.brand[i]} {index.model[i]}")
+            line.label(text=index.short_name[i])
+            line.label(text=f"{metrics.lux[k]:.0f} lx")
+            line.label(text=f"{metrics.pixel_width_mm[k]:.2f}mm")
+
+    def execute(self, context):
+        self.report({'INFO'}, f"{len(self.get_matches())} lens(es) give {self.image_width:.2f}m "
+                              f"at {self.distance:.2f}m")
+        return {'FINISHED'}
+
+
+class PROJECTOR_OT_reload_catalog(Operator):
+    """Reload the projector catalog and the user catalog file"""
+    bl_idname = 'projector.reload_catalog'
+    bl_label = 'Reload Catalog'
+
+    def execute(self, context):
+        reload_catalog()
+        _LENS_WHAT_IF_CACHE.clear()
+        try:
+            count = len(get_lens_index())
+        except (OSError, ValueError) as e:
+            self.report({'ERROR'}, f"Catalog could not be loaded: {str(e)}")
+            return {'CANCELLED'}
+        self.report({'INFO'}, f"Catalog reloaded: {count} lenses (user file: {get_user_catalog_path()})")
+        return {'FINISHED'}
+
+
+class PROJECTOR_OT_import_spec_sheet(Operator):
+    """Import a manufacturer spec sheet (CSV or XLSX) into the user catalog"""
+    bl_idname = 'projector.import_spec_sheet'
+    bl_label = 'Import Spec Sheet'
+    bl_description = ('Validate a manufacturer spec sheet and add its lenses to the user catalog. '
+                      'Issues are reported with their spreadsheet row')
+
+    # Nombre de problèmes affichés dans les rapports (tous sont écrits dans le fichier _issues.csv)
+    REPORTED_ISSUES = 10
+
+    filepath: bpy.props.StringProperty(subtype="FILE_PATH")
+    filter_glob: bpy.props.StringProperty(
+        default="*.csv;*.xlsx",
+        options={'HIDDEN'},
+        maxlen=255,
+    )
+    use_shift_scale: bpy.props.BoolProperty(
+        name="Scale Shifts",
+        description="Store a shift coefficient for the brands of the sheet (otherwise the catalog one is kept)",
+        default=False,
+    )
+    shift_scale: bpy.props.FloatProperty(
+        name="Shift Coefficient",
+        description="Coefficient applied to the constructor shift ranges of the brands of the sheet",
+        default=1.0, min=0.01, max=10.0,
+    )
+    skip_invalid: bpy.props.BoolProperty(
+        name="Skip Invalid Rows",
+        description="Import the valid rows even if some rows have errors",
+        default=False,
+    )
+
+    def execute(self, context):
+        import os
+
+        try:
+            sheet = SpecSheetImport.from_file(self.filepath, self.shift_scale if self.use_shift_scale else None)
+        except (OSError, ValueError, KeyError) as e:
+            self.report({'ERROR'}, f"Spec sheet could not be read: {str(e)}")
+            return {'CANCELLED'}
+
+        for issue in sheet.issues[:self.REPORTED_ISSUES]:
+            self.report({issue.severity}, f"Row {issue.row}: {issue.message}")
+        if sheet.issues:
+            issues_path = os.path.splitext(self.filepath)[0] + '_issues.csv'
+            sheet.write_issues_csv(issues_path)
+            self.report({'INFO'}, f"{len(sheet.issues)} issue(s) written to {os.path.basename(issues_path)}")
+
+        if sheet.errors and not self.skip_invalid:
+            self.report({'ERROR'}, f"{len(sheet.errors)} invalid row(s), nothing imported")
+            return {'CANCELLED'}
+        if not sheet.entry_count:
+            self.report({'WARNING'}, "No valid row to import")
+            return {'CANCELLED'}
+
+        user_catalog = get_user_catalog_path()
+        try:
+            os.makedirs(os.path.dirname(user_catalog), exist_ok=True)
+            update_catalog_file(user_catalog, sheet.brands, sheet.shift_scales)
+        except (OSError, ValueError) as e:
+            self.report({'ERROR'}, f"User catalog could not be written: {str(e)}")
+            return {'CANCELLED'}
+        reload_catalog()
+        _LENS_WHAT_IF_CACHE.clear()
+
+        self.report({'INFO'}, f"Imported {sheet.entry_count} of {sheet.row_count} rows into {user_catalog}")
+        return {'FINISHED'}
+
+    def invoke(self, context, event):
+        context.window_manager.fileselect_add(self)
+        return {'RUNNING_MODAL'}
+
+
 def append_to_add_menu(self, context):
     self.layout.operator('projector.create',
                          text='Projector', icon='CAMERA_DATA')
@@ -714,6 +1066,20 @@ def register():
     bpy.utils.register_class(PROJECTOR_OT_export_csv)
     bpy.utils.register_class(PROJECTOR_OT_set_color)
     bpy.utils.register_class(PROJECTOR_OT_reset_values)
+    bpy.utils.register_class(PROJECTOR_OT_apply_lens)
+    bpy.utils.register_class(PROJECTOR_PT_lens_what_if)
+    bpy.utils.register_class(PROJECTOR_OT_export_throw_table)
+    bpy.utils.register_class(PROJECTOR_OT_find_lenses)
+    bpy.utils.register_class(PROJECTOR_OT_reload_catalog)
+    bpy.utils.register_class(PROJECTOR_OT_import_spec_sheet)
+    bpy.types.Scene.projector_lens_scope = bpy.props.EnumProperty(
+        name="Lenses",
+        description="Lenses compared in the what-if table",
+        items=[
+            ('MODEL', 'This Model', 'Every lens of the current brand/model'),
+            ('CATALOG', 'Whole Catalog', 'Every lens of every projector in the catalog'),
+        ],
+        default='MODEL')
     # Register create  in the blender add menu.
     bpy.types.VIEW3D_MT_light_add.append(append_to_add_menu)
 
@@ -721,6 +1087,13 @@ def register():
 def unregister():
     # Register create in the blender add menu.
     bpy.types.VIEW3D_MT_light_add.remove(append_to_add_menu)
+    del bpy.types.Scene.projector_lens_scope
+    bpy.utils.unregister_class(PROJECTOR_OT_import_spec_sheet)
+    bpy.utils.unregister_class(PROJECTOR_OT_reload_catalog)
+    bpy.utils.unregister_class(PROJECTOR_OT_find_lenses)
+    bpy.utils.unregister_class(PROJECTOR_OT_export_throw_table)
+    bpy.utils.unregister_class(PROJECTOR_PT_lens_what_if)
+    bpy.utils.unregister_class(PROJECTOR_OT_apply_lens)
     bpy.utils.register_class(PROJECTOR_OT_set_color)
     bpy.utils.unregister_class(PROJECTOR_OT_reset_values)
     bpy.utils.unregister_class(PROJECTOR_OT_export_csv)
@@ -0,0 +1,75 @@
+"""
+Benchmarks du cœur de calcul, sans Blender : `python unit_tests/bench_core.py`
+(ou `python cmd.py bench`). Affiche le meilleur temps de chaque cas.
+"""
+import os
+import sys
+import timeit
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.catalog import get_catalog_search, get_throw_table, load_catalog
+from core.footprint import find_overlaps, footprint_quads, keystone_metrics
+from core.lens_index import LensIndex
+from core.photometry import compute_metrics, illuminance_at_points
+from core.search import CatalogSearch
+from core.throw_table import ThrowTable, distance_grid
+
+
+def projector_row(count, spacing=3.0, distance=10.0):
+    """ `count` projecteurs alignés selon X, visant -Z, écran commun à `distance`. """
+    matrices = np.tile(np.eye(4), (count, 1, 1))
+    matrices[:, 0, 3] = np.arange(count) * spacing
+    return matrices, np.array((0.0, 0.0, -distance)), np.array((0.0, 0.0, 1.0))
+
+
+def screen_points(count, width, height, distance=10.0):
+    x, y = np.meshgrid(np.linspace(0, width, int(np.sqrt(count * width / height))),
+                       np.linspace(-height / 2, height / 2, int(np.sqrt(count * height / width))))
+    points = np.column_stack((x.ravel(), y.ravel(), np.full(x.size, -distance)))
+    return points, np.tile((0.0, 0.0, 1.0), (len(points), 1))
+
+
+def get_cases():
+    rng = np.random.default_rng(0)
+    throw_ratios = rng.uniform(0.5, 3.0, 10000)
+    distances = rng.uniform(2.0, 30.0, 10000)
+    matrices, plane_origin, plane_normal = projector_row(200)
+    points, normals = screen_points(10000, 600, 4)
+    table = get_throw_table(1.0, 30.0, 0.5, '1920x1200')
+    brands = load_catalog()
+
+    def overlaps():
+        quads, valid = footprint_quads(matrices, 2.5, 16 / 10, 0, 0, plane_origin, plane_normal)
+        return find_overlaps(quads, valid, plane_origin, plane_normal)
+
+    return [
+        ('compute_metrics, 10k projectors',
+         lambda: compute_metrics(throw_ratios, distances, '1920x1200', 10000)),
+        ('keystone_metrics, 10k projectors',
+         lambda: keystone_metrics(np.tile(np.eye(4), (10000, 1, 1)), throw_ratios, '1920x1200', 10000,
+                                  0, 0, (0, 0, -10), (0, 0, 1))),
+        ('illuminance_at_points, 200 projectors x 10k points',
+         lambda: illuminance_at_points(points, normals, matrices, 2.5, 16 / 10, 10000)),
+        ('footprints + overlaps, 200 projectors', overlaps),
+        ('Catalog file load', load_catalog),
+        ('LensIndex build, whole catalog', lambda: LensIndex(brands, {'Barco': 0.5})),
+        ('ThrowTable build, whole catalog x 59 distances',
+         lambda: ThrowTable(table.index, distance_grid(1.0, 30.0, 0.5))),
+        ('CatalogSearch build, whole catalog', lambda: CatalogSearch(table.index)),
+        ('CatalogSearch.search x 100',
+         lambda: [get_catalog_search().search(query) for query in ('R9802300', '0.8 UST 4K', 'g62 w14 1.5') * 33]),
+        ('ThrowTable.lookup x 100',
+         lambda: [table.lookup(width, 9.0) for width in np.linspace(2, 12, 100)]),
+    ]
+
+
+def main(number=3):
+    for name, function in get_cases():
+        best = min(timeit.repeat(function, number=1, repeat=number))
+        print(f'{name:<55} {best * 1000:8.2f} ms')
+
+
+if __name__ == '__main__':
+    main()
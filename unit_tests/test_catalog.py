@@ -0,0 +1,249 @@
+import os
+import sys
+import unittest
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core import catalog
+from core.catalog import (get_brand_names, get_catalog_version, get_lens_data, get_lens_index, get_lens_names,
+                          get_model_names, get_shift_scale, get_throw_table, load_catalog, merge_catalogs,
+                          read_catalog_document, read_catalog_file, set_user_catalog_paths, update_catalog_file)
+from core.lens_index import LensIndex, parse_lens_name
+from core.throw_table import distance_grid
+
+
+CATALOG = {
+    'Brand': {
+        'P1': {
+            '0.65-0.75:1 G LENS (R9802300)': {'ansi_lumens': 9000, 'v_shift_min': -120, 'v_shift_max': 120,
+                                              'h_shift_min': -40, 'h_shift_max': 40},
+            '0.36:1 G LENS UST (R9801785)': {'ansi_lumens': 9000, 'v_shift_min': 182, 'v_shift_max': 186,
+                                             'h_shift_min': 0, 'h_shift_max': 0},
+        },
+        'P2': {
+            '1.22-1.53:1 G LENS (R9801784)': {'ansi_lumens': 12000, 'v_shift_min': -100, 'v_shift_max': 100,
+                                              'h_shift_min': -30, 'h_shift_max': 30},
+        },
+    },
+}
+
+
+class TestParseLensName(unittest.TestCase):
+    def test_zoom_lens(self):
+        info = parse_lens_name('0.37-0.4:1 G LENS UST 90° (R9801830)')
+        self.assertEqual((info.throw_min, info.throw_max), (0.37, 0.4))
+        self.assertTrue(info.is_zoom)
+        self.assertTrue(info.is_ust)
+        self.assertTrue(info.is_mirror_90)
+        self.assertEqual(info.part_number, 'R9801830')
+        self.assertEqual(info.short_name, '0.37-0.4:1')
+
+    def test_fixed_lens(self):
+        info = parse_lens_name('0.36:1 G LENS UST (R9801785)')
+        self.assertEqual((info.throw_min, info.throw_max), (0.36, 0.36))
+        self.assertFalse(info.is_zoom)
+        self.assertFalse(info.is_mirror_90)
+
+    def test_unknown_name(self):
+        info = parse_lens_name('Custom')
+        self.assertTrue(np.isnan(info.throw_min))
+        self.assertEqual(info.part_number, '')
+
+
+class TestLensIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = LensIndex(CATALOG, {'Brand': 0.5})
+
+    def test_rows(self):
+        self.assertEqual(len(self.index), 3)
+        row = self.index.find('Brand', 'P1', '0.65-0.75:1 G LENS (R9802300)')
+        self.assertEqual(row, 0)
+        self.assertEqual(self.index.h_shift_max[row], 20)
+        self.assertIsNone(self.index.find('Brand', 'P3', 'x'))
+
+    def test_select(self):
+        np.testing.assert_array_equal(self.index.select(model='P1'), [0, 1])
+        np.testing.assert_array_equal(self.index.select('Brand', 'P2'), [2])
+
+    def test_normalized_tables(self):
+        self.assertEqual(self.index.model_slice('Brand', 'P1'), slice(0, 2))
+        self.assertIsNone(self.index.model_slice('Brand', 'P3'))
+        self.assertEqual(self.index.models('Brand'), ['P1', 'P2'])
+        self.assertEqual(self.index.lenses('Brand', 'P2'), ['1.22-1.53:1 G LENS (R9801784)'])
+        self.assertEqual(self.index.lenses('Brand', 'P3'), [])
+        np.testing.assert_array_equal(self.index.raw_h_shift_max[:1], [40])
+
+    def test_shared_lens_is_stored_once(self):
+        index = LensIndex({'Brand': {
+            'P1': {'1.0:1 LENS': {'ansi_lumens': 1000, 'h_shift_min': -10, 'h_shift_max': 10,
+                                  'v_shift_min': -20, 'v_shift_max': 20}},
+            'P2': {'1.0:1 LENS': {'ansi_lumens': 2000, 'h_shift_min': -30, 'h_shift_max': 30,
+                                  'v_shift_min': -40, 'v_shift_max': 40}},
+        }})
+        self.assertEqual(len(index), 2)
+        self.assertEqual(len(index.lens_names), 1)
+        np.testing.assert_array_equal(index.ansi_lumens, [1000, 2000])
+        self.assertEqual(index.find('Brand', 'P2', '1.0:1 LENS'), 1)
+
+    def test_in_throw_range(self):
+        np.testing.assert_array_equal(self.index.in_throw_range(0.7), [0])
+        np.testing.assert_array_equal(self.index.in_throw_range(0.3, 1.3), [0, 1, 2])
+        np.testing.assert_array_equal(self.index.in_throw_range(0.3, 1.3, rows=[1, 2]), [1, 2])
+        self.assertEqual(len(self.index.in_throw_range(2.0)), 0)
+
+
+class TestCatalog(unittest.TestCase):
+    def test_accessors(self):
+        brand = get_brand_names()[0]
+        model = get_model_names(brand)[0]
+        lens = get_lens_names(brand, model)[0]
+        self.assertEqual(get_lens_data(brand, model, lens), load_catalog()[brand][model][lens])
+        self.assertEqual(get_model_names('Unknown'), [])
+        self.assertIsNone(get_lens_data(brand, 'Unknown', lens))
+
+    def test_lens_index_is_cached(self):
+        index = get_lens_index()
+        self.assertIs(index, get_lens_index())
+        self.assertEqual(len(index), sum(len(lenses) for models in load_catalog().values()
+                                         for lenses in models.values()))
+        brand = get_brand_names()[0]
+        model = get_model_names(brand)[0]
+        lens = get_lens_names(brand, model)[0]
+        row = index.find(brand, model, lens)
+        self.assertAlmostEqual(index.v_shift_max[row],
+                               get_lens_data(brand, model, lens)['v_shift_max'] * get_shift_scale(brand))
+
+
+class TestUserCatalog(unittest.TestCase):
+    def setUp(self):
+        import tempfile
+        self.tempdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        set_user_catalog_paths([])
+        self.tempdir.cleanup()
+
+    def write(self, name, brands):
+        import json
+        path = os.path.join(self.tempdir.name, name)
+        with open(path, 'w', encoding='utf-8') as catalog_file:
+            json.dump({'format': 1, 'brands': brands}, catalog_file)
+        return path
+
+    def test_bundled_catalog(self):
+        brands, shift_scales = read_catalog_document(catalog.CATALOG_FILE)
+        self.assertIn('Barco', brands)
+        self.assertEqual(shift_scales, {'Barco': 0.5})
+
+    def test_shift_scales_per_brand(self):
+        lens = {'ansi_lumens': 20000, 'h_shift_min': -10, 'h_shift_max': 10, 'v_shift_min': -50, 'v_shift_max': 50}
+        path = os.path.join(self.tempdir.name, 'user.json')
+        update_catalog_file(path, {'Epson': {'EB-PU2220B': {'1.44-2.32:1 ELPLM15': lens}}})
+        set_user_catalog_paths([path])
+        index = get_lens_index()
+        # Le coefficient Barco ne s'applique plus aux autres marques
+        self.assertEqual(get_shift_scale('Epson'), 1.0)
+        self.assertEqual(index.v_shift_max[index.find('Epson', 'EB-PU2220B', '1.44-2.32:1 ELPLM15')], 50)
+
+        update_catalog_file(path, {}, {'Epson': 0.8})
+        set_user_catalog_paths([path])
+        self.assertEqual(get_shift_scale('Epson'), 0.8)
+        self.assertEqual(get_shift_scale('Barco'), 0.5)
+        self.assertEqual(get_model_names('Epson'), ['EB-PU2220B'])
+
+    def test_merge(self):
+        merged = merge_catalogs(CATALOG, {'Brand': {'P1': {'0.36:1 G LENS UST (R9801785)': {'ansi_lumens': 9500}}},
+                                          'Other': {'X': {}}})
+        lens = merged['Brand']['P1']['0.36:1 G LENS UST (R9801785)']
+        self.assertEqual(lens['ansi_lumens'], 9500)
+        self.assertEqual(lens['v_shift_max'], 186)
+        self.assertEqual(list(merged), ['Brand', 'Other'])
+        # Les catalogues d'origine ne sont pas modifiés
+        self.assertEqual(CATALOG['Brand']['P1']['0.36:1 G LENS UST (R9801785)']['ansi_lumens'], 9000)
+
+    def test_user_overrides(self):
+        lens = {'ansi_lumens': 20000, 'h_shift_min': -10, 'h_shift_max': 10, 'v_shift_min': -50, 'v_shift_max': 50}
+        path = self.write('user.json', {'Epson': {'EB-PU2220B': {'1.44-2.32:1 ELPLM15': lens}}})
+        version = get_catalog_version()
+        index = get_lens_index()
+        set_user_catalog_paths([path, os.path.join(self.tempdir.name, 'missing.json')])
+        self.assertGreater(get_catalog_version(), version)
+        self.assertIsNot(get_lens_index(), index)
+        self.assertEqual(get_model_names('Epson'), ['EB-PU2220B'])
+        self.assertIsNotNone(get_lens_index().find('Epson', 'EB-PU2220B', '1.44-2.32:1 ELPLM15'))
+
+    def test_partial_override(self):
+        lens = '0.36:1 G LENS UST (R9801785)'
+        path = self.write('partial.json', {'Barco': {'G62-W9': {lens: {'ansi_lumens': 30000}}}})
+        set_user_catalog_paths([path])
+        data = get_lens_data('Barco', 'G62-W9', lens)
+        self.assertEqual(data['ansi_lumens'], 30000)
+        self.assertIn('v_shift_max', data)
+
+    def test_incomplete_new_lens_is_skipped(self):
+        path = self.write('broken.json', {'Epson': {'EB-PU2220B': {'1.44-2.32:1 ELPLM15': {'ansi_lumens': 1}}}})
+        read_catalog_file(path)
+        set_user_catalog_paths([path])
+        with self.assertLogs(catalog.log, 'ERROR'):
+            self.assertEqual(get_model_names('Epson'), [])
+
+    def test_malformed_user_file_is_skipped(self):
+        import json
+        lens = {'ansi_lumens': 1, 'h_shift_min': 0, 'h_shift_max': 0, 'v_shift_min': 0, 'v_shift_max': 0}
+        documents = [
+            [],
+            {'format': '1', 'brands': {}},
+            {'brands': {'Epson': {'EB-PU2220B': {'ELPLM15': 'lens'}}}},
+            {'brands': {'Epson': {'EB-PU2220B': {'ELPLM15': {**lens, 'ansi_lumens': 'bright'}}}}},
+        ]
+        for i, document in enumerate(documents):
+            path = os.path.join(self.tempdir.name, f'malformed{i}.json')
+            with open(path, 'w', encoding='utf-8') as catalog_file:
+                json.dump(document, catalog_file)
+            with self.assertRaises(ValueError):
+                read_catalog_file(path)
+            set_user_catalog_paths([path])
+            with self.assertLogs(catalog.log, 'ERROR'):
+                self.assertIn('Barco', get_brand_names())
+
+
+class TestThrowTable(unittest.TestCase):
+    def test_distance_grid(self):
+        np.testing.assert_allclose(distance_grid(1, 3, 0.5), [1, 1.5, 2, 2.5, 3])
+
+    def test_table_and_lookup(self):
+        table = get_throw_table(1.0, 20.0, 1.0, '1920x1200')
+        self.assertIs(table, get_throw_table(1.0, 20.0, 1.0, '1920x1200'))
+        index = table.index
+        self.assertEqual(table.width_min.shape, (len(index), 20))
+        column = table.column(9)
+        np.testing.assert_allclose(table.width_max[:, column], 9 / index.throw_min)
+
+        # Recherche inverse, y compris hors de la grille : identique à la plage de throw de l'index
+        for width, distance in ((6, 9), (4.2, 7.3), (12, 25)):
+            expected = index.in_throw_range(distance / width)
+            np.testing.assert_array_equal(table.lookup(width, distance), expected)
+
+    def test_export(self):
+        import csv
+        import json
+        import tempfile
+
+        table = get_throw_table(2.0, 4.0, 1.0, '1920x1080')
+        with tempfile.TemporaryDirectory() as tempdir:
+            csv_path = os.path.join(tempdir, 'table.csv')
+            json_path = os.path.join(tempdir, 'table.json')
+            self.assertEqual(table.write_csv(csv_path), len(table.index) * 3)
+            self.assertEqual(table.write_json(json_path), len(table.index) * 3)
+            with open(csv_path, encoding='utf-8') as csvfile:
+                rows = list(csv.DictReader(csvfile))
+            with open(json_path, encoding='utf-8') as jsonfile:
+                data = json.load(jsonfile)
+        self.assertEqual(rows[0]['brand'], table.index.brand[0])
+        self.assertEqual(data['distances'], [2.0, 3.0, 4.0])
+        self.assertAlmostEqual(data['entries'][1]['width_max'], float(table.width_max[0, 1]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+import math
+import os
+import sys
+import unittest
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.footprint import (clip_convex, find_overlaps, footprint_quads, keystone_metrics,
+                            nominal_screen_planes, plane_groups, polygon_area, sweep_pairs)
+from core.photometry import compute_metrics, illuminance_at_points
+
+
+def translation(x, y=0.0, z=0.0):
+    matrix = np.eye(4)
+    matrix[:3, 3] = (x, y, z)
+    return matrix
+
+
+def tilt(angle):
+    """ Rotation autour de X (tilt vers le haut pour un angle positif). """
+    matrix = np.eye(4)
+    cos, sin = math.cos(angle), math.sin(angle)
+    matrix[1, 1], matrix[1, 2], matrix[2, 1], matrix[2, 2] = cos, -sin, sin, cos
+    return matrix
+
+
+class TestPolygons(unittest.TestCase):
+    def test_polygon_area(self):
+        square = np.array([(0, 0), (2, 0), (2, 2), (0, 2)], dtype=float)
+        self.assertAlmostEqual(polygon_area(square), 4)
+        self.assertAlmostEqual(polygon_area(square[::-1]), -4)
+
+    def test_clip_convex(self):
+        a = np.array([(0, 0), (2, 0), (2, 2), (0, 2)], dtype=float)
+        b = a + 1
+        self.assertAlmostEqual(polygon_area(clip_convex(a, b)), 1)
+        self.assertEqual(len(clip_convex(a, a + 5)), 0)
+
+    def test_sweep_pairs(self):
+        boxes = np.array([(0, 0, 2, 2), (1, 1, 3, 3), (5, 5, 6, 6), (1.5, -5, 1.8, -4)], dtype=float)
+        self.assertEqual(sweep_pairs(boxes), [(0, 1)])
+
+    def test_plane_groups(self):
+        groups = plane_groups([(0, 0, -10), (5, 3, -10), (0, 0, -12)], [(0, 0, 1), (0, 0, -1), (0, 0, 1)])
+        self.assertEqual(groups[0], groups[1])
+        self.assertNotEqual(groups[0], groups[2])
+
+
+class TestFootprints(unittest.TestCase):
+    def test_quads(self):
+        quads, valid = footprint_quads(np.eye(4), 1.5, 16 / 9, 0, 0, (0, 0, -10), (0, 0, 1))
+        self.assertTrue(valid[0])
+        np.testing.assert_allclose(quads[0, 0], (-10 / 3, -1.875, -10))
+        np.testing.assert_allclose(quads[0, 2], (10 / 3, 1.875, -10))
+        # Plan derrière le projecteur
+        _, valid = footprint_quads(np.eye(4), 1.5, 16 / 9, 0, 0, (0, 0, 10), (0, 0, 1))
+        self.assertFalse(valid[0])
+
+    def test_overlaps(self):
+        # Deux images de 4 m de large décalées de 3 m : 1 m de blend, 25 % de chaque image
+        matrices = np.array([translation(0), translation(3)])
+        quads, valid = footprint_quads(matrices, 2.5, 16 / 10, 0, 0, (0, 0, -10), (0, 0, 1))
+        overlaps = find_overlaps(quads, valid, (0, 0, -10), (0, 0, 1))
+        self.assertEqual(len(overlaps), 1)
+        overlap = overlaps[0]
+        self.assertEqual((overlap.index_a, overlap.index_b), (0, 1))
+        self.assertAlmostEqual(overlap.width, 1)
+        self.assertAlmostEqual(overlap.area, 2.5)
+        self.assertAlmostEqual(overlap.percent_a, 25)
+
+
+class TestKeystone(unittest.TestCase):
+    def test_perpendicular_matches_metrics(self):
+        keystone = keystone_metrics(np.eye(4)[None], 1.5, '1920x1080', 10000, 0, 0, (0, 0, -10), (0, 0, 1))
+        metrics = compute_metrics(1.5, 10, '1920x1080', 10000)
+        self.assertAlmostEqual(keystone.area[0], metrics.area)
+        self.assertAlmostEqual(keystone.lux_near[0], metrics.lux)
+        self.assertAlmostEqual(keystone.lux_far[0], metrics.lux)
+        self.assertAlmostEqual(keystone.pixel_min_mm[0], metrics.pixel_width_mm)
+        self.assertAlmostEqual(keystone.pixel_max_mm[0], metrics.pixel_width_mm)
+
+    def test_tilted_projection(self):
+        keystone = keystone_metrics(tilt(math.radians(20))[None], 1.5, ['1920x1080'], 10000, 0, 0,
+                                    (0, 0, -10), (0, 0, 1))
+        self.assertTrue(keystone.valid[0])
+        self.assertGreater(keystone.area[0], compute_metrics(1.5, 10, '1920x1080', 10000).area)
+        self.assertLess(keystone.pixel_min_mm[0], keystone.pixel_mean_mm[0])
+        self.assertLess(keystone.pixel_mean_mm[0], keystone.pixel_max_mm[0])
+        # Le lux aux bords correspond à l'éclairement calculé point par point
+        quad = keystone.quads[0]
+        near, far = (quad[0] + quad[1]) / 2, (quad[2] + quad[3]) / 2
+        inward = quad.mean(axis=0)
+        points = np.array([near, far]) * (1 - 1e-6) + inward * 1e-6
+        lux, _ = illuminance_at_points(points, [(0, 0, 1)] * 2, tilt(math.radians(20)), 1.5, 16 / 9, 10000)
+        self.assertAlmostEqual(keystone.lux_near[0], lux[0], delta=0.01)
+        self.assertAlmostEqual(keystone.lux_far[0], lux[1], delta=0.01)
+
+    def test_nominal_planes(self):
+        forward = np.array([(0.2, 0.1, -0.97)])
+        origins, normals = nominal_screen_planes(np.eye(4), np.zeros((1, 3)), forward, [10])
+        np.testing.assert_allclose(normals, [(0, 0, -1)])
+        np.testing.assert_allclose(origins, [(0, 0, -10)])
+
+
+if __name__ == '__main__':
+    unittest.main()
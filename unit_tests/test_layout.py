@@ -0,0 +1,87 @@
+import json
+import math
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.layout import ProjectorLayout, read_layout_records, sheet_layout_records
+from core.lens_index import LensIndex
+
+
+CATALOG = {'Barco': {'UDX-4K32': {'1.16-1.49:1 TLD+ (R9801214)': {
+    'ansi_lumens': 31000, 'h_shift_min': -30, 'h_shift_max': 30, 'v_shift_min': -120, 'v_shift_max': 120}}}}
+
+
+class TestProjectorLayout(unittest.TestCase):
+    def test_csv_rows(self):
+        records, issues = sheet_layout_records([
+            ['Name', 'X', 'Y', 'Z', 'Rot X', 'Rot Z', 'Brand', 'Model', 'Lens', 'Throw Ratio', 'V Shift',
+             'Resolution', 'Orientation'],
+            ['P1', '0', '-12,5', '8', '80', '0', 'Barco', 'UDX-4K32', '1.16-1.49:1 TLD+ (R9801214)', '1,2', '10',
+             '1920 x 1200', 'landscape_dual'],
+            [],
+            ['P2', '4', '-12', '8', '', '', '', '', '', '', '', '', ''],
+        ])
+        self.assertEqual(issues, [])
+        layout = ProjectorLayout(records, lens_index=LensIndex(CATALOG), resolutions={'1920x1200'})
+        self.assertEqual(layout.issues, [])
+        first, second = layout.entries
+        self.assertEqual((first.row, first.name, first.location), (2, 'P1', (0.0, -12.5, 8.0)))
+        self.assertAlmostEqual(first.rotation[0], math.radians(80))
+        self.assertEqual((first.throw_ratio, first.v_shift, first.h_shift), (1.2, 10.0, None))
+        self.assertEqual((first.resolution, first.orientation), ('1920x1200', 'LANDSCAPE DUAL'))
+        self.assertEqual(first.lens, '1.16-1.49:1 TLD+ (R9801214)')
+        self.assertEqual((second.row, second.rotation, second.lens, second.throw_ratio), (4, (0.0, 0.0, 0.0), '', None))
+
+    def test_issues_have_row_numbers(self):
+        records, issues = sheet_layout_records([
+            ['Name', 'X', 'Y', 'Z', 'Brand', 'Model', 'Lens', 'Throw Ratio', 'Resolution', 'Orientation'],
+            ['P1', '0', '0', 'high', '', '', '', '', '', ''],
+            ['P2', '0', '0', '0', '', '', 'TLD+', '', '', ''],
+            ['P3', '0', '0', '0', 'Barco', 'UDX-4K32', 'Unknown', '-1', '', ''],
+            ['P4', '0', '0', '0', '', '', '', '', '800x600', 'sideways'],
+            ['P4', '0', '', '0', '', '', '', '', '4096x2160', ''],
+            ['P4', '1', '1', '1', '', '', '', '', '4096x2160', ''],
+            ['P4', '2', '1', '1', '', '', '', '', '', ''],
+        ])
+        layout = ProjectorLayout(records, issues, LensIndex(CATALOG), resolutions={'4096x2160'})
+        self.assertEqual([(issue.row, issue.severity, issue.column) for issue in layout.issues], [
+            (2, 'ERROR', 'z'),
+            (3, 'ERROR', 'lens'),
+            (4, 'ERROR', 'throw_ratio'),
+            (4, 'WARNING', 'lens'),
+            (5, 'WARNING', 'resolution'),
+            (5, 'ERROR', 'orientation'),
+            (6, 'ERROR', 'y'),
+            (8, 'WARNING', 'name'),
+        ])
+        self.assertEqual([entry.row for entry in layout.entries], [7, 8])
+
+    def test_missing_columns(self):
+        records, issues = sheet_layout_records([['Name', 'X', 'Y'], ['P1', '0', '0']])
+        self.assertEqual(records, [])
+        self.assertEqual(len(issues), 1)
+        self.assertIn('z', issues[0].message)
+
+    def test_json(self):
+        document = {'projectors': [
+            {'name': 'P1', 'location': [1, 2, 3], 'rotation': [90, 0, 180], 'power': 50},
+            {'name': 'P2', 'x': 4, 'y': 5, 'z': 6, 'resolution': '1024x768'},
+            'P3',
+        ]}
+        with tempfile.TemporaryDirectory() as tempdir:
+            path = os.path.join(tempdir, 'layout.json')
+            with open(path, 'w', encoding='utf-8') as jsonfile:
+                json.dump(document, jsonfile)
+            layout = ProjectorLayout(*read_layout_records(path))
+        self.assertEqual([(issue.row, issue.severity) for issue in layout.issues], [(3, 'ERROR')])
+        first, second = layout.entries
+        self.assertEqual((first.location, first.power), ((1.0, 2.0, 3.0), 50.0))
+        self.assertAlmostEqual(first.rotation[2], math.pi)
+        self.assertEqual((second.location, second.resolution), ((4.0, 5.0, 6.0), '1024x768'))
+
+
+if __name__ == '__main__':
+    unittest.main()
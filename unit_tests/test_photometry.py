@@ -0,0 +1,144 @@
+import math
+import os
+import sys
+import unittest
+
+import numpy as np
+
+# Le paquet core s'importe seul, sans passer par le __init__ de l'add-on (qui importe bpy)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.photometry import (calculate_lux, calculate_pixel_size, calculate_screen_size, compute_metrics,
+                             compute_rig_optics, evaluate_lenses, illuminance_at_points, image_window, parse_resolution,
+                             parse_resolutions, projector_frames, solve_placement)
+
+
+class TestResolution(unittest.TestCase):
+    def test_parse_resolution(self):
+        self.assertEqual(parse_resolution('1920x1200'), (1920.0, 1200.0))
+        # Second appel servi par le cache
+        self.assertIs(parse_resolution('1920x1200'), parse_resolution('1920x1200'))
+
+    def test_parse_resolutions(self):
+        widths, heights = parse_resolutions(['1920x1080', (800, 600)])
+        np.testing.assert_array_equal(widths, [1920, 800])
+        np.testing.assert_array_equal(heights, [1080, 600])
+        widths, heights = parse_resolutions([])
+        self.assertEqual(len(widths), 0)
+
+
+class TestScalarMetrics(unittest.TestCase):
+    def test_calculate_screen_size(self):
+        width, height = calculate_screen_size(1.5, 9, '1920x1200')
+        self.assertAlmostEqual(width, 6)
+        self.assertAlmostEqual(height, 3.75)
+
+    def test_calculate_lux(self):
+        self.assertAlmostEqual(calculate_lux(10000, 5, 4), 500)
+        self.assertEqual(calculate_lux(10000, 0, 4), 0)
+
+    def test_calculate_pixel_size(self):
+        pixel_w, pixel_h = calculate_pixel_size(6, 3.75, '1920x1200')
+        self.assertAlmostEqual(pixel_w, 3.125)
+        self.assertAlmostEqual(pixel_h, 3.125)
+
+
+class TestComputeMetrics(unittest.TestCase):
+    def test_matches_scalar_functions(self):
+        throw_ratios = np.array([0.8, 1.5, 2.2])
+        distances = np.array([4.0, 9.0, 15.0])
+        resolutions = ['1920x1200', '1920x1080', '1024x768']
+        metrics = compute_metrics(throw_ratios, distances, resolutions, 12000, h_shift=10, v_shift=-20)
+        for i in range(3):
+            width, height = calculate_screen_size(throw_ratios[i], distances[i], resolutions[i])
+            self.assertAlmostEqual(metrics.screen_width[i], width)
+            self.assertAlmostEqual(metrics.screen_height[i], height)
+            self.assertAlmostEqual(metrics.lux[i], calculate_lux(12000, width, height))
+            self.assertAlmostEqual(metrics.pixel_width_mm[i], calculate_pixel_size(width, height, resolutions[i])[0])
+            self.assertAlmostEqual(metrics.offset_h[i], 0.1 * width)
+            self.assertAlmostEqual(metrics.offset_v[i], -0.2 * height)
+
+    def test_invalid_values(self):
+        metrics = compute_metrics([0.0, 1.0], [5.0, np.nan], '1920x1200', 10000)
+        self.assertTrue(np.isnan(metrics.screen_width).all())
+        np.testing.assert_array_equal(metrics.lux, [0, 0])
+
+
+class TestRigOptics(unittest.TestCase):
+    def test_matches_single_rig(self):
+        optics = compute_rig_optics([1.0, 0.8], [10, 0], [10, -20], ['1920x1080', (1000, 500)])
+        np.testing.assert_allclose(optics.angle, [0.9272952180016123, 1.1171986306871249])
+        np.testing.assert_allclose(optics.shift_x, [0.1, 0])
+        np.testing.assert_allclose(optics.shift_y, [0.1 * 0.5625, -0.1])
+        np.testing.assert_allclose(optics.scale_x, [1, 1.25])
+        np.testing.assert_allclose(optics.scale_y, [0.5625, 0.625])
+        np.testing.assert_allclose(optics.translation_x, [0.1, 0])
+        np.testing.assert_allclose(optics.translation_y, [0.05625, -0.125])
+
+
+class TestEvaluateLenses(unittest.TestCase):
+    def test_clamps_to_zoom_range(self):
+        evaluation = evaluate_lenses([0.65, 1.22, 2.9], [0.75, 1.53, 5.5], 10000,
+                                     -30, 30, -100, 100, 9, '1920x1200', 1.5, h_shift=40)
+        np.testing.assert_allclose(evaluation.throw_ratio, [0.75, 1.5, 2.9])
+        np.testing.assert_array_equal(evaluation.in_zoom_range, [False, True, False])
+        self.assertAlmostEqual(evaluation.screen_width[1], 6)
+        self.assertAlmostEqual(evaluation.width_max[1], 9 / 1.22)
+        self.assertFalse(evaluation.h_shift_ok.any())
+        self.assertTrue(evaluation.v_shift_ok.all())
+
+
+class TestSolvePlacement(unittest.TestCase):
+    def test_fill_screen(self):
+        placement = solve_placement([6, 4], [3, 3], [9, 6], [0.5, 0], [0, 0.6], 16 / 10,
+                                    [1.2, 0.5], [1.8, 0.65], -30, 30, -100, 100)
+        # Écran 6x3 : la largeur impose l'image, throw 1.5 dans la plage
+        self.assertAlmostEqual(placement.image_width[0], 6)
+        self.assertAlmostEqual(placement.throw_ratio[0], 1.5)
+        self.assertAlmostEqual(placement.screen_distance[0], 9)
+        self.assertAlmostEqual(placement.h_shift[0], 0.5 / 6 * 100)
+        self.assertTrue(placement.zoom_ok[0])
+        # Écran 4x3 : la hauteur impose l'image, le zoom ne suffit pas et le projecteur recule
+        self.assertAlmostEqual(placement.image_width[1], 4.8)
+        self.assertAlmostEqual(placement.throw_ratio[1], 0.65)
+        self.assertAlmostEqual(placement.screen_distance[1], 0.65 * 4.8)
+        self.assertFalse(placement.zoom_ok[1])
+        self.assertTrue(placement.shift_ok.all())
+
+
+class TestIlluminance(unittest.TestCase):
+    def test_frames(self):
+        origins, right, up, forward = projector_frames(np.eye(4))
+        np.testing.assert_array_equal(forward, [[0, 0, -1]])
+        np.testing.assert_array_equal(right, [[1, 0, 0]])
+        np.testing.assert_array_equal(up, [[0, 1, 0]])
+
+    def test_image_window(self):
+        center_h, center_v, half_w, half_h = image_window(2.0, 2.0, h_shift=10, v_shift=50)
+        self.assertAlmostEqual(half_w, 0.25)
+        self.assertAlmostEqual(half_h, 0.125)
+        self.assertAlmostEqual(center_h, 0.05)
+        self.assertAlmostEqual(center_v, 0.125)
+
+    def test_perpendicular_plane_is_uniform(self):
+        # Projecteur à l'origine visant -Z, plan z = -10 : éclairement = lumens / surface
+        x, y = np.meshgrid(np.linspace(-3, 3, 7), np.linspace(-1.5, 1.5, 5))
+        points = np.column_stack((x.ravel(), y.ravel(), np.full(x.size, -10.0)))
+        normals = np.tile((0.0, 0.0, 1.0), (len(points), 1))
+        lux, hits = illuminance_at_points(points, normals, np.eye(4), 1.5, 16 / 9, 10000)
+        metrics = compute_metrics(1.5, 10, '1920x1080', 10000)
+        inside = hits > 0
+        np.testing.assert_allclose(lux[inside], metrics.lux)
+        # Tous les points sont dans l'image (6.67 x 3.75 m)
+        self.assertEqual(inside.sum(), len(points))
+        # Hors du cadre, puis derrière le projecteur
+        lux, hits = illuminance_at_points([[5, 0, -10], [0, 0, 10]], [[0, 0, 1]] * 2, np.eye(4), 1.5, 16 / 9, 10000)
+        np.testing.assert_array_equal(hits, [0, 0])
+
+    def test_oblique_surface_gets_cosine(self):
+        normal = (0.0, math.sin(math.radians(60)), math.cos(math.radians(60)))
+        lux, _ = illuminance_at_points([[0, 0, -10]], [normal], np.eye(4), 1.5, 16 / 9, 10000)
+        self.assertAlmostEqual(lux[0], compute_metrics(1.5, 10, '1920x1080', 10000).lux * 0.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
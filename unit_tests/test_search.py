@@ -0,0 +1,64 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.lens_index import LensIndex
+from core.search import CatalogSearch, entry_label, split_words, trigrams
+
+
+LENS = {'ansi_lumens': 10000, 'h_shift_min': -30, 'h_shift_max': 30, 'v_shift_min': -100, 'v_shift_max': 100}
+CATALOG = {
+    'Barco': {
+        'G62-W9': {'0.65-0.75:1 G LENS (R9802300)': LENS, '0.36:1 G LENS UST (R9801785)': LENS},
+        'I600-4K8': {'0.37:1 ILD UST (R9803077)': LENS, '0.65-0.8:1 ILD ST (R9803072)': LENS},
+    },
+    'Epson': {
+        'EB-PU2220B': {'1.44-2.32:1 ELPLM15 (V12H004M0F)': LENS},
+    },
+}
+
+
+class TestWords(unittest.TestCase):
+    def test_split_words(self):
+        self.assertEqual(split_words('I600-4K8 | 0.65-0.8:1 ILD (R9803072) 90°'),
+                         ['i600', '4k8', '0.65', '0.8', '1', 'ild', 'r9803072', '90'])
+
+    def test_trigrams(self):
+        self.assertEqual(trigrams('ust'), {' us', 'ust', 'st '})
+        self.assertEqual(trigrams('g'), {' g '})
+
+
+class TestCatalogSearch(unittest.TestCase):
+    def setUp(self):
+        self.search = CatalogSearch(LensIndex(CATALOG))
+
+    def rows(self, query):
+        return [match.row for match in self.search.search(query)]
+
+    def test_part_number(self):
+        matches = self.search.search('R9802300')
+        self.assertEqual(matches[0].label, entry_label('Barco', 'G62-W9', '0.65-0.75:1 G LENS (R9802300)'))
+        self.assertEqual(self.search.find_label(matches[0].label), matches[0].row)
+
+    def test_throw_ratio_and_words(self):
+        # 0.8 est dans la plage 0.65-0.8 de l'ILD ST du I600-4K8 seulement
+        self.assertEqual(self.rows('0.8 4K'), [3])
+        # 'ST' ne partage qu'un trigramme sur 3 avec 'UST'
+        self.assertEqual(self.rows('ust'), [1, 2])
+        self.assertEqual(self.rows('epson 2'), [4])
+
+    def test_ranking(self):
+        matches = self.search.search('0.37 ust')
+        self.assertEqual(matches[0].row, 2)
+        self.assertAlmostEqual(matches[0].score, 2)
+
+    def test_partial_matches(self):
+        # Aucun UST ne couvre 0.8 : on obtient quand même les meilleures correspondances
+        self.assertIn(3, self.rows('0.8 UST 4K'))
+        self.assertEqual(self.rows('zzz'), [])
+        self.assertEqual(self.rows(''), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,147 @@
+import os
+import sys
+import tempfile
+import unittest
+import zipfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.catalog import read_catalog_document, update_catalog_file
+from core.spec_import import (SpecSheetImport, normalize_header, normalize_lens_name, parse_number,
+                              parse_shift_range, read_sheet_rows)
+
+
+HEADER = ['Manufacturer', 'Modèle', 'Lens', 'Part No.', 'ANSI Lumens', 'H Shift (%)', 'V Shift (%)']
+
+
+class TestParsing(unittest.TestCase):
+    def test_headers(self):
+        self.assertEqual([normalize_header(cell) for cell in HEADER],
+                         ['manufacturer', 'modele', 'lens', 'part_no', 'ansi_lumens', 'h_shift', 'v_shift'])
+
+    def test_numbers(self):
+        self.assertEqual(parse_number('9 000'), 9000)
+        self.assertEqual(parse_number('12,500 lm'), 12500)
+        self.assertEqual(parse_number('0,65'), 0.65)
+        self.assertEqual(parse_number('+40 %'), 40)
+        self.assertIsNone(parse_number('n/a'))
+
+    def test_shift_ranges(self):
+        self.assertEqual(parse_shift_range('±40%'), (-40, 40))
+        self.assertEqual(parse_shift_range('-120 / +120'), (-120, 120))
+        self.assertEqual(parse_shift_range('182 to 186'), (182, 186))
+        self.assertEqual(parse_shift_range('−30–30'), (-30, 30))
+        self.assertIsNone(parse_shift_range('wide'))
+
+    def test_lens_names(self):
+        self.assertEqual(normalize_lens_name('0,65 – 0,75 : 1  G LENS', 'R9802300'), '0.65-0.75:1 G LENS (R9802300)')
+        self.assertEqual(normalize_lens_name('0.36:1 G LENS UST (R9801785)', 'R9801785'),
+                         '0.36:1 G LENS UST (R9801785)')
+
+
+class TestSpecSheetImport(unittest.TestCase):
+    def test_valid_rows(self):
+        sheet = SpecSheetImport([
+            HEADER,
+            ['Epson', 'EB-PU2220B', '1.44-2.32:1', 'ELPLM15', '20 000', '±10', '-50/+50'],
+            ['Epson', 'EB-PU2220B', '0.35:1 UST', 'ELPLX02', '20000', '0', '-5 / 5'],
+            [],
+        ], shift_scale=0.5)
+        self.assertEqual(sheet.issues, [])
+        self.assertEqual((sheet.row_count, sheet.entry_count), (2, 2))
+        self.assertEqual(sheet.brands['Epson']['EB-PU2220B']['1.44-2.32:1 (ELPLM15)'],
+                         {'ansi_lumens': 20000, 'h_shift_min': -10, 'h_shift_max': 10,
+                          'v_shift_min': -50, 'v_shift_max': 50})
+        self.assertEqual(sheet.shift_scales, {'Epson': 0.5})
+
+    def test_issues_have_row_numbers(self):
+        sheet = SpecSheetImport([
+            ['Brand', 'Model', 'Lens', 'Lumens', 'H Shift Min', 'H Shift Max', 'V Shift Min', 'V Shift Max'],
+            ['B', 'P1', '1.0:1 A', '9000', '-10', '10', '-50', '50'],
+            ['B', 'P1', '1.0:1 A', '9000', '-10', '10', '-50', '50'],
+            ['B', 'P1', '1.0:1 A', '9500', '-10', '10', '-50', '50'],
+            ['B', 'P1', '2.0:1 B', '90', '-10', '10', '-50', '50'],
+            ['B', 'P1', '3.0:1 C', '9000', '10', '-10', '-50', '500'],
+            ['B', '', '4.0:1 D', '9000', '-10', '10', '-50', '50'],
+            ['B', 'P1', '5.0:1 E', 'bright', '-10', '10', '-50', '50'],
+            ['B', 'P2', 'Custom', '9000', '-10', '10', '-50', '50'],
+        ])
+        issues = [(issue.row, issue.severity, issue.column) for issue in sheet.issues]
+        self.assertEqual(issues, [
+            (3, 'WARNING', ''),
+            (4, 'ERROR', ''),
+            (5, 'ERROR', 'ansi_lumens'),
+            (6, 'ERROR', 'h_shift_min'),
+            (6, 'ERROR', 'v_shift_max'),
+            (7, 'ERROR', 'model'),
+            (8, 'ERROR', 'ansi_lumens'),
+            (9, 'WARNING', 'lens'),
+        ])
+        self.assertIn('row 2', sheet.issues[1].message)
+        self.assertEqual(len(sheet.errors), 6)
+        self.assertEqual(sheet.entry_count, 2)
+        self.assertEqual(list(sheet.brands['B']), ['P1', 'P2'])
+
+    def test_missing_columns(self):
+        sheet = SpecSheetImport([['Brand', 'Model', 'Lens', 'H Shift'], ['B', 'P1', '1.0:1', '±10']])
+        self.assertEqual(len(sheet.errors), 1)
+        self.assertEqual(sheet.errors[0].row, 1)
+        self.assertIn('ansi_lumens', sheet.errors[0].message)
+        self.assertIn('v_shift_min', sheet.errors[0].message)
+
+    def test_many_rows(self):
+        rows = [HEADER] + [['B', f'P{i // 10}', f'{1 + i % 10}.0:1', '', '9000', '±10', '±50'] for i in range(5000)]
+        sheet = SpecSheetImport(rows)
+        self.assertEqual((sheet.entry_count, sheet.issues), (5000, []))
+
+
+class TestSheetFiles(unittest.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def test_csv_semicolon(self):
+        path = os.path.join(self.tempdir.name, 'sheet.csv')
+        with open(path, 'w', encoding='cp1252', newline='') as csvfile:
+            csvfile.write('Marque;Modèle;Optique;Lumens;H Shift;V Shift\r\n'
+                          'Epson;EB-PU2220B;1,44-2,32:1;20 000;±10;±50\r\n')
+        sheet = SpecSheetImport.from_file(path)
+        self.assertEqual(sheet.issues, [])
+        self.assertIn('1.44-2.32:1', sheet.brands['Epson']['EB-PU2220B'])
+
+    def test_xlsx(self):
+        path = os.path.join(self.tempdir.name, 'sheet.xlsx')
+        strings = ['Brand', 'Model', 'Lens', 'ANSI Lumens', 'H Shift', 'V Shift', 'Epson', 'EB-PU2220B',
+                   '1.44-2.32:1 ELPLM15', '±10']
+        shared = ''.join(f'<si><t>{text}</t></si>' for text in strings)
+        sheet_xml = (
+            '<row r="1">' + ''.join(f'<c r="{col}1" t="s"><v>{i}</v></c>' for i, col in enumerate('ABCDEF')) + '</row>'
+            '<row r="3"><c r="A3" t="s"><v>6</v></c><c r="B3" t="s"><v>7</v></c><c r="C3" t="s"><v>8</v></c>'
+            '<c r="D3"><v>20000</v></c><c r="E3" t="s"><v>9</v></c>'
+            '<c r="F3" t="inlineStr"><is><t>-50/50</t></is></c></row>')
+        namespace = 'xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"'
+        with zipfile.ZipFile(path, 'w') as xlsx:
+            xlsx.writestr('xl/sharedStrings.xml', f'<sst {namespace}>{shared}</sst>')
+            xlsx.writestr('xl/worksheets/sheet1.xml', f'<worksheet {namespace}><sheetData>{sheet_xml}'
+                                                      f'</sheetData></worksheet>')
+        rows = read_sheet_rows(path)
+        self.assertEqual(rows[1], [])
+        self.assertEqual(rows[2][3], '20000')
+        sheet = SpecSheetImport(rows, brand_shift_scales={'Epson': 0.8})
+        self.assertEqual(sheet.issues, [])
+        self.assertEqual(sheet.brands['Epson']['EB-PU2220B']['1.44-2.32:1 ELPLM15']['v_shift_min'], -50)
+        self.assertEqual(sheet.shift_scales, {'Epson': 0.8})
+
+    def test_emitted_catalog_is_loadable(self):
+        sheet = SpecSheetImport([HEADER, ['Epson', 'EB-PU2220B', '1.44-2.32:1', 'ELPLM15', '20000', '±10', '±50']],
+                                shift_scale=0.5)
+        path = os.path.join(self.tempdir.name, 'catalog.json')
+        update_catalog_file(path, sheet.brands, sheet.shift_scales)
+        brands, shift_scales = read_catalog_document(path)
+        self.assertEqual(brands, sheet.brands)
+        self.assertEqual(shift_scales, {'Epson': 0.5})
+
+
+if __name__ == '__main__':
+    unittest.main()